@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compiled Certification Alias Resolver
+
+Single resolver for config/certification_aliases.json shared by
+cert_name_normalizer.py, the compliance gap report and the pizza status
+requirements generator, so every caller resolves a cert name the same way.
+
+The alias file is compiled once into a dict keyed by the normalized name
+(lowercase, trimmed, single-spaced) with interned strings, and lookups go
+through an LRU cache, so resolution is O(1) per cert.
+
+The workflow builder (tools/lifecycle-workflow-builder.html) builds the same
+index in JS from the same file; keep normalize_key() and buildCertAliasIndex()
+in sync.
+
+Usage:
+    from alias_resolver import load_resolver
+
+    resolver = load_resolver()
+    resolver.resolve('BGC')            # 'Background Check'
+    resolver.resolve('Unknown Cert ')  # 'Unknown Cert'
+"""
+
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DEFAULT_ALIASES_FILE = Path(__file__).parent.parent / 'config' / 'certification_aliases.json'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_key(cert_name: str) -> str:
+    """Lookup key for a cert name: lowercase, trimmed, internal whitespace collapsed."""
+    if not cert_name:
+        return ''
+    return _WHITESPACE_RE.sub(' ', cert_name.lower().strip())
+
+
+class AliasResolver:
+    """Normalized-key -> canonical cert name table with an LRU front cache."""
+
+    def __init__(self, aliases: Dict, cache_size: int = 65536):
+        self._canonical: Dict[str, str] = {}
+        self.resolve_canonical = lru_cache(maxsize=cache_size)(self._lookup)
+
+        for canonical, variations in aliases.items():
+            if not isinstance(variations, list):
+                continue  # e.g. "_description"
+            self.add(canonical, variations)
+
+    @classmethod
+    def from_file(cls, file_path: Path = DEFAULT_ALIASES_FILE, **kwargs) -> 'AliasResolver':
+        """Compile a resolver from an aliases JSON file."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    @classmethod
+    def ensure(cls, aliases) -> 'AliasResolver':
+        """Accept either a compiled resolver or a raw aliases dict."""
+        return aliases if isinstance(aliases, cls) else cls(aliases or {})
+
+    def add(self, canonical: str, variations: Iterable[str]):
+        """Register variations of a canonical name. Earlier registrations win."""
+        canonical = sys.intern(canonical)
+        for name in [canonical, *variations]:
+            key = normalize_key(name)
+            if key and key not in self._canonical:
+                self._canonical[sys.intern(key)] = canonical
+        self.resolve_canonical.cache_clear()
+
+    def _lookup(self, cert_name: str) -> Optional[str]:
+        return self._canonical.get(normalize_key(cert_name))
+
+    def resolve(self, cert_name: str) -> str:
+        """Canonical name for a cert, or the trimmed input if it has no alias."""
+        if not cert_name:
+            return cert_name
+        return self.resolve_canonical(cert_name) or cert_name.strip()
+
+    def is_known(self, cert_name: str) -> bool:
+        """True if the name is a canonical name or a registered variation."""
+        return bool(cert_name) and self.resolve_canonical(cert_name) is not None
+
+    def canonical_map(self) -> Dict[str, str]:
+        """Copy of the compiled normalized-key -> canonical table."""
+        return dict(self._canonical)
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def __getstate__(self):
+        # The LRU wrapper can't be pickled; rebuild it on the other side
+        return {'canonical': self._canonical, 'cache_size': self.resolve_canonical.cache_info().maxsize}
+
+    def __setstate__(self, state):
+        self._canonical = state['canonical']
+        self.resolve_canonical = lru_cache(maxsize=state['cache_size'])(self._lookup)
+
+
+_default_resolvers: Dict[Path, AliasResolver] = {}
+
+
+def load_resolver(file_path: Path = DEFAULT_ALIASES_FILE) -> AliasResolver:
+    """Process-wide resolver for an aliases file (compiled on first use)."""
+    file_path = Path(file_path).resolve()
+    if file_path not in _default_resolvers:
+        _default_resolvers[file_path] = AliasResolver.from_file(file_path)
+    return _default_resolvers[file_path]
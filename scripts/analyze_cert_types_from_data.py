@@ -6,23 +6,19 @@ Since pay_CertTypes.txt is corrupted, we'll look at:
 2. Any certification-related columns in the data
 """
 
-import json
 import os
 from collections import Counter, defaultdict
+from itertools import islice
+
+from json_stream import iter_records
 
 # File paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
-def load_json_file(filename):
-    """Load a JSON data file"""
-    filepath = os.path.join(DATA_DIR, filename)
-    try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading {filename}: {e}")
-        return None
+def stream_json_file(filename, fields=None):
+    """Stream records from a JSON data file one at a time (errors surface while iterating)"""
+    return iter_records(os.path.join(DATA_DIR, filename), fields=fields)
 
 def analyze_operators():
     """Analyze operators data for certification-related fields"""
@@ -30,59 +26,79 @@ def analyze_operators():
     print("ANALYZING OPERATORS DATA FOR CERTIFICATION FIELDS")
     print("=" * 80)
     
-    operators = load_json_file('pay_Operators.txt')
-    if not operators:
+    # Pass 1: field names and a small sample, one operator at a time
+    total_operators = 0
+    all_fields = set()
+    sample = []
+    try:
+        for op in stream_json_file('pay_Operators.txt'):
+            total_operators += 1
+            all_fields.update(op.keys())
+            if len(sample) < 20:
+                sample.append(op)
+    except Exception as e:
+        print(f"Error loading pay_Operators.txt: {e}")
         return
     
-    print(f"\nTotal operators: {len(operators)}")
+    if not total_operators:
+        return
     
-    # Get all field names
-    if operators:
-        all_fields = set()
-        for op in operators:
-            all_fields.update(op.keys())
-        
-        # Find certification-related fields
-        cert_fields = [f for f in sorted(all_fields) if any(keyword in f.lower() 
-                      for keyword in ['cert', 'license', 'document', 'background', 
-                                     'check', 'verification', 'ssn', 'w9', 'id'])]
-        
+    print(f"\nTotal operators: {total_operators}")
+    
+    # Find certification-related fields
+    cert_fields = [f for f in sorted(all_fields) if any(keyword in f.lower() 
+                  for keyword in ['cert', 'license', 'document', 'background', 
+                                 'check', 'verification', 'ssn', 'w9', 'id'])]
+    
+    print("\n" + "=" * 80)
+    print("CERTIFICATION-RELATED FIELDS IN OPERATORS:")
+    print("=" * 80)
+    for field in cert_fields:
+        print(f"  - {field}")
+    
+    # Sample values for cert fields
+    if cert_fields:
         print("\n" + "=" * 80)
-        print("CERTIFICATION-RELATED FIELDS IN OPERATORS:")
+        print("SAMPLE VALUES (first 5 operators):")
         print("=" * 80)
-        for field in cert_fields:
-            print(f"  - {field}")
-        
-        # Sample values for cert fields
-        if cert_fields:
-            print("\n" + "=" * 80)
-            print("SAMPLE VALUES (first 5 operators):")
-            print("=" * 80)
-            for i, op in enumerate(operators[:5]):
-                print(f"\n--- Operator {i+1}: {op.get('FirstName', '')} {op.get('LastName', '')} ---")
-                print(f"    Division: {op.get('DivisionID', 'N/A')}")
-                print(f"    Status: {op.get('CurrentStatus', 'N/A')}")
-                for field in cert_fields:
+        for i, op in enumerate(sample[:5]):
+            print(f"\n--- Operator {i+1}: {op.get('FirstName', '')} {op.get('LastName', '')} ---")
+            print(f"    Division: {op.get('DivisionID', 'N/A')}")
+            print(f"    Status: {op.get('CurrentStatus', 'N/A')}")
+            for field in cert_fields:
+                value = op.get(field)
+                if value is not None and value != '':
+                    print(f"    {field}: {value}")
+    
+    # Look for boolean certification flags
+    print("\n" + "=" * 80)
+    print("ANALYZING CERTIFICATION FLAGS (Boolean fields):")
+    print("=" * 80)
+    
+    boolean_cert_fields = [f for f in cert_fields if any(
+        op.get(f) in [True, False, 'true', 'false', 1, 0] for op in sample
+    )]
+    
+    if boolean_cert_fields:
+        # Pass 2: count flag values, projecting only the boolean fields
+        true_counts = Counter()
+        false_counts = Counter()
+        try:
+            for op in stream_json_file('pay_Operators.txt', fields=boolean_cert_fields):
+                for field in boolean_cert_fields:
                     value = op.get(field)
-                    if value is not None and value != '':
-                        print(f"    {field}: {value}")
-        
-        # Look for boolean certification flags
-        print("\n" + "=" * 80)
-        print("ANALYZING CERTIFICATION FLAGS (Boolean fields):")
-        print("=" * 80)
-        
-        boolean_cert_fields = [f for f in cert_fields if any(
-            op.get(f) in [True, False, 'true', 'false', 1, 0] for op in operators[:20]
-        )]
+                    if value in [True, 'true', 1]:
+                        true_counts[field] += 1
+                    elif value in [False, 'false', 0]:
+                        false_counts[field] += 1
+        except Exception as e:
+            print(f"Error loading pay_Operators.txt: {e}")
+            return
         
-        if boolean_cert_fields:
-            for field in boolean_cert_fields:
-                true_count = sum(1 for op in operators if op.get(field) in [True, 'true', 1])
-                false_count = sum(1 for op in operators if op.get(field) in [False, 'false', 0])
-                print(f"\n  {field}:")
-                print(f"    True/Yes: {true_count}")
-                print(f"    False/No: {false_count}")
+        for field in boolean_cert_fields:
+            print(f"\n  {field}:")
+            print(f"    True/Yes: {true_counts[field]}")
+            print(f"    False/No: {false_counts[field]}")
 
 def analyze_status_types():
     """Analyze status types for certification requirements"""
@@ -90,21 +106,21 @@ def analyze_status_types():
     print("ANALYZING STATUS TYPES FOR CERTIFICATION REQUIREMENTS")
     print("=" * 80)
     
-    statuses = load_json_file('pay_StatusTypes.txt')
-    if not statuses:
-        return
-    
     # Group by division and check CertFlag
     divisions = defaultdict(list)
     
-    for status in statuses:
-        if status.get('CertFlag') == True or status.get('CertFlag') == 1:
-            div = status.get('DivisionID', 'Unknown')
-            divisions[div].append({
-                'OrderID': status.get('OrderID'),
-                'Status': status.get('Status'),
-                'CertFlag': status.get('CertFlag')
-            })
+    try:
+        for status in stream_json_file('pay_StatusTypes.txt', fields=('CertFlag', 'DivisionID', 'OrderID', 'Status')):
+            if status.get('CertFlag') == True or status.get('CertFlag') == 1:
+                div = status.get('DivisionID', 'Unknown')
+                divisions[div].append({
+                    'OrderID': status.get('OrderID'),
+                    'Status': status.get('Status'),
+                    'CertFlag': status.get('CertFlag')
+                })
+    except Exception as e:
+        print(f"Error loading pay_StatusTypes.txt: {e}")
+        return
     
     print(f"\nStatuses requiring certifications (CertFlag=True):")
     print("\nTarget divisions:")
@@ -128,10 +144,6 @@ def look_for_cert_type_patterns():
     print("SEARCHING FOR CERTIFICATION TYPE PATTERNS")
     print("=" * 80)
     
-    operators = load_json_file('pay_Operators.txt')
-    if not operators:
-        return
-    
     # Common certification types we might expect
     common_certs = [
         'Driver License', 'Drivers License', 'DL', 
@@ -147,7 +159,11 @@ def look_for_cert_type_patterns():
     print("\nLooking for common certification patterns in operator data...")
     
     # Check all fields for these patterns
-    operators_sample = operators[:50]  # Check first 50
+    try:
+        operators_sample = list(islice(stream_json_file('pay_Operators.txt'), 50))  # Check first 50
+    except Exception as e:
+        print(f"Error loading pay_Operators.txt: {e}")
+        return
     found_patterns = defaultdict(list)
     
     for op in operators_sample:
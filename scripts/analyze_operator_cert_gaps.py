@@ -8,6 +8,9 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+from gap_engine import GapEngine, is_active_cert
+from records import Certification, Operator, load_records
+
 def load_json_data(file_path: Path):
     """Load JSON data from file."""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -70,68 +73,12 @@ def load_status_types(file_path: Path, pizza_map: dict) -> dict:
 
 def build_status_requirements(certifications: list, status_orders: dict) -> dict:
     """Build a map of what certs are commonly required at each status/division."""
-    
-    status_div_certs = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    status_div_totals = defaultdict(lambda: defaultdict(int))
-    
-    for cert in certifications:
-        operator_id = cert.get('ID')
-        status_name = cert.get('StatusName', 'Unknown')
-        division_id = cert.get('DivisionID', 'Unknown')
-        cert_name = cert.get('Cert')
-        is_approved = str(cert.get('isApproved', '0')) == '1'
-        is_deleted = str(cert.get('IsDeleted', '0')) == '1'
-        
-        if is_approved and not is_deleted and cert_name:
-            status_div_certs[status_name][division_id][cert_name] += 1
-    
-    # Count total operators per status/division
-    seen_operators = defaultdict(lambda: defaultdict(set))
-    for cert in certifications:
-        operator_id = cert.get('ID')
-        status_name = cert.get('StatusName', 'Unknown')
-        division_id = cert.get('DivisionID', 'Unknown')
-        seen_operators[status_name][division_id].add(operator_id)
-    
-    for status in seen_operators:
-        for div in seen_operators[status]:
-            status_div_totals[status][div] = len(seen_operators[status][div])
-    
-    # Calculate required certs (80%+ adoption)
-    requirements = {}
-    for status_name in status_div_certs:
-        requirements[status_name] = {
-            'divisions': {}
-        }
-        
-        for division_id in status_div_certs[status_name]:
-            total_ops = status_div_totals[status_name][division_id]
-            required_certs = []
-            
-            for cert_name, count in status_div_certs[status_name][division_id].items():
-                percentage = (count / total_ops) * 100 if total_ops > 0 else 0
-                if percentage >= 80:
-                    required_certs.append(cert_name)
-            
-            requirements[status_name]['divisions'][division_id] = {
-                'required_certs': sorted(required_certs),
-                'total_operators': total_ops,
-                'order': status_orders.get(division_id, {}).get(status_name, '99')
-            }
-    
-    return requirements
+    return GapEngine(certifications, status_orders).requirements
 
 def get_operator_certs(operator_id: str, certifications: list) -> set:
     """Get all approved certs for an operator."""
-    certs = set()
-    for cert in certifications:
-        if cert.get('ID') == operator_id:
-            is_approved = str(cert.get('isApproved', '0')) == '1'
-            is_deleted = str(cert.get('IsDeleted', '0')) == '1'
-            cert_name = cert.get('Cert')
-            if is_approved and not is_deleted and cert_name:
-                certs.add(cert_name)
-    return certs
+    return {cert.get('Cert') for cert in certifications
+            if cert.get('ID') == operator_id and is_active_cert(cert)}
 
 def get_next_status(current_status: str, division_id: str, status_orders: dict) -> tuple:
     """Get the next status in lifecycle progression for this division."""
@@ -152,83 +99,13 @@ def get_next_status(current_status: str, division_id: str, status_orders: dict)
     return next_status, str(next_order)
 
 def analyze_gaps(operators: list, certifications: list, status_orders: dict) -> list:
-    """Analyze certification gaps for each operator."""
-    
-    requirements = build_status_requirements(certifications, status_orders)
-    
-    gaps = []
-    
-    for operator in operators:
-        operator_id = operator.get('ID')
-        first_name = operator.get('FirstName', '')
-        last_name = operator.get('LastName', '')
-        email = operator.get('Email', '')
-        current_status = operator.get('StatusName', 'Unknown')
-        division_id = operator.get('DivisionID', 'Unknown')
-        order_id = operator.get('OrderID', '99')
-        
-        # Get operator's current certs
-        current_certs = get_operator_certs(operator_id, certifications)
-        
-        # Get next status for this division
-        next_status, next_order = get_next_status(current_status, division_id, status_orders)
-        
-        if not next_status:
-            # Already at final status or status not found
-            gaps.append({
-                'operator': {
-                    'id': operator_id,
-                    'name': f"{first_name} {last_name}".strip(),
-                    'email': email,
-                    'division': division_id
-                },
-                'current_status': {
-                    'name': current_status,
-                    'order': order_id
-                },
-                'current_certs': sorted(list(current_certs)),
-                'next_status': None,
-                'required_certs': [],
-                'missing_certs': [],
-                'has_certs': [],
-                'progress': 'FINAL STATUS' if current_status != 'Unknown' else 'UNKNOWN STATUS'
-            })
-            continue
-        
-        # Get requirements for next status in this division
-        next_reqs = requirements.get(next_status, {}).get('divisions', {}).get(division_id, {})
-        required_certs = set(next_reqs.get('required_certs', []))
-        
-        # Calculate gaps
-        missing_certs = sorted(list(required_certs - current_certs))
-        has_certs = sorted(list(required_certs & current_certs))
-        
-        progress_pct = 0
-        if required_certs:
-            progress_pct = int((len(has_certs) / len(required_certs)) * 100)
-        
-        gaps.append({
-            'operator': {
-                'id': operator_id,
-                'name': f"{first_name} {last_name}".strip(),
-                'email': email,
-                'division': division_id
-            },
-            'current_status': {
-                'name': current_status,
-                'order': order_id
-            },
-            'next_status': {
-                'name': next_status,
-                'order': next_order
-            },
-            'required_certs': sorted(list(required_certs)),
-            'missing_certs': missing_certs,
-            'has_certs': has_certs,
-            'progress': f"{len(has_certs)}/{len(required_certs)} ({progress_pct}%)" if required_certs else "No requirements"
-        })
+    """Analyze certification gaps for each operator.
     
-    return gaps
+    Indexes certifications once (see gap_engine.GapEngine) instead of
+    rescanning the full list for every operator.
+    """
+    engine = GapEngine(certifications, status_orders)
+    return engine.analyze(operators)
 
 def format_report(gaps: list) -> str:
     """Format gap analysis as text report."""
@@ -314,8 +191,9 @@ def main():
     print(f"Loading pizza statuses from: {pizza_statuses_file}")
     print()
     
-    operators = load_json_data(operators_file)
-    certifications = load_json_data(certs_file)
+    # Slotted records with interned strings and pre-parsed flags (see records.py)
+    operators = load_records(load_json_data(operators_file), Operator)
+    certifications = load_records(load_json_data(certs_file), Certification)
     pizza_map = load_pizza_statuses(pizza_statuses_file)
     status_orders = load_status_types(status_types_file, pizza_map)
     
@@ -14,23 +14,20 @@ from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
 
+from date_parser import parse_date
+from json_stream import iter_records
+from quantile_sketch import PERCENTILES, KLLSketch
+
+try:
+    from progression_engine import ProgressionEngine, StatusEvents  # optional: pip install numpy
+except ImportError:
+    ProgressionEngine = None
+
 def load_json(filepath):
     """Load JSON data from file"""
     with open(filepath, 'r') as f:
         return json.load(f)
 
-def parse_date(date_str):
-    """Parse date string to datetime object"""
-    if not date_str:
-        return None
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S.%f')
-    except:
-        try:
-            return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-        except:
-            return None
-
 def get_status_name(status_id, status_types):
     """Get status name from StatusID"""
     for status_type in status_types:
@@ -46,6 +43,10 @@ def get_status_order(status_id, status_types):
             return int(order) if order and order.isdigit() else 999
     return 999
 
+def load_status_tracker(filepath):
+    """StatusTracker events from pay_StatusTracker.json ({"statusTracker": [...]} or a bare array)"""
+    return list(iter_records(filepath))
+
 def analyze_operator_journey(operator_id, events, status_types):
     """Analyze individual operator's journey through statuses"""
     # Sort events by date
@@ -89,24 +90,29 @@ def analyze_operator_journey(operator_id, events, status_types):
     
     return journey
 
+def build_journeys(events, status_types):
+    """Journeys for every operator in a list of StatusTracker events (NumPy engine when installed)"""
+    if ProgressionEngine is not None:
+        return ProgressionEngine(StatusEvents.from_records(events), status_types).journeys()
+    operator_events = defaultdict(list)
+    for event in events:
+        operator_events[event['OperatorID']].append(event)
+    return [analyze_operator_journey(operator_id, evts, status_types)
+            for operator_id, evts in operator_events.items()]
+
 def identify_bottlenecks(journeys, status_types):
     """Identify status bottlenecks across all operators"""
-    status_times = defaultdict(list)
-    status_counts = defaultdict(int)
+    # One streaming sketch per status: exact count/avg/min/max, approximate percentiles
+    status_times = defaultdict(KLLSketch)
     
     for journey in journeys:
         for stage in journey['stages']:
-            status = stage['status']
-            days = stage['days_in_status']
-            status_times[status].append(days)
-            status_counts[status] += 1
+            status_times[stage['status']].update(stage['days_in_status'])
     
     bottlenecks = []
     for status, times in status_times.items():
-        if len(times) > 0:
-            avg_days = sum(times) / len(times)
-            max_days = max(times)
-            min_days = min(times)
+        if times.n > 0:
+            p50, p90, p99 = times.quantiles(PERCENTILES)
             
             # Get status order
             status_order = 999
@@ -119,11 +125,14 @@ def identify_bottlenecks(journeys, status_types):
             bottlenecks.append({
                 'status': status,
                 'order': status_order,
-                'avg_days': round(avg_days, 1),
-                'max_days': max_days,
-                'min_days': min_days,
-                'operator_count': len(times),
-                'total_transitions': status_counts[status]
+                'avg_days': round(times.mean(), 1),
+                'max_days': times.max,
+                'min_days': times.min,
+                'p50_days': p50,
+                'p90_days': p90,
+                'p99_days': p99,
+                'operator_count': times.n,
+                'total_transitions': times.n
             })
     
     # Sort by average days (descending)
@@ -186,44 +195,45 @@ def analyze_division_differences(journeys):
     """Compare progression patterns across divisions"""
     division_stats = defaultdict(lambda: {
         'operators': set(),
-        'avg_total_days': [],
-        'avg_stages': [],
-        'status_times': defaultdict(list)
+        'total_days': 0,
+        'total_stages': 0,
+        'status_times': defaultdict(KLLSketch)
     })
     
     for journey in journeys:
         division = journey['division']
         if division:
-            division_stats[division]['operators'].add(journey['operator_id'])
-            division_stats[division]['avg_total_days'].append(journey['total_days'])
-            division_stats[division]['avg_stages'].append(len(journey['stages']))
+            stats = division_stats[division]
+            stats['operators'].add(journey['operator_id'])
+            stats['total_days'] += journey['total_days']
+            stats['total_stages'] += len(journey['stages'])
             
             for stage in journey['stages']:
-                status = stage['status']
-                division_stats[division]['status_times'][status].append(stage['days_in_status'])
+                stats['status_times'][stage['status']].update(stage['days_in_status'])
     
     # Calculate averages
     division_comparison = []
     for division, stats in division_stats.items():
-        total_days_list = stats['avg_total_days']
-        stages_list = stats['avg_stages']
+        operator_count = len(stats['operators'])
         
         comparison = {
             'division': division,
-            'operator_count': len(stats['operators']),
-            'avg_total_journey_days': round(sum(total_days_list) / len(total_days_list), 1) if total_days_list else 0,
-            'avg_stages_count': round(sum(stages_list) / len(stages_list), 1) if stages_list else 0,
+            'operator_count': operator_count,
+            'avg_total_journey_days': round(stats['total_days'] / operator_count, 1),
+            'avg_stages_count': round(stats['total_stages'] / operator_count, 1),
             'slowest_status': None,
-            'slowest_status_avg_days': 0
+            'slowest_status_avg_days': 0,
+            'status_percentiles': {}
         }
         
         # Find slowest status for this division
         for status, times in stats['status_times'].items():
-            if times:
-                avg_time = sum(times) / len(times)
-                if avg_time > comparison['slowest_status_avg_days']:
-                    comparison['slowest_status'] = status
-                    comparison['slowest_status_avg_days'] = round(avg_time, 1)
+            p50, p90, p99 = times.quantiles(PERCENTILES)
+            comparison['status_percentiles'][status] = {'p50_days': p50, 'p90_days': p90, 'p99_days': p99}
+            avg_time = times.mean()
+            if avg_time > comparison['slowest_status_avg_days']:
+                comparison['slowest_status'] = status
+                comparison['slowest_status_avg_days'] = round(avg_time, 1)
         
         division_comparison.append(comparison)
     
@@ -265,6 +275,7 @@ def generate_text_summary(analysis_data, output_dir):
             f.write(f"   Order: Step {bottleneck['order']}\n")
             f.write(f"   Average Days: {bottleneck['avg_days']}\n")
             f.write(f"   Range: {bottleneck['min_days']} - {bottleneck['max_days']} days\n")
+            f.write(f"   P50 / P90 / P99: {bottleneck['p50_days']} / {bottleneck['p90_days']} / {bottleneck['p99_days']} days\n")
             f.write(f"   Operators Affected: {bottleneck['operator_count']}\n\n")
         
         # Division Comparison
@@ -319,43 +330,58 @@ def main():
     print("Loading data files...")
     
     # Load data
-    status_tracker = load_json(data_dir / 'pay_StatusTracker.json')
-    status_types = load_json(data_dir / 'pay_StatusTypes.txt')
+    tracker_events = load_status_tracker(data_dir / 'pay_StatusTracker.json')
+    status_types = load_json(data_dir / 'pay_StatusTypes.json')
     cert_requirements = load_json(generated_dir / 'cert_requirements_by_status_division.json')
     operators_data = load_json(data_dir / 'pay_Operators.json')
     
-    print(f"✓ Loaded {len(status_tracker['statusTracker'])} status tracking events")
+    print(f"✓ Loaded {len(tracker_events)} status tracking events")
     print(f"✓ Loaded {len(status_types)} status types")
     print(f"✓ Loaded certification requirements for {len(cert_requirements)} statuses")
     # operators_data is a list, not a dict
     print(f"✓ Loaded {len(operators_data)} operators")
     
-    # Group events by operator
-    print("\nGrouping events by operator...")
-    operator_events = defaultdict(list)
-    for event in status_tracker['statusTracker']:
-        operator_events[event['OperatorID']].append(event)
-    
-    print(f"✓ Found status history for {len(operator_events)} operators")
-    
-    # Analyze individual journeys
-    print("\nAnalyzing operator journeys...")
-    journeys = []
-    for operator_id, events in operator_events.items():
-        journey = analyze_operator_journey(operator_id, events, status_types)
-        journeys.append(journey)
-    
-    print(f"✓ Analyzed {len(journeys)} operator journeys")
-    
-    # Identify bottlenecks
-    print("\nIdentifying bottlenecks...")
-    bottlenecks = identify_bottlenecks(journeys, status_types)
-    print(f"✓ Identified {len(bottlenecks)} status stages with timing data")
-    
-    # Analyze division differences
-    print("\nAnalyzing division differences...")
-    division_comparison = analyze_division_differences(journeys)
-    print(f"✓ Compared {len(division_comparison)} divisions")
+    if ProgressionEngine is not None:
+        # Vectorized: one sort of all events, dwell times as one diff
+        print("\nAnalyzing operator journeys (NumPy engine)...")
+        engine = ProgressionEngine(StatusEvents.from_records(tracker_events), status_types)
+        journeys = engine.journeys()
+        print(f"✓ Analyzed {len(journeys)} operator journeys")
+        
+        print("\nIdentifying bottlenecks...")
+        bottlenecks = engine.bottlenecks()
+        print(f"✓ Identified {len(bottlenecks)} status stages with timing data")
+        
+        print("\nAnalyzing division differences...")
+        division_comparison = engine.division_comparison()
+        print(f"✓ Compared {len(division_comparison)} divisions")
+    else:
+        # Group events by operator
+        print("\nGrouping events by operator...")
+        operator_events = defaultdict(list)
+        for event in tracker_events:
+            operator_events[event['OperatorID']].append(event)
+        
+        print(f"✓ Found status history for {len(operator_events)} operators")
+        
+        # Analyze individual journeys
+        print("\nAnalyzing operator journeys...")
+        journeys = []
+        for operator_id, events in operator_events.items():
+            journey = analyze_operator_journey(operator_id, events, status_types)
+            journeys.append(journey)
+        
+        print(f"✓ Analyzed {len(journeys)} operator journeys")
+        
+        # Identify bottlenecks
+        print("\nIdentifying bottlenecks...")
+        bottlenecks = identify_bottlenecks(journeys, status_types)
+        print(f"✓ Identified {len(bottlenecks)} status stages with timing data")
+        
+        # Analyze division differences
+        print("\nAnalyzing division differences...")
+        division_comparison = analyze_division_differences(journeys)
+        print(f"✓ Compared {len(division_comparison)} divisions")
     
     # Analyze cert completion timing
     print("\nAnalyzing certification completion timing...")
@@ -5,10 +5,17 @@ Focus on operator 0D5B99A8-D6A3-4C8E-8053-0AB30DFF0B28 (Jalan Minney)
 """
 
 import json
+import os
+import sys
 from collections import defaultdict
 from datetime import datetime
 from difflib import SequenceMatcher
 
+# Ensure we can import shared modules from the scripts folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cert_name_index import CloseMatcher
+
 def load_json_file(filepath):
     """Load and parse JSON file"""
     with open(filepath, 'r') as f:
@@ -155,6 +162,10 @@ def analyze_operator_deep_dive(operator_id, operators_data, cert_requirements):
     operator_cert_names = {normalize_cert_name(cert['name']) for cert in cert_details}
     required_cert_names = {normalize_cert_name(cert) for cert in all_division_certs}
     
+    # close_matches() runs SequenceMatcher only on names its upper bounds
+    # cannot rule out, with the same result as a full scan
+    operator_cert_matcher = CloseMatcher(cert['name'] for cert in cert_details)
+    
     # Find exact matches
     exact_matches = []
     fuzzy_matches = []
@@ -168,11 +179,12 @@ def analyze_operator_deep_dive(operator_id, operators_data, cert_requirements):
         if req_norm in operator_cert_names:
             exact_matches.append(req_cert)
         else:
-            # Check for fuzzy match
+            # Check for fuzzy match (first best in cert order, as when every name was scored)
             best_match = None
             best_score = 0
+            close = operator_cert_matcher.close_matches(req_cert, cutoff=0.85)
             for op_cert in cert_details:
-                score = similar(req_cert, op_cert['name'])
+                score = close.get(op_cert['name'], 0)
                 if score > best_score:
                     best_score = score
                     best_match = op_cert['name']
@@ -15,10 +15,16 @@ NOTE: For data-driven certification requirements analysis based on real adoption
 """
 
 import json
+import sys
 from collections import defaultdict, Counter
 from pathlib import Path
 from datetime import datetime
 
+# Ensure we can import shared modules from the scripts folder
+sys.path.append(str(Path(__file__).parent.parent))
+
+from date_parser import parse_date
+
 class CertificationGapAnalyzer:
     def __init__(self, data_dir='data'):
         self.data_dir = Path(data_dir)
@@ -221,7 +227,9 @@ class CertificationGapAnalyzer:
             expiration = cert.get('ExpirationDate')
             if expiration:
                 try:
-                    exp_date = datetime.strptime(expiration, '%Y-%m-%d')
+                    exp_date = parse_date(expiration)
+                    if exp_date is None:
+                        continue
                     days_until_expiry = (exp_date - datetime.now()).days
                     
                     cert_info = {
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Backup Store for data/ Files
+
+Replaces the full timestamped copies in data/backups/. Every version of a
+file is stored once, under the SHA-256 of its contents, as a zlib-compressed
+line delta against the previous version (a full copy every SNAPSHOT_EVERY
+versions keeps restores short). A per-file index records when each version
+was current, so any point in time can be restored.
+
+Layout:
+    data/backups/objects/ab/ab12...    one object per distinct version
+    data/backups/<file>.index.jsonl    {"at", "hash", "size", "source"} per version
+
+Object format:
+    header JSON line: {"type": "full"} or {"type": "delta", "base": <hash>, "depth": n}
+    zlib payload:     file bytes (full), or JSON ops (delta):
+                      ["c", start, end] copy base lines, ["i", [lines]] insert lines
+
+Retention (prune): every version from the last KEEP_ALL_DAYS days, then the
+last version of each day. Deltas whose base was pruned are re-encoded
+against the previous kept version before unreferenced objects are deleted.
+
+Usage:
+    # Versions of the requirements file (newest last)
+    python3 scripts/backup_store.py list [--since 2026-10-01]
+
+    # Restore the version current at a point in time (or by hash prefix)
+    python3 scripts/backup_store.py restore --at "2026-10-16 14:00" [--output restored.json]
+    python3 scripts/backup_store.py restore --hash 3fa9c2 [--output restored.json]
+
+    # Apply retention, back up a file by hand, or import old timestamped copies
+    python3 scripts/backup_store.py prune [--keep-days 14]
+    python3 scripts/backup_store.py add data/pay_PizzaStatusRequirements.json
+    python3 scripts/backup_store.py import [--delete]
+
+    # Library
+    from backup_store import BackupStore
+
+    backups = BackupStore(path='data/pay_PizzaStatusRequirements.json')
+    backups.add(body, source='save')
+    body = backups.restore_at('2026-10-16 14:00')
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_FILE = BASE_PATH / 'data' / 'pay_PizzaStatusRequirements.json'
+
+KEEP_ALL_DAYS = 14       # every version is kept this long, then one per day
+SNAPSHOT_EVERY = 32      # longest delta chain before a full copy is stored
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# Old-style copies: pay_PizzaStatusRequirements.20261016-232408.json
+LEGACY_BACKUP = re.compile(r'^(?P<stem>.+)\.(?P<stamp>\d{8}-\d{6})\.json$')
+
+
+def atomic_write(path, body: bytes):
+    """Write via temp file + fsync + rename, so readers see the old or the new file, never a mix."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    # Make the rename itself durable
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _lines(body: bytes) -> List[str]:
+    # surrogateescape round-trips any bytes through str (and through JSON)
+    return body.decode('utf-8', 'surrogateescape').splitlines(keepends=True)
+
+
+def _join(lines: List[str]) -> bytes:
+    return ''.join(lines).encode('utf-8', 'surrogateescape')
+
+
+def line_delta(base: List[str], new: List[str]) -> List:
+    """Copy/insert ops turning base lines into new lines."""
+    # Edits are usually local: match the common head and tail directly
+    head = 0
+    limit = min(len(base), len(new))
+    while head < limit and base[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and base[-1 - tail] == new[-1 - tail]:
+        tail += 1
+
+    ops = []
+    if head:
+        ops.append(['c', 0, head])
+    matcher = difflib.SequenceMatcher(None, base[head:len(base) - tail], new[head:len(new) - tail], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(['c', head + i1, head + i2])
+        elif j2 > j1:
+            ops.append(['i', new[head + j1:head + j2]])
+    if tail:
+        ops.append(['c', len(base) - tail, len(base)])
+    return ops
+
+
+def apply_delta(base: List[str], ops: List) -> List[str]:
+    lines = []
+    for op in ops:
+        if op[0] == 'c':
+            lines.extend(base[op[1]:op[2]])
+        else:
+            lines.extend(op[1])
+    return lines
+
+
+class BackupStore:
+    """Versions of one file: deduplicated, delta-compressed, restorable by time."""
+
+    def __init__(self, path=DEFAULT_FILE, backup_dir=None):
+        self.path = Path(path)
+        self.backup_dir = Path(backup_dir) if backup_dir else self.path.parent / 'backups'
+        self.objects_dir = self.backup_dir / 'objects'
+        self.index_path = self.backup_dir / f"{self.path.name}.index.jsonl"
+        self.lock = threading.Lock()
+
+    # ----- objects -----
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _read_object(self, digest: str):
+        with open(self._object_path(digest), 'rb') as f:
+            header = json.loads(f.readline())
+            payload = zlib.decompress(f.read())
+        return header, payload
+
+    def _write_object(self, digest: str, header: Dict, payload: bytes):
+        path = self._object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + digest[:8], dir=path.parent)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            f.write(zlib.compress(payload, 9))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def read(self, digest: str) -> bytes:
+        """Contents of a stored version."""
+        chain = []
+        while True:
+            header, payload = self._read_object(digest)
+            if header['type'] == 'full':
+                break
+            chain.append(json.loads(payload))
+            digest = header['base']
+        lines = _lines(payload)
+        for ops in reversed(chain):
+            lines = apply_delta(lines, ops)
+        return _join(lines)
+
+    def _store(self, body: bytes, digest: str, base: Optional[str]):
+        """Write the object for body: a delta against base if that is short enough, else a full copy."""
+        if base and base != digest and self._object_path(base).exists():
+            base_header, _ = self._read_object(base)
+            depth = base_header.get('depth', 0) + 1
+            if depth < SNAPSHOT_EVERY:
+                base_lines = _lines(self.read(base))
+                ops = line_delta(base_lines, _lines(body))
+                payload = json.dumps(ops, separators=(',', ':')).encode('utf-8')
+                # Only keep the delta if it really rebuilds the file and saves space
+                if _join(apply_delta(base_lines, ops)) == body and len(payload) < len(body):
+                    self._write_object(digest, {'type': 'delta', 'base': base, 'depth': depth}, payload)
+                    return
+        self._write_object(digest, {'type': 'full'}, body)
+
+    # ----- index -----
+
+    def versions(self) -> List[Dict]:
+        """Index entries, oldest first."""
+        if not self.index_path.exists():
+            return []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _write_index(self, entries: List[Dict]):
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + self.index_path.name, dir=self.backup_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    def add(self, body: bytes, source: str = 'save', at: Optional[datetime] = None) -> Optional[str]:
+        """Record body as the current version; returns its hash, or None if unchanged."""
+        with self.lock:
+            entries = self.versions()
+            digest = content_hash(body)
+            if entries and entries[-1]['hash'] == digest:
+                return None
+            if not self._object_path(digest).exists():
+                self._store(body, digest, entries[-1]['hash'] if entries else None)
+            entry = {
+                'at': (at or datetime.now()).strftime(TIME_FORMAT),
+                'hash': digest,
+                'size': len(body),
+                'source': source
+            }
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            return digest
+
+    def find(self, at=None, hash_prefix: Optional[str] = None) -> Optional[Dict]:
+        """Version current at a point in time (datetime or 'YYYY-MM-DD[ HH:MM[:SS]]'), or by hash prefix."""
+        entries = self.versions()
+        if hash_prefix:
+            matches = {e['hash'] for e in entries if e['hash'].startswith(hash_prefix)}
+            if len(matches) > 1:
+                raise ValueError(f"Hash prefix {hash_prefix!r} is ambiguous")
+            return next((e for e in reversed(entries) if e['hash'] in matches), None)
+        moment = parse_time(at).strftime(TIME_FORMAT) if at is not None else None
+        found = None
+        for entry in entries:
+            if moment is not None and entry['at'] > moment:
+                break
+            found = entry
+        return found
+
+    def restore_at(self, at) -> Optional[bytes]:
+        entry = self.find(at)
+        return self.read(entry['hash']) if entry else None
+
+    # ----- retention -----
+
+    def prune(self, keep_days: int = KEEP_ALL_DAYS, now: Optional[datetime] = None) -> Dict:
+        """Keep every version newer than keep_days, then the last version of each day."""
+        with self.lock:
+            entries = self.versions()
+            cutoff = ((now or datetime.now()) - timedelta(days=keep_days)).strftime(TIME_FORMAT)
+            last_of_day = {}
+            for i, entry in enumerate(entries):
+                if entry['at'] < cutoff:
+                    last_of_day[entry['at'][:10]] = i
+            old_kept = set(last_of_day.values())
+            kept = [e for i, e in enumerate(entries) if e['at'] >= cutoff or i in old_kept]
+            if len(kept) == len(entries):
+                return {'versions': len(entries), 'removed': 0, 'objects_deleted': 0}
+
+            # Re-encode deltas whose base chain goes through a version being dropped.
+            # Bases always come from earlier in the index, so chains cannot loop.
+            needed = {e['hash'] for e in kept}
+            seen, previous = set(), None
+            for entry in kept:
+                digest = entry['hash']
+                if digest not in seen and not self._chain_within(digest, needed):
+                    self._store(self.read(digest), digest, previous)
+                seen.add(digest)
+                previous = digest
+            self._write_index(kept)
+
+            deleted = 0
+            for path in self.objects_dir.glob('*/*'):
+                if path.name not in needed and not path.name.startswith('.'):
+                    path.unlink()
+                    deleted += 1
+            return {'versions': len(kept), 'removed': len(entries) - len(kept), 'objects_deleted': deleted}
+
+    def _chain_within(self, digest: str, allowed: set) -> bool:
+        header, _ = self._read_object(digest)
+        while header['type'] == 'delta':
+            if header['base'] not in allowed:
+                return False
+            header, _ = self._read_object(header['base'])
+        return True
+
+    # ----- legacy copies -----
+
+    def import_legacy(self, delete: bool = False) -> int:
+        """Add old <stem>.<YYYYmmdd-HHMMSS>.json copies from the backup dir, oldest first."""
+        copies = []
+        for path in self.backup_dir.glob(f"{self.path.stem}.*.json"):
+            match = LEGACY_BACKUP.match(path.name)
+            if match and match.group('stem') == self.path.stem:
+                copies.append((datetime.strptime(match.group('stamp'), '%Y%m%d-%H%M%S'), path))
+        copies.sort()
+
+        # Merge into the index in time order
+        known = self.versions()
+        for at, path in copies:
+            known.append({'at': at.strftime(TIME_FORMAT), 'hash': None, 'path': path})
+        known.sort(key=lambda e: e['at'])
+
+        entries, previous = [], None
+        for entry in known:
+            if entry['hash'] is None:
+                body = entry.pop('path').read_bytes()
+                entry.update(hash=content_hash(body), size=len(body), source='import')
+                if entry['hash'] == previous:
+                    continue
+                if not self._object_path(entry['hash']).exists():
+                    self._store(body, entry['hash'], previous)
+            entries.append(entry)
+            previous = entry['hash']
+
+        with self.lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            self._write_index(entries)
+        if delete:
+            for _, path in copies:
+                path.unlink()
+        return len(copies)
+
+    def disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.objects_dir.glob('*/*')) if self.objects_dir.exists() else 0
+
+
+def parse_time(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip().replace('T', ' ')
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            moment = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        # A bare date means the end of that day
+        return moment + timedelta(days=1, seconds=-1) if fmt == '%Y-%m-%d' else moment
+    raise ValueError(f"Unrecognized time {value!r} (use YYYY-MM-DD[ HH:MM[:SS]])")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned backups of data/ files')
+    parser.add_argument('--file', type=Path, default=DEFAULT_FILE, help='file whose backups to use')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='list stored versions')
+    list_parser.add_argument('--since', help='only versions from this time on')
+
+    restore_parser = subparsers.add_parser('restore', help='restore a version')
+    target = restore_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--at', help='the version current at YYYY-MM-DD[ HH:MM[:SS]]')
+    target.add_argument('--hash', help='a version by hash prefix')
+    restore_parser.add_argument('--output', type=Path, help='write here instead of over --file')
+
+    prune_parser = subparsers.add_parser('prune', help='apply the retention policy')
+    prune_parser.add_argument('--keep-days', type=int, default=KEEP_ALL_DAYS)
+
+    subparsers.add_parser('add', help='back up the current contents of --file')
+
+    import_parser = subparsers.add_parser('import', help='import old timestamped full copies')
+    import_parser.add_argument('--delete', action='store_true', help='delete the copies once imported')
+
+    args = parser.parse_args()
+    store = BackupStore(args.file)
+
+    if args.command == 'list':
+        since = parse_time(args.since).strftime(TIME_FORMAT) if args.since else ''
+        entries = [e for e in store.versions() if e['at'] >= since]
+        print(f"🗄️  {len(entries)} versions of {store.path.name} ({store.disk_usage():,} bytes stored)")
+        for entry in entries:
+            print(f"   {entry['at'].replace('T', ' ')}  {entry['hash'][:12]}  {entry['size']:>10,} bytes  {entry['source']}")
+
+    elif args.command == 'restore':
+        entry = store.find(at=args.at) if args.at else store.find(hash_prefix=args.hash)
+        if entry is None:
+            print(f"❌ No version found for {args.at or args.hash}")
+            sys.exit(1)
+        start = time.perf_counter()
+        body = store.read(entry['hash'])
+        output = args.output or store.path
+        if output == store.path and output.exists():
+            # The version being replaced stays restorable
+            store.add(output.read_bytes(), source='pre-restore')
+        atomic_write(output, body)   # a running server never reads a half-written file
+        if output == store.path:
+            store.add(body, source='restore')
+        print(f"✓ Restored version {entry['hash'][:12]} from {entry['at'].replace('T', ' ')} "
+              f"to {output} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    elif args.command == 'prune':
+        before = store.disk_usage()
+        result = store.prune(args.keep_days)
+        print(f"🧹 {result['removed']} versions removed, {result['versions']} kept, "
+              f"{result['objects_deleted']} objects deleted ({before:,} -> {store.disk_usage():,} bytes)")
+
+    elif args.command == 'add':
+        digest = store.add(store.path.read_bytes(), source='manual')
+        print(f"✓ Stored version {digest[:12]}" if digest else "✓ Unchanged since the last backup")
+
+    elif args.command == 'import':
+        count = store.import_legacy(delete=args.delete)
+        print(f"✓ Imported {count} timestamped copies ({len(store.versions())} versions, "
+              f"{store.disk_usage():,} bytes stored)")
+
+
+if __name__ == '__main__':
+    main()
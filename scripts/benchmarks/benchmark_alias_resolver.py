@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: alias resolution of cert names
+
+Compares the old per-cert loop over every alias variation (what
+generate_compliance_gap_report.normalize_cert_name used to do) with the
+compiled AliasResolver, on every Certification name in pay_CertTypes.json
+repeated --scale times.
+
+When --data-dir has a pay_Certifications extract, it also checks the gap
+report against the old matching (a required name counts as held when an
+operator holds it as written, or through the alias loop). A required cert that is already
+named canonically must be missing exactly when it was before; one named
+by an alias may only stop being missing, never start.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_alias_resolver.py [--scale 1000] [--data-dir data]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'reports'))
+
+from alias_resolver import AliasResolver
+from generate_compliance_gap_report import (LookupContext, build_operator_cert_map, load_certifications,
+                                            load_json_data, operator_gap_state)
+
+
+def loop_normalize(cert_name, aliases):
+    """Pre-resolver implementation: scan every variation of every alias."""
+    cert_lower = cert_name.strip().lower()
+    for canonical, variations in aliases.items():
+        if not isinstance(variations, list):
+            continue
+        for variation in variations:
+            if cert_lower == variation.lower():
+                return canonical
+    return cert_name.strip()
+
+
+def time_it(label, func, names):
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s  ({len(names) / elapsed:,.0f} names/sec)")
+    return elapsed
+
+
+def check_gap_report(data_dir, aliases, resolver):
+    """Gap report missing certs vs the old matching; returns True when they agree."""
+    operator_certs = build_operator_cert_map(load_certifications(data_dir / 'pay_Certifications.json'),
+                                             load_json_data(data_dir / 'pay_Operators.json'))
+    context = LookupContext(load_json_data(data_dir / 'pay_StatusTypes.json'),
+                            load_json_data(data_dir / 'pay_PizzaStatusRequirements.json'), resolver)
+
+    canonical = aliased = fixed = wrong = 0
+    for operator_id, op_data in operator_certs.items():
+        new_missing = set(operator_gap_state(operator_id, op_data, context)['missing_certs'])
+        # Held as written, or through the alias loop
+        old_held = {cert.strip() for cert in op_data['certs']}
+        old_held.update(loop_normalize(cert, aliases) for cert in op_data['certs'])
+        for cert in context.get_required_certs(op_data['StatusName'], op_data['DivisionID']):
+            old, new = cert.strip() not in old_held, cert in new_missing
+            if resolver.resolve(cert) == cert:
+                canonical += 1
+                wrong += old != new
+            else:
+                aliased += 1
+                fixed += old and not new
+                wrong += new and not old
+
+    ok = wrong == 0
+    print(f"\nGap report vs old matching ({len(operator_certs):,} operators):")
+    print(f"  {canonical:,} required certs named canonically, {aliased:,} by an alias "
+          f"({fixed:,} no longer missing)")
+    print(f"  {'✓' if ok else '✗'} {wrong} missing certs differ where they must not")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=1000, help='times to repeat the CertTypes names')
+    parser.add_argument('--data-dir', type=Path, default=Path(__file__).parent.parent.parent / 'data',
+                        help='extracts for the gap report check (needs pay_Certifications.json)')
+    args = parser.parse_args()
+
+    base_path = Path(__file__).parent.parent.parent
+    with open(base_path / 'data' / 'pay_CertTypes.json', 'r', encoding='utf-8') as f:
+        cert_names = [ct.get('Certification') or '' for ct in json.load(f)]
+    with open(base_path / 'config' / 'certification_aliases.json', 'r', encoding='utf-8') as f:
+        aliases = json.load(f)
+
+    names = cert_names * args.scale
+    print(f"Resolving {len(names):,} names ({len(cert_names):,} CertTypes x {args.scale})")
+
+    start = time.perf_counter()
+    resolver = AliasResolver(aliases)
+    print(f"  {'compile resolver':<28} {time.perf_counter() - start:8.3f}s  ({len(resolver)} keys)")
+
+    loop_time = time_it('alias loop (old)', lambda n: loop_normalize(n, aliases), names)
+    resolver_time = time_it('AliasResolver.resolve', resolver.resolve, names)
+
+    print(f"\nSpeedup: {loop_time / resolver_time:.1f}x")
+
+    if (args.data_dir / 'pay_Certifications.json').exists():
+        if not check_gap_report(args.data_dir, aliases, resolver):
+            sys.exit(1)
+    else:
+        print(f"\n(no pay_Certifications.json in {args.data_dir}: gap report check skipped)")
+
+
+if __name__ == '__main__':
+    main()
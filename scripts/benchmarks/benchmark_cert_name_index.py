@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy cert matching in deep_dive_operator_analysis.py
+
+For every distinct real cert name (pay_CertTypes.json plus the certification
+extracts, see cert_name_index.collect_cert_names), compares against the old
+full scan, which ran similar() from deep_dive_operator_analysis.py on every
+other name:
+
+    close_matches   CloseMatcher.close_matches(), what the deep dive uses now;
+                    must return exactly the names the full scan scores >= 0.85
+    top-5 trigram   the previous prefilter (top_k(k=5, threshold=0.5)); shown
+                    for how often its best match differed from the full scan's
+
+Usage:
+    python3 scripts/benchmarks/benchmark_cert_name_index.py [--source FILE ...] [--cutoff 0.85]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'archive'))
+
+from cert_name_index import DEFAULT_SOURCES, CertNameIndex, CloseMatcher, collect_cert_names
+from deep_dive_operator_analysis import similar
+
+
+def full_scan(query, names, cutoff):
+    scores = {name: similar(query, name) for name in names}
+    return {name: score for name, score in scores.items() if score >= cutoff}
+
+
+def best(scores, names):
+    """First name (in list order) with the highest score, as the deep dive picks it."""
+    best_name, best_score = None, 0
+    for name in names:
+        if scores.get(name, 0) > best_score:
+            best_name, best_score = name, scores[name]
+    return best_name, best_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check fuzzy cert matching against the full scan')
+    parser.add_argument('--source', action='append', type=Path, help='name source (default: CertTypes + extracts)')
+    parser.add_argument('--cutoff', type=float, default=0.85)
+    args = parser.parse_args()
+
+    names = sorted(name for name in collect_cert_names(args.source or DEFAULT_SOURCES) if name.strip())
+    index = CertNameIndex(names)
+    print(f"📂 {len(names)} distinct cert names; each one queried against all the others\n")
+
+    start = time.perf_counter()
+    expected = {query: full_scan(query, names, args.cutoff) for query in names}
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = CloseMatcher(names)
+    got = {query: matcher.close_matches(query, cutoff=args.cutoff) for query in names}
+    close_seconds = time.perf_counter() - start
+
+    capped_misses = 0
+    for query in names:
+        others = [name for name in names if name != query]
+        candidates = [name for name, _ in index.top_k(query, k=5, threshold=0.5) if name != query]
+        capped = {name: similar(query, name) for name in candidates}
+        capped = {name: score for name, score in capped.items() if score >= args.cutoff}
+        if best(capped, others)[0] != best(expected[query], others)[0]:
+            capped_misses += 1
+
+    mismatched = [query for query in names if got[query] != expected[query]]
+    pairs = sum(len(matches) - (query in matches) for query, matches in expected.items())
+    print(f"  full scan        {scan_seconds:7.2f}s  {pairs:,} pairs >= {args.cutoff}")
+    print(f"  close_matches    {close_seconds:7.2f}s  "
+          f"{'✓ same matches for every name' if not mismatched else f'❌ differs for {len(mismatched)} names'}"
+          f"  ({scan_seconds / close_seconds:.1f}x)")
+    print(f"  top-5 trigram    best match differed for {capped_misses} names")
+    for query in mismatched[:5]:
+        print(f"     {query!r}: expected {sorted(expected[query])}, got {sorted(got[query])}")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared date parser vs chained strptime
+
+Generates --rows timestamps split evenly over the four shapes in the
+extracts (tracker '2025-12-03 15:15:48.813', '2024-09-25 00:00:00.000',
+ISO '2025-03-13T17:04:26.943Z' and expiration dates '2025-03-13'), one
+column per shape, and parses each column with:
+
+    strptime chain       the old try/except strptime parse_date (on --baseline-rows only)
+    parse_date           date_parser.parse_date, one call per value (memoized)
+    parse_column         format detected once per column, memoized
+    epoch_microseconds   batch API -> int64 epoch array
+
+Usage:
+    python3 scripts/benchmarks/benchmark_date_parser.py [--rows 10000000] [--baseline-rows 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import date_parser
+from date_parser import epoch_microseconds, parse_column, parse_date, to_epoch_us
+
+SHAPES = {
+    'tracker (.fff)': lambda d: d.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+    'midnight (.000)': lambda d: d.strftime('%Y-%m-%d 00:00:00.000'),
+    'ISO Z': lambda d: d.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+    'date only': lambda d: d.strftime('%Y-%m-%d'),
+}
+STRPTIME_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%d')
+
+
+def strptime_chain(date_str):
+    """The chained try/except parsing the scripts used before date_parser"""
+    if not date_str:
+        return None
+    for date_format in STRPTIME_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            pass
+    return None
+
+
+def column(shape, rows, seed=11):
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    fmt = SHAPES[shape]
+    return [fmt(base + timedelta(seconds=rng.randrange(3 * 365 * 86400), milliseconds=rng.randrange(1000)))
+            for _ in range(rows)]
+
+
+def timed(label, rows, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"    {label:<30} {rows:>10,} values  {elapsed:7.2f}s  {rows / elapsed / 1e6:7.2f}M values/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared date parser')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--baseline-rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    per_shape = args.rows // len(SHAPES)
+    print(f"📊 Parsing {per_shape * len(SHAPES):,} timestamps ({per_shape:,} per shape)")
+
+    for shape in SHAPES:
+        values = column(shape, per_shape)
+        baseline = values[:args.baseline_rows]
+        print(f"\n  {shape}: {values[0]!r}, {len(set(values)):,} distinct")
+
+        expected = timed('strptime chain', len(baseline), lambda: list(map(strptime_chain, baseline)))
+        parse_date.cache_clear()
+        timed('parse_date (memoized)', len(values), lambda: list(map(parse_date, values)))
+        parsed = timed('parse_column', len(values), parse_column, values)
+        epochs = timed('epoch_microseconds', len(values), epoch_microseconds, values)
+        numpy = date_parser.np
+        date_parser.np = None
+        try:
+            timed('epoch_microseconds (no NumPy)', len(values), epoch_microseconds, values)
+        finally:
+            date_parser.np = numpy
+
+        same = parsed[:len(baseline)] == expected and \
+            list(epochs[:len(baseline)]) == [to_epoch_us(d) for d in expected]
+        print(f"    {'✓' if same else '✗'} results {'match' if same else 'DIFFER from'} strptime")
+        del values, parsed, epochs
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rolling-window percentiles from stored daily sketches
+
+Synthesizes --stages completed status stages over --years of history
+(random division, status, end day and a long-tailed dwell in days),
+writes them as daily sketches with dwell_sketches.write_days(), then
+answers 30/90/365-day and all-history windows by merging the stored days.
+Each window's p50/p90/p99 is checked against the exact percentiles of the
+raw dwell values (reported as the worst rank error over every
+(division, status) in the window) and timed against sorting the raw values.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_dwell_sketches.py [--stages 2000000] [--years 3]
+"""
+
+import argparse
+import bisect
+import math
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dwell_sketches import ALL_DIVISIONS, window_sketches, write_days
+from quantile_sketch import PERCENTILES, KLLSketch
+
+DIVISIONS = ['2 - IL', '3 - TX', '5 - CA', '6 - FL', '7 - MI', '8 - OH', '10 - OR', '11 - GA', '12 - PA']
+STATUSES = ['REGISTRATION', 'CREDENTIALING', 'ONBOARDING', 'DOT SCREENING', 'COMPLIANCE REVIEW',
+            'APPROVED-ORIENTATION BTW', 'APPROVED FOR CONTRACTING', 'IN-SERVICE']
+WINDOWS = (30, 90, 365, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark daily dwell sketches')
+    parser.add_argument('--stages', type=int, default=2_000_000)
+    parser.add_argument('--years', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    last_day = date(2025, 12, 31)
+    day_count = args.years * 365
+    days = [(last_day - timedelta(days=i)).isoformat() for i in range(day_count)]
+
+    print(f"📊 Sketching {args.stages:,} stages over {day_count:,} days...")
+    sketches = defaultdict(lambda: defaultdict(lambda: defaultdict(KLLSketch)))
+    raw = []
+    start = time.perf_counter()
+    for _ in range(args.stages):
+        day, division, status = rng.choice(days), rng.choice(DIVISIONS), rng.choice(STATUSES)
+        dwell = int(rng.lognormvariate(2.5, 1.2))
+        sketches[day][division][status].update(dwell)
+        raw.append((day, division, status, dwell))
+    print(f"  sketched in {time.perf_counter() - start:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp)
+        start = time.perf_counter()
+        write_days(sketches, store)
+        size = sum(path.stat().st_size for path in store.glob('*.json'))
+        print(f"  wrote {day_count:,} day files, {size / 1e6:.1f} MB, in {time.perf_counter() - start:.2f}s")
+
+        print(f"\n{'Window':>10} {'Stages':>10} {'Merge':>8} {'Raw sort':>9} {'Worst rank error':>17}")
+        for window in WINDOWS:
+            first = days[-1] if window is None else days[window - 1]
+            start = time.perf_counter()
+            merged = window_sketches(first, days[0], store)
+            merge_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            exact = defaultdict(list)
+            for day, division, status, dwell in raw:
+                if first <= day:
+                    exact[(division, status)].append(dwell)
+                    exact[(ALL_DIVISIONS, status)].append(dwell)
+            for values in exact.values():
+                values.sort()
+            raw_seconds = time.perf_counter() - start
+
+            worst = 0.0
+            for key, values in exact.items():
+                for fraction, value in zip(PERCENTILES, merged[key].quantiles(PERCENTILES)):
+                    # Rank interval the sketch's answer occupies vs the requested rank
+                    lo, hi = bisect.bisect_left(values, value), bisect.bisect_right(values, value)
+                    target = math.ceil(fraction * len(values))
+                    worst = max(worst, max(lo + 1 - target, target - hi, 0) / len(values))
+            stages = sum(len(v) for (division, _), v in exact.items() if division == ALL_DIVISIONS)
+            label = 'all' if window is None else f'{window}d'
+            print(f"{label:>10} {stages:>10,} {merge_seconds:>7.2f}s {raw_seconds:>8.2f}s {worst:>16.2%}")
+
+
+if __name__ == '__main__':
+    main()
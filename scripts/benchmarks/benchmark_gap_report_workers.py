@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compliance gap report, serial vs sharded by division
+
+Builds a synthetic operator certification map (statuses and divisions drawn
+from pay_StatusTypes.json, cert names from pay_PizzaStatusRequirements.json),
+then times generate_gap_report() and generate_gap_report_sharded() with
+1..N workers. Each sharded result is checked to serialize byte-identically
+to the serial report.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_gap_report_workers.py [--operators 200000] [--max-workers N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'reports'))
+
+from alias_resolver import AliasResolver
+from generate_compliance_gap_report import LookupContext, generate_gap_report, generate_gap_report_sharded
+
+BASE_PATH = Path(__file__).parent.parent.parent
+
+
+def synthetic_operator_certs(count, status_types, cert_names):
+    """Operator map shaped like build_operator_cert_map() output."""
+    random.seed(11)
+    operator_certs = {}
+    for i in range(count):
+        status_type = random.choice(status_types)
+        operator_certs[f'OP-{i:08d}'] = {
+            'StatusName': status_type['Status'],
+            'DivisionID': status_type['DivisionID'],
+            'FirstName': f'First{i}',
+            'LastName': f'Last{i}',
+            'certs': set(random.sample(cert_names, random.randint(3, 15)))
+        }
+    return operator_certs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--operators', type=int, default=200000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with open(BASE_PATH / 'data' / 'pay_StatusTypes.json', 'r', encoding='utf-8') as f:
+        status_types = [st for st in json.load(f) if st.get('Status') and st.get('DivisionID')]
+    with open(BASE_PATH / 'data' / 'pay_PizzaStatusRequirements.json', 'r', encoding='utf-8') as f:
+        pizza_reqs = json.load(f)
+    aliases = AliasResolver.from_file(BASE_PATH / 'config' / 'certification_aliases.json')
+    cert_names = sorted({c['name'] for req in pizza_reqs.values() for c in req.get('required_certifications', [])})
+
+    operator_certs = synthetic_operator_certs(args.operators, status_types, cert_names)
+    divisions = len({op['DivisionID'] for op in operator_certs.values()})
+    print(f"{args.operators:,} operators across {divisions} divisions, {os.cpu_count()} CPUs\n")
+
+    context = LookupContext(status_types, pizza_reqs, aliases)
+
+    start = time.perf_counter()
+    serial = generate_gap_report(operator_certs, status_types, pizza_reqs, aliases, context)
+    serial_time = time.perf_counter() - start
+    expected = json.dumps(serial, indent=2, default=list)
+    print(f"  serial       {serial_time:7.2f}s")
+
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        sharded = generate_gap_report_sharded(operator_certs, context, workers)
+        elapsed = time.perf_counter() - start
+        identical = json.dumps(sharded, indent=2, default=list) == expected
+        print(f"  {workers:>2} workers   {elapsed:7.2f}s  ({serial_time / elapsed:4.2f}x)"
+              f"  {'identical' if identical else 'DIFFERS'}")
+
+
+if __name__ == '__main__':
+    main()
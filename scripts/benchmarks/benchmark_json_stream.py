@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming JSON loader vs json.load
+
+Checks that json_stream.iter_records returns exactly what json.load does
+for every read-chunk size from 1 to the document length. The documents
+cover both layouts (bare array, wrapped array behind other members) and
+the values that can straddle a chunk boundary: integers, fractions,
+exponents, negatives, escaped and non-ASCII strings, literals and nesting.
+A malformed record near the start of a large file must raise without the
+rest of the file being read into memory. Then times both loaders on the
+data/ extracts.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_json_stream.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from json_stream import iter_records
+
+BASE_PATH = Path(__file__).parent.parent.parent
+
+RECORDS = [
+    123, -7, 0, 2.5, -0.25, 1.5e10, 6E-3, 12345678901234567890,
+    'plain', 'esc\\"aped\n', 'café ✓', True, False, None,
+    {'OperatorID': 'A1', 'Score': 98.6, 'Count': 1000, 'Tags': ['x', 2, 3.0e2]},
+    [], {}, [[1, 22], {'n': -333}],
+]
+
+DOCUMENTS = {
+    'array': json.dumps(RECORDS),
+    'array, no spaces': json.dumps(RECORDS, separators=(',', ':')),
+    'wrapped': json.dumps({'count': 1234, 'meta': {'v': 1.25e-3}, 'certifications': RECORDS}, indent=2),
+    'numbers only': '[1,22,333,4.4,55.55,6e6,-7.7E-7]',
+}
+
+
+def check_chunk_sizes() -> bool:
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, text in DOCUMENTS.items():
+            path = Path(tmp) / 'doc.json'
+            path.write_text(text, encoding='utf-8')
+            expected = json.loads(text)
+            if isinstance(expected, dict):
+                expected = expected['certifications']
+            failures = []
+            for size in range(1, len(text) + 1):
+                try:
+                    got = list(iter_records(path, chunk_size=size))
+                except ValueError as e:
+                    got = e
+                if got != expected:
+                    failures.append(size)
+            ok = ok and not failures
+            status = '✓' if not failures else f'❌ chunk sizes {failures[:10]}'
+            print(f"  {label:<18} chunk sizes 1..{len(text):<5} {status}")
+    return ok
+
+
+def check_malformed() -> bool:
+    """A bad record early in an ~8MB array raises having read about one chunk."""
+    record = json.dumps({'OperatorID': 'A1', 'Notes': 'x' * 200})
+    text = '[' + record + ', {"OperatorID": oops}, ' + ', '.join([record] * 40000) + ']'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bad.json'
+        path.write_text(text, encoding='utf-8')
+        tracemalloc.start()
+        try:
+            list(iter_records(path))
+            error = None
+        except ValueError as e:
+            error = e
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    ok = error is not None and peak < len(text) // 8
+    status = '✓' if ok else '❌ read on past the bad record' if error else '❌ no error'
+    print(f"  malformed record   {len(text) / 1e6:.1f}MB file, peak {peak / 1e6:.2f}MB   {status}")
+    return ok
+
+
+def time_extracts():
+    for source in sorted((BASE_PATH / 'data').glob('pay_*.json')):
+        start = time.perf_counter()
+        with open(source, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        loaded_seconds = time.perf_counter() - start
+        if isinstance(loaded, dict):
+            loaded = next((v for v in loaded.values() if isinstance(v, list)), [])
+
+        start = time.perf_counter()
+        streamed = list(iter_records(source))
+        streamed_seconds = time.perf_counter() - start
+        match = '✓' if streamed == loaded else '❌ differs'
+        print(f"  {source.name:<36} {len(streamed):>8,} rows  json.load {loaded_seconds:6.3f}s"
+              f"  stream {streamed_seconds:6.3f}s  {match}")
+
+
+def main():
+    print("📊 Streamed vs json.load at every chunk size:")
+    ok = check_chunk_sizes()
+    ok = check_malformed() and ok
+    print("\n📊 data/ extracts:")
+    time_extracts()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming pipe-table converter vs the old convert_* scripts
+
+Writes a synthetic pipe-delimited export shaped like
+external/Certificates_raw_text_table.txt (the 13 leading columns), then
+converts it with pipe_table.convert() to json, ndjson and snapshot, and with
+the old approach (readlines, a list of dicts, json.dump(indent=2) to .txt and
+to .json). Each conversion runs in its own process and reports rows/sec and
+peak RSS. The old approach holds every row in memory, so it runs on
+--baseline-rows rows only (10M rows would need far more RAM than the export).
+
+First checks that batched parsing (fast path where a chunk allows it) gives
+the same rows as the line parser alone, at every chunk size, on small tables
+with blank lines, dash-only rows, row-count footers and ragged lines.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_pipe_table.py [--rows 10000000] [--baseline-rows 500000]
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pipe_table
+from pipe_table import PipeTable, convert
+
+COLUMNS = [
+    ('OperatorID', 36), ('FirstName', 9), ('LastName', 9), ('DivisionID', 10),
+    ('CurrentOperatorStatus', 24), ('StatusName', 24), ('StatusOrderID', 13), ('StatusRequiresCerts', 19),
+    ('CertificationID', 36), ('CertTypeID', 36), ('FleetID', 7), ('Cert', 48), ('Date', 17),
+]
+DIVISIONS = ['2 - IL', '3 - TX', '5 - CA', '6 - FL', '7 - MI', '8 - OH', '10 - OR', '11 - GA', '12 - PA']
+STATUSES = ['REGISTRATION', 'CREDENTIALING', 'APPROVED FOR CONTRACTING', 'APPROVED-ORIENTATION BTW',
+            'DOT SCREENING', 'IN-SERVICE', 'APPROVED FOR LEASING']
+CERTS = ['BACKGROUND CHECK', 'Defensive Driving', 'DOT Physical Card', 'Business Formation',
+         'DOT Drug & Alcohol Orientation', "Worker's Comp Coverage Waiver", 'COMPLIANCE REVIEW']
+
+
+def write_export(path: Path, rows: int, operators: int = 50_000, seed: int = 7):
+    rng = random.Random(seed)
+    operator_ids = [str(uuid.UUID(int=rng.getrandbits(128))).upper() for _ in range(operators)]
+    cert_type_ids = {cert: str(uuid.UUID(int=rng.getrandbits(128))).upper() for cert in CERTS}
+    widths = [width for _, width in COLUMNS]
+
+    def line(values):
+        return '|'.join(str(value).ljust(width) for value, width in zip(values, widths)) + '\n'
+
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(line([name for name, _ in COLUMNS]))
+        f.write('+'.join('-' * width for width in widths) + '\n')
+        batch = []
+        for i in range(rows):
+            status = rng.choice(STATUSES)
+            cert = rng.choice(CERTS)
+            batch.append(line([
+                operator_ids[i % operators], 'First', 'Last', rng.choice(DIVISIONS), status, status,
+                str(rng.randint(1, 20)).rjust(13), '1'.rjust(19),
+                str(uuid.UUID(int=rng.getrandbits(128))).upper(), cert_type_ids[cert], '', cert,
+                f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 00:00:' if rng.random() < 0.9 else ''
+            ]))
+            if len(batch) == 10_000:
+                f.writelines(batch)
+                batch = []
+        f.writelines(batch)
+
+
+PARITY_TABLES = {
+    'one column, blank lines': 'Cert\n----\nA\n\nB\n   \nC\n',
+    'dash-only data rows': 'A |B\n--+--\n1 |2\n-|--\n3 |4\n - | -\n5|\n',
+    'rows affected footer': 'Cert\n----\nA\nB\n\n(2 rows affected)\n',
+    'ragged and empty first': 'A|B|C\n-+-+-\n1|2|3\n|x|y\n4|5\n6|7|8|9\n(x)|é|ü\n',
+    'unnamed column': 'A||C\n-+-+-\n1|2|3\n4|5|6\n',
+}
+
+
+def check_parsing_paths(tmp: Path) -> bool:
+    """Batched rows == line-parser rows for every chunk size and option."""
+    ok = True
+    default_chunk = pipe_table.CHUNK_SIZE
+    for label, text in PARITY_TABLES.items():
+        path = tmp / 'parity.txt'
+        path.write_text(text, encoding='utf-8')
+        failures = []
+        for options in ({}, {'empty_as_null': True}, {'complete_rows_only': True}):
+            reference = PipeTable(path, **options)
+            next(reference.batches(), None)   # reads the header
+            body = text.split('\n', 2)[2]
+            expected = list(reference._parse_lines(body))
+            for size in range(1, len(text) + 1):
+                table = PipeTable(path, **options)
+                pipe_table.CHUNK_SIZE = size   # read when batches() runs, not at construction
+                if list(table) != expected:
+                    failures.append((size, tuple(options)))
+        ok = ok and not failures
+        print(f"   {label:<26} {'✓' if not failures else f'❌ chunk sizes {failures[:4]}'}")
+    pipe_table.CHUNK_SIZE = default_chunk
+    return ok
+
+
+def old_convert(input_file: Path, output_dir: Path) -> int:
+    """What convert_certifications_table_to_json.py did before pipe_table.py"""
+    with open(input_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    headers = [h.strip() for h in lines[0].split('|')]
+    rows = []
+    for line in lines[2:]:
+        line = line.strip()
+        if not line:
+            continue
+        values = [v.strip() for v in line.split('|')]
+        row = {}
+        for i, header in enumerate(headers):
+            if header and i < len(values):
+                row[header] = values[i]
+        if row:
+            rows.append(row)
+    for name in ('old.json.txt', 'old.json'):
+        with open(output_dir / name, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    return len(rows)
+
+
+def child(mode: str, input_file: Path, output_dir: Path):
+    start = time.perf_counter()
+    if mode == 'old':
+        rows = old_convert(input_file, output_dir)
+    else:
+        suffix = {'json': '.json', 'ndjson': '.ndjson', 'snapshot': '.snap'}[mode]
+        rows = convert(input_file, output_dir / f'new{suffix}', mode, progress=False)['rows']
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'rows': rows, 'seconds': elapsed, 'peak_mb': peak_mb}))
+
+
+def run(mode: str, input_file: Path, output_dir: Path) -> dict:
+    result = subprocess.run([sys.executable, __file__, '--child', mode, str(input_file), str(output_dir)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--baseline-rows', type=int, default=500_000)
+    parser.add_argument('--formats', default='ndjson,json,snapshot')
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], Path(args.child[1]), Path(args.child[2]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print("🧪 Fast path vs line parser:")
+        if not check_parsing_paths(tmp):
+            sys.exit(1)
+
+        print(f"\n🧪 Writing synthetic exports ({args.rows:,} and {args.baseline_rows:,} rows)...")
+        big, small = tmp / 'big.txt', tmp / 'small.txt'
+        write_export(big, args.rows)
+        write_export(small, args.baseline_rows)
+        print(f"   ✓ {big.stat().st_size / 1e9:.2f} GB / {small.stat().st_size / 1e6:.0f} MB")
+
+        print(f"\n   {'converter':<22}{'rows':>12}{'seconds':>10}{'rows/sec':>12}{'peak RSS MB':>14}")
+        results = {}
+        for label, mode, source in [('old (baseline rows)', 'old', small)] + \
+                [(f'pipe_table {fmt}', fmt, big) for fmt in args.formats.split(',')]:
+            result = results[mode] = run(mode, source, tmp)
+            print(f"   {label:<22}{result['rows']:>12,}{result['seconds']:>10.1f}"
+                  f"{result['rows'] / result['seconds']:>12,.0f}{result['peak_mb']:>14,.0f}", flush=True)
+            for output in tmp.glob('new*'):
+                output.unlink()
+
+        old_rate = results['old']['rows'] / results['old']['seconds']
+        for mode, result in results.items():
+            if mode != 'old':
+                print(f"\n   {mode}: {result['rows'] / result['seconds'] / old_rate:.1f}x the old rows/sec", end='')
+        print()
+
+
+if __name__ == '__main__':
+    main()
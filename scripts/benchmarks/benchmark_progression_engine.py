@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized progression engine vs the per-operator journey loop
+
+Builds synthetic pay_StatusTracker events (random operators, statuses from
+data/pay_StatusTypes.json, dates in the tracker's format), then times
+journeys + bottlenecks + division comparison with progression_engine and
+with analyze_operator_journey() / identify_bottlenecks() /
+analyze_division_differences(). The loop is slow, so it runs on
+--baseline-rows rows only; both are checked to give the same bottlenecks.
+The loop's p50/p90/p99 come from KLL sketches, so those are checked to sit
+within the sketch's rank error of the engine's exact dwell days instead.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_progression_engine.py [--rows 5000000] [--baseline-rows 200000]
+"""
+
+import argparse
+import json
+import random
+from bisect import bisect_left, bisect_right
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import analyze_status_progression
+from analyze_status_progression import analyze_division_differences, analyze_operator_journey, identify_bottlenecks
+from progression_engine import ProgressionEngine, StatusEvents
+from quantile_sketch import DEFAULT_K, PERCENTILES
+
+DATA_DIR = Path(__file__).parent.parent.parent / 'data'
+PERCENTILE_KEYS = ('p50_days', 'p90_days', 'p99_days')
+RANK_TOLERANCE = 2 / DEFAULT_K  # KLL rank error is about 1.7/k
+DIVISIONS = ['2 - IL', '3 - TX', '5 - CA', '6 - FL', '7 - MI', '8 - OH', '10 - OR', '11 - GA', '12 - PA']
+EVENTS_PER_OPERATOR = 8
+
+
+def synthetic_events(rows, status_ids, seed=7):
+    """Tracker rows, about EVENTS_PER_OPERATOR per operator, in random order"""
+    rng = random.Random(seed)
+    operators = [f'{i:08X}-0000-4000-8000-{rng.getrandbits(48):012X}' for i in range(rows // EVENTS_PER_OPERATOR + 1)]
+    base = datetime(2023, 1, 1)
+    events = []
+    for _ in range(rows):
+        date = base + timedelta(seconds=rng.randrange(3 * 365 * 86400), milliseconds=rng.randrange(1000))
+        events.append({
+            'OperatorID': rng.choice(operators),
+            'StatusID': rng.choice(status_ids),
+            'Date': date.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'DivisionID': rng.choice(DIVISIONS),
+            'RecordBy': 'benchmark@oriontcms.com',
+        })
+    return events
+
+
+def run_engine(events, status_types, now):
+    engine = ProgressionEngine(StatusEvents.from_records(events), status_types, now)
+    bottlenecks = engine.bottlenecks()
+    engine.division_comparison()
+    engine.journeys()
+    return engine, bottlenecks
+
+
+def run_loop(events, status_types):
+    operator_events = defaultdict(list)
+    for event in events:
+        operator_events[event['OperatorID']].append(event)
+    journeys = [analyze_operator_journey(op, evs, status_types) for op, evs in operator_events.items()]
+    bottlenecks = identify_bottlenecks(journeys, status_types)
+    analyze_division_differences(journeys)
+    return bottlenecks
+
+
+def compare_bottlenecks(engine, exact, sketched):
+    """(non-percentile fields equal, worst rank error of the sketched percentiles)"""
+    strip = lambda rows: [{k: v for k, v in row.items() if k not in PERCENTILE_KEYS} for row in rows]
+    same = strip(exact) == strip(sketched)
+    days_by_name = defaultdict(list)
+    for name, days in zip(engine.name.tolist(), engine.days.tolist()):
+        days_by_name[engine.names[name]].append(days)
+    worst = 0.0
+    for row in sketched:
+        days = sorted(days_by_name[row['status']])
+        for fraction, key in zip(PERCENTILES, PERCENTILE_KEYS):
+            # Distance from the requested rank to the ranks the sketch's answer occupies
+            low, high = bisect_left(days, row[key]), bisect_right(days, row[key])
+            target = fraction * len(days)
+            worst = max(worst, max(low - target, target - high, 0) / len(days))
+    return same, worst
+
+
+def timed(label, rows, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {rows:>10,} rows  {elapsed:8.2f}s  {rows / elapsed:>12,.0f} rows/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized progression engine')
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--baseline-rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    with open(DATA_DIR / 'pay_StatusTypes.json', 'r', encoding='utf-8') as f:
+        status_types = json.load(f)
+    status_ids = [st['Id'] for st in status_types]
+
+    print(f"📊 Generating {args.rows:,} synthetic tracker events...")
+    events = synthetic_events(args.rows, status_ids)
+    baseline = events[:args.baseline_rows]
+
+    print("\n⏱  journeys + bottlenecks + division comparison")
+    timed('per-operator loop', len(baseline), run_loop, baseline, status_types)
+    timed('engine (same rows)', len(baseline), run_engine, baseline, status_types, None)
+
+    print(f"\n⏱  engine phases, {len(events):,} rows")
+    loaded = timed('load (StatusEvents)', len(events), StatusEvents.from_records, events)
+    engine = timed('sort + dwell times', len(events), ProgressionEngine, loaded, status_types)
+    timed('bottlenecks', len(events), engine.bottlenecks)
+    timed('division comparison', len(events), engine.division_comparison)
+    timed('journeys (dicts)', len(events), engine.journeys)
+
+    # Last stages run to "now": pin the loop's clock to the engine's so the day counts agree
+    now = datetime.now()
+
+    class PinnedNow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    analyze_status_progression.datetime = PinnedNow
+    baseline_engine, exact = run_engine(baseline, status_types, now)
+    same, worst = compare_bottlenecks(baseline_engine, exact, run_loop(baseline, status_types))
+    print(f"\n{'✓' if same else '✗'} Engine and loop bottlenecks {'match' if same else 'DIFFER'}"
+          f" (sketched percentiles: worst rank error {worst:.2%}"
+          f" {'✓' if worst <= RANK_TOLERANCE else '✗'} within {RANK_TOLERANCE:.0%})")
+
+    no_division = [dict(event, DivisionID=None) for event in baseline[:1000]]
+    empty = ProgressionEngine(StatusEvents.from_records(no_division), status_types, now).division_comparison()
+    print(f"{'✓' if empty == [] else '✗'} Division comparison with no divisions: {empty!r}")
+    if not same or worst > RANK_TOLERANCE or empty != []:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of dict rows vs slotted records
+
+Loads each pay_* table (and a synthetic certification extract shaped like
+the wide SELECT from generate_cert_query.py) both as plain dicts and as
+records.py records, and reports traced allocation size per form.
+tracemalloc slows loading considerably; expect ~2 minutes at the default size.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_record_memory.py [--cert-rows 100000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from json_stream import iter_records
+from records import CertType, Certification, Operator, StatusTrackerEvent, StatusType, load_records
+
+BASE_PATH = Path(__file__).parent.parent.parent
+
+TABLES = [
+    ('pay_Operators', Operator),
+    ('pay_StatusTypes', StatusType),
+    ('pay_CertTypes', CertType),
+    ('pay_StatusTracker', StatusTrackerEvent),
+]
+
+# Column count of the certification SELECT in generate_cert_query.py
+CERT_EXTRA_COLUMNS = 48
+
+
+def synthetic_cert_rows(count: int, operators: int = 2000):
+    """Certification extract rows shaped like the generate_cert_query.py SELECT."""
+    random.seed(7)
+    divisions = ['12 - PA', '7 - MI', '3 - TX', '10 - OR', '11 - GA']
+    statuses = ['REGISTRATION', 'ONBOARDING', 'CREDENTIALING', 'DOT SCREENING', 'IN-SERVICE']
+    certs = [f'Certification Type {i}' for i in range(120)]
+    operator_ids = [f'{i:08X}-0000-4000-8000-{i:012X}' for i in range(operators)]
+    for i in range(count):
+        op = random.randrange(operators)
+        row = {
+            # json.loads produces a fresh string object per value, like a real extract
+            'ID': ''.join(operator_ids[op]),
+            'FirstName': f'First{op}', 'LastName': f'Last{op}', 'Email': f'op{op}@example.com',
+            'DivisionID': ''.join(divisions[op % 5]), 'StatusID': f'STATUS-{op % 5}',
+            'StatusName': ''.join(statuses[op % 5]), 'OrderID': str(op % 5 + 1),
+            'CertificationID': f'{i:08X}-1111-4000-8000-{i:012X}', 'CertTypeID': f'CT-{i % 120}',
+            'Cert': ''.join(random.choice(certs)), 'Date': '2025-12-03 00:00:00.000',
+            'CompletionDate': '2025-11-01 00:00:00.000', 'ApprovedDate': None,
+            'isApproved': random.choice(['1', '0']), 'IsDeleted': '0',
+            'RecordAt': '2025-12-03 15:15:48.813', 'UpdateAt': None,
+        }
+        for c in range(CERT_EXTRA_COLUMNS):
+            row[f'Column{c}'] = None if c % 3 else '0'
+        yield json.loads(json.dumps(row))
+
+
+def measure(build):
+    """Bytes still allocated after build() returns (the result is kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current
+
+
+def report(label, rows, record_class):
+    dict_bytes = measure(lambda: [json.loads(json.dumps(r)) for r in rows])
+    record_bytes = measure(lambda: load_records((json.loads(json.dumps(r)) for r in rows), record_class))
+    saving = 100 * (1 - record_bytes / dict_bytes) if dict_bytes else 0
+    print(f"  {label:<34} {len(rows):>8,} rows  dicts {dict_bytes / 1e6:8.2f} MB"
+          f"  records {record_bytes / 1e6:8.2f} MB  (-{saving:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cert-rows', type=int, default=100000, help='synthetic certification extract rows')
+    args = parser.parse_args()
+
+    print("Retained memory, plain dict rows vs slotted records:\n")
+    for table, record_class in TABLES:
+        source = BASE_PATH / 'data' / f'{table}.json'
+        if source.exists():
+            report(table, list(iter_records(source)), record_class)
+
+    report(f'certification extract ({18 + CERT_EXTRA_COLUMNS} cols)',
+           list(synthetic_cert_rows(args.cert_rows)), Certification)
+
+
+if __name__ == '__main__':
+    main()
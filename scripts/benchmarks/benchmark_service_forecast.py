@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: absorbing Markov chain time-to-service forecast
+
+Builds a ProgressionEngine over synthetic tracker events (same generator as
+benchmark_progression_engine.py), then times fitting ServiceForecaster
+(stays, sparse transition counts, dwell distributions, one solve per
+division) and forecasting the whole roster.
+
+The matrix answers are checked against a Monte Carlo walk of the pooled
+chain: from a few starting statuses, --walks random walks pick each next
+status by the observed transition counts and spend the status's mean dwell
+in it, until they reach IN-SERVICE, an exit status or a dead end.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_service_forecast.py [--rows 1000000] [--walks 20000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_progression_engine import DATA_DIR, synthetic_events
+from progression_engine import ProgressionEngine, StatusEvents
+from service_forecast import EXIT_STATUSES, SERVICE_STATUS, ServiceForecaster
+
+MAX_STEPS = 10_000
+
+
+def monte_carlo(forecaster, start, walks, rng):
+    """(share of walks reaching service, mean days to service of those that did) from `start`"""
+    following = defaultdict(list)
+    for (source, target), n in forecaster.transition_counts_for(None).items():
+        following[source].append((target, n))
+    choices = {source: ([target for target, _ in pairs], list(accumulate(n for _, n in pairs)))
+               for source, pairs in following.items()}
+    mean_dwell = {}
+    for status in forecaster.names:
+        days = forecaster.dwell_distribution(status)
+        mean_dwell[status] = float(days.mean()) if len(days) else 0.0
+
+    reached, total_days = 0, 0.0
+    for _ in range(walks):
+        status, days = start, 0.0
+        for _ in range(MAX_STEPS):
+            if status == SERVICE_STATUS:
+                reached += 1
+                total_days += days
+                break
+            if status in EXIT_STATUSES or status not in choices:
+                break
+            days += mean_dwell[status]
+            targets, cumulative = choices[status]
+            status = targets[bisect_right(cumulative, rng.random() * cumulative[-1])]
+    return reached / walks, (total_days / reached if reached else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the time-to-service forecast')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--walks', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with open(DATA_DIR / 'pay_StatusTypes.json', 'r', encoding='utf-8') as f:
+        status_types = json.load(f)
+    status_ids = list({status_type['Id']: None for status_type in status_types})
+
+    print(f"📊 Generating {args.rows:,} synthetic tracker events...")
+    events = synthetic_events(args.rows, status_ids)
+    start = time.perf_counter()
+    engine = ProgressionEngine(StatusEvents.from_records(events), status_types, datetime(2026, 1, 1))
+    print(f"  engine built in {time.perf_counter() - start:.2f}s\n")
+
+    start = time.perf_counter()
+    forecaster = ServiceForecaster(engine)
+    fitted = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = forecaster.forecast()
+    forecast_seconds = time.perf_counter() - start
+    print(f"  fit       {fitted:8.3f}s  ({len(forecaster.transition_keys):,} non-zero transition counts, "
+          f"{len(forecaster.divisions)} chains)")
+    print(f"  forecast  {forecast_seconds:8.3f}s  ({len(rows):,} active operators)")
+    print(f"  total     {fitted + forecast_seconds:8.3f}s {'✓ under' if fitted + forecast_seconds < 1 else '✗ over'} 1s")
+
+    print(f"\n{'Start status':<40} {'P chain':>8} {'P walk':>8} {'Days chain':>11} {'Days walk':>10}")
+    rng = random.Random(11)
+    pooled = forecaster.pooled
+    worst_p, worst_days = 0.0, 0.0
+    starts = [code for code in range(forecaster.size) if forecaster.probability[pooled, code] > 0]
+    for code in rng.sample(starts, min(5, len(starts))):
+        status = forecaster.names[code]
+        p_chain = float(forecaster.probability[pooled, code])
+        dwell = forecaster.dwell_distribution(status)
+        days_chain = float(dwell.mean() if len(dwell) else 0) + float(forecaster.days_after[pooled, code])
+        p_walk, days_walk = monte_carlo(forecaster, status, args.walks, rng)
+        worst_p = max(worst_p, abs(p_chain - p_walk))
+        worst_days = max(worst_days, abs(days_chain - days_walk) / days_chain)
+        print(f"{status[:40]:<40} {p_chain:>8.3f} {p_walk:>8.3f} {days_chain:>11.1f} {days_walk:>10.1f}")
+    ok = worst_p < 0.02 and worst_days < 0.05
+    print(f"\n{'✓' if ok else '✗'} Chain vs walk: worst probability gap {worst_p:.3f}, "
+          f"worst expected-days gap {worst_days:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading pay_* tables from the snapshot vs json.load
+
+Times the table loads of each snapshot caller three ways:
+
+    json.load   - parse the data/ JSON (what the scripts did before)
+    dict rows   - Table.to_records(), one dict per row from the snapshot
+    by column   - what the callers use now: records built column by column
+                  (load_table_records) or rows projected to the needed
+                  fields (load_table(fields=...))
+
+and checks that the by-column results equal the JSON-derived ones.
+Builds a snapshot of data/ into a temp file first.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_snapshot.py [--repeat 20]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from division_bundles import CERT_TYPE_FIELDS, STATUS_TYPE_FIELDS
+from records import CertType, Operator, StatusTrackerEvent, StatusType, load_records
+from snapshot import DATA_DIR, Snapshot, build_snapshot, load_table, load_table_records
+
+GAP_REPORT_TABLES = [('pay_Operators', Operator), ('pay_StatusTypes', StatusType),
+                     ('pay_StatusTracker', StatusTrackerEvent)]
+GENERATOR_TABLES = [('pay_CertTypes', CertType), ('pay_StatusTypes', StatusType)]
+BUNDLE_TABLES = [('pay_CertTypes', CERT_TYPE_FIELDS), ('pay_StatusTypes', STATUS_TYPE_FIELDS)]
+
+
+def json_rows(name):
+    with open(DATA_DIR / f'{name}.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    # pay_StatusTracker.json wraps its rows: {"statusTracker": [...]}
+    return next(v for v in data.values() if isinstance(v, list)) if isinstance(data, dict) else data
+
+
+def timed(load, repeat):
+    load()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = load()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark snapshot loads against json.load')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = Path(tmp) / 'pay_tables.snap'
+        build_snapshot(DATA_DIR, snap)
+
+        def dict_rows(names):
+            with Snapshot.open(snap) as snapshot:
+                return [snapshot.table(name).to_records() for name in names]
+
+        callers = {
+            'gap report / query_index': (
+                lambda: [load_records(json_rows(name), cls) for name, cls in GAP_REPORT_TABLES],
+                lambda: dict_rows([name for name, _ in GAP_REPORT_TABLES]),
+                lambda: [load_table_records(name, cls, DATA_DIR, snap) for name, cls in GAP_REPORT_TABLES]),
+            'pizza generator': (
+                lambda: [load_records(json_rows(name), cls) for name, cls in GENERATOR_TABLES],
+                lambda: dict_rows([name for name, _ in GENERATOR_TABLES]),
+                lambda: [load_table_records(name, cls, DATA_DIR, snap) for name, cls in GENERATOR_TABLES]),
+            'division bundles': (
+                lambda: [[{f: row[f] for f in fields if f in row} for row in json_rows(name)]
+                         for name, fields in BUNDLE_TABLES],
+                lambda: dict_rows([name for name, _ in BUNDLE_TABLES]),
+                lambda: [load_table(name, DATA_DIR, snap, fields=fields) for name, fields in BUNDLE_TABLES]),
+        }
+
+        ok = True
+        print(f"{'Caller':<26} {'json.load':>10} {'dict rows':>10} {'by column':>10}")
+        for label, (from_json, from_dicts, by_column) in callers.items():
+            expected, json_ms = timed(from_json, args.repeat)
+            _, dicts_ms = timed(from_dicts, args.repeat)
+            got, column_ms = timed(by_column, args.repeat)
+            same = got == expected
+            ok = ok and same
+            print(f"{label:<26} {json_ms:8.2f}ms {dicts_ms:8.2f}ms {column_ms:8.2f}ms  "
+                  f"{'✓ same rows' if same else '❌ rows differ'}  ({json_ms / column_ms:.1f}x vs json.load)")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
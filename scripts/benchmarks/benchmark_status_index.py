@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: point-in-time status index vs re-sorting StatusTracker events
+
+Builds a StatusIndex over synthetic tracker events (same generator as
+benchmark_progression_engine.py), then times:
+
+    status_at            one operator at a random moment (bisect)
+    headcount_at         (division, status) headcount at a random moment (checkpoint + day's events)
+    headcount_by_bisect  the same from one bisect per operator
+    re-sort              the same by grouping and sorting every event per question (the old way)
+    daily_headcount      the 2025 time series (365 checkpoints)
+
+and checks the three headcount answers agree.
+
+Usage:
+    python3 scripts/benchmarks/benchmark_status_index.py [--rows 1000000] [--queries 1000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_progression_engine import DATA_DIR, synthetic_events
+from date_parser import parse_date
+from status_index import StatusIndex
+
+
+def resorted_headcount(events, status_names, when):
+    """Group every event by operator, sort by date and take the latest at or before `when`"""
+    by_operator = defaultdict(list)
+    for event in events:
+        by_operator[event['OperatorID']].append(event)
+    counts = Counter()
+    for operator_events in by_operator.values():
+        operator_events.sort(key=lambda e: parse_date(e['Date']))
+        latest = None
+        for event in operator_events:
+            if parse_date(event['Date']) > when:
+                break
+            latest = event
+        if latest is not None:
+            counts[(latest['DivisionID'], status_names.get(latest['StatusID'], latest['StatusID']))] += 1
+    return dict(counts)
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {count:>6} x  {elapsed / count * 1000:10.3f} ms each")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the point-in-time status index')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(DATA_DIR / 'pay_StatusTypes.json', 'r', encoding='utf-8') as f:
+        status_types = json.load(f)
+    status_names = {}
+    for status_type in status_types:
+        status_names.setdefault(status_type['Id'], status_type['Status'])
+
+    print(f"📊 Generating {args.rows:,} synthetic tracker events...")
+    events = synthetic_events(args.rows, list(status_names))
+
+    start = time.perf_counter()
+    index = StatusIndex.from_events(events, status_types)
+    print(f"📇 Built index: {len(index.operator_times):,} operators, {len(index.checkpoints):,} daily "
+          f"checkpoints in {time.perf_counter() - start:.2f}s\n")
+
+    rng = random.Random(3)
+    base = datetime(2023, 1, 1)
+    moments = [(base + timedelta(seconds=rng.randrange(3 * 365 * 86400))).isoformat(' ')
+               for _ in range(args.queries)]
+    operators = rng.choices(list(index.operator_times), k=args.queries)
+
+    timed('status_at', args.queries, lambda: [index.status_at(op, t) for op, t in zip(operators, moments)])
+    checkpointed = timed('headcount_at', args.queries, lambda: [index.headcount_at(t) for t in moments])
+    few = moments[:10]
+    bisected = timed('headcount_by_bisect', len(few), lambda: [index.headcount_by_bisect(t) for t in few])
+    resorted = timed('re-sort', 1, lambda: [resorted_headcount(events, status_names, parse_date(few[0]))])
+    timed('daily_headcount 2025', 1, lambda: index.daily_headcount('2025-01-01', '2025-12-31', status='IN-SERVICE'))
+
+    same = checkpointed[:len(few)] == bisected and resorted[0] == bisected[0]
+    print(f"\n{'✓' if same else '✗'} Checkpoint, bisect and re-sort headcounts {'match' if same else 'DIFFER'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Load test: simulated requirements editors against tools/custom_server.py
+
+Each simulated editor keeps one keep-alive connection and repeatedly does
+what the workflow builder does on page load (the HTML, pay_Operators.json,
+pay_CertTypes.json, pay_PizzaStatusRequirements.json, pay_StatusTypes.json,
+the alias file), runs a couple of /api/ queries, and every --save-every
+page loads posts its copy of the requirements back to /save-requirements
+with the version it loaded as If-Match (or, with --patch, sends a one-field
+JSON Patch to /patch-requirements instead). Like a browser, editors accept
+gzip and revalidate files they already have with If-None-Match (304);
+--no-http-cache makes every page load fetch everything uncompressed, as the
+builder did with its cache-busting query string. --subscribers N also holds
+N idle /events streams open (open builder tabs) and reports how many of the
+saves' change events each one received.
+
+By default a server is started per --server-workers setting on a temporary
+copy of data/, config/ and tools/, so saves never touch the real data.
+Pass --url to test an already running server instead (saves disabled
+unless --save-every is given).
+
+Usage:
+    python3 scripts/benchmarks/load_test_server.py [--editors 50] [--duration 20] [--server-workers 1,16]
+    python3 scripts/benchmarks/load_test_server.py --patch --subscribers 500 --server-workers 16
+    python3 scripts/benchmarks/load_test_server.py --url http://localhost:8000
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import selectors
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_PATH = Path(__file__).parent.parent.parent
+SERVER_SCRIPT = BASE_PATH / 'tools' / 'custom_server.py'
+
+PAGE_LOAD = [
+    ('html', '/tools/lifecycle-workflow-builder.html'),
+    ('operators', '/tools/pay_Operators.json'),
+    ('cert_types', '/data/pay_CertTypes.json'),
+    ('requirements', '/data/pay_PizzaStatusRequirements.json'),
+    ('status_types', '/data/pay_StatusTypes.json'),
+    ('aliases', '/config/certification_aliases.json'),
+]
+QUERIES = [
+    ('api_roster', '/api/roster?status=DOT%20SCREENING&division=12%20-%20PA'),
+    ('api_divisions', '/api/divisions'),
+]
+
+
+class Editor(threading.Thread):
+    """One simulated browser: page loads, queries and periodic saves until the deadline."""
+
+    def __init__(self, host, port, deadline, save_every, results, lock, patch=False, http_cache=True):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.deadline = deadline
+        self.save_every = save_every
+        self.patch = patch
+        self.http_cache = http_cache
+        self.cache = {}  # path -> (ETag, decoded body)
+        self.results = results
+        self.lock = lock
+
+    def request(self, conn, kind, method, path, body=None, headers=None):
+        start = time.perf_counter()
+        response_headers = {}
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            payload = response.read()
+            status = response.status
+            response_headers = dict(response.getheaders())
+        except (OSError, http.client.HTTPException):
+            conn.close()  # reconnects on the next request
+            payload, status = b'', 'error'
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.results[kind].append((elapsed, len(payload), status))
+        return payload, response_headers, status
+
+    def fetch(self, conn, kind, path):
+        """GET like a browser: gzip, and If-None-Match for a copy we already have"""
+        headers = {}
+        cached = self.cache.get(path)
+        if self.http_cache:
+            headers['Accept-Encoding'] = 'gzip'
+            if cached:
+                headers['If-None-Match'] = cached[0]
+        payload, response_headers, status = self.request(conn, kind, 'GET', path, headers=headers)
+        if status == 304 and cached:
+            return cached[1], {'ETag': cached[0]}
+        if response_headers.get('Content-Encoding') == 'gzip':
+            payload = gzip.decompress(payload)
+        if self.http_cache and response_headers.get('ETag'):
+            self.cache[path] = (response_headers['ETag'], payload)
+        return payload, response_headers
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        loads = 0
+        while time.time() < self.deadline:
+            requirements = version = None
+            for kind, path in PAGE_LOAD:
+                body, headers = self.fetch(conn, kind, path)
+                if kind == 'requirements':
+                    requirements, version = body, headers.get('ETag')
+            for kind, path in QUERIES:
+                self.request(conn, kind, 'GET', path)
+            loads += 1
+            if self.save_every and loads % self.save_every == 0 and requirements:
+                # Saves based on a version someone else already replaced get 409 (counted, not an error)
+                headers = {'Content-Type': 'application/json', 'If-Match': version or '*'}
+                if self.patch:
+                    pizza_id = random.choice(list(json.loads(requirements)))
+                    ops = [{'op': 'add', 'path': f'/{pizza_id}/threshold', 'value': random.choice([0.8, 0.85, 0.9])}]
+                    self.request(conn, 'patch', 'POST', '/patch-requirements', body=json.dumps(ops), headers=headers)
+                else:
+                    self.request(conn, 'save', 'POST', '/save-requirements', body=requirements, headers=headers)
+        conn.close()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0
+
+
+class Subscribers(threading.Thread):
+    """Idle /events streams (open builder tabs), read on one thread, counting change events."""
+
+    def __init__(self, host, port, count):
+        super().__init__(daemon=True)
+        self.selector = selectors.DefaultSelector()
+        self.received = {}
+        self.stopping = threading.Event()
+        for _ in range(count):
+            sock = socket.create_connection((host, port), timeout=10)
+            sock.sendall(f'GET /events HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n'.encode())
+            sock.setblocking(False)
+            self.received[sock] = 0
+            self.selector.register(sock, selectors.EVENT_READ, [b''])
+
+    def run(self):
+        while not self.stopping.is_set():
+            for key, _ in self.selector.select(0.2):
+                try:
+                    data = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    self.selector.unregister(key.fileobj)
+                    continue
+                # Count complete "event: requirements" messages (one may span reads)
+                key.data[0] += data
+                *messages, key.data[0] = key.data[0].split(b'\n\n')
+                self.received[key.fileobj] += sum(b'event: requirements' in m for m in messages)
+
+    def close(self):
+        self.stopping.set()
+        self.join()
+        for sock in self.received:
+            sock.close()
+
+
+def server_threads(pid):
+    try:
+        return len(os.listdir(f'/proc/{pid}/task'))
+    except OSError:
+        return None
+
+
+def run_load(host, port, editors, duration, save_every, patch=False, http_cache=True, subscribers=0, pid=None):
+    results = defaultdict(list)
+    lock = threading.Lock()
+    listeners = None
+    if subscribers:
+        listeners = Subscribers(host, port, subscribers)
+        listeners.start()
+        time.sleep(0.5)
+        threads_now = server_threads(pid) if pid else None
+        print(f"  {subscribers} /events subscribers connected"
+              + (f", server running {threads_now} threads" if threads_now else ''))
+    deadline = time.time() + duration
+    threads = [Editor(host, port, deadline, save_every, results, lock, patch, http_cache) for _ in range(editors)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(samples) for samples in results.values())
+    total_bytes = sum(size for samples in results.values() for _, size, _ in samples)
+    errors = sum(1 for samples in results.values() for _, _, status in samples if status not in (200, 304, 409))
+    conflicts = sum(1 for kind in ('save', 'patch') for _, _, status in results.get(kind, []) if status == 409)
+    not_modified = sum(1 for samples in results.values() for _, _, status in samples if status == 304)
+    loads = len(results.get('html', [])) or 1
+    print(f"  {total:,} requests in {elapsed:.1f}s = {total / elapsed:,.0f} req/s, "
+          f"{total_bytes / elapsed / 1e6:,.1f} MB/s, {errors} errors, {conflicts} save conflicts (409)")
+    print(f"  {total_bytes / loads / 1e3:,.1f} KB transferred per page load, {not_modified:,} not modified (304)")
+    print(f"  {'request':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, samples in sorted(results.items()):
+        latencies = [s[0] * 1000 for s in samples]
+        print(f"  {kind:<14}{len(samples):>8,}{percentile(latencies, 50):>10.1f}{percentile(latencies, 99):>10.1f}")
+
+    if listeners:
+        time.sleep(1)  # let the last events arrive
+        listeners.close()
+        saves = sum(1 for kind in ('save', 'patch') for _, _, status in results.get(kind, []) if status == 200)
+        counts = list(listeners.received.values())
+        print(f"  {saves} saves -> change events per subscriber: min {min(counts)}, max {max(counts)}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(root, workers):
+    """Run custom_server.py on a copy of the project and wait until it answers."""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER_SCRIPT), '--root', str(root), '--port', str(port), '--workers', str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/status')
+            conn.getresponse().read()
+            conn.close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('server did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--editors', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=20, help='seconds per run')
+    parser.add_argument('--save-every', type=int, default=None,
+                        help='page loads between saves per editor (default: 5, or 0 with --url)')
+    parser.add_argument('--server-workers', default='1,16',
+                        help='comma-separated worker counts to start servers with')
+    parser.add_argument('--patch', action='store_true',
+                        help='save with one-field JSON Patches instead of the whole file')
+    parser.add_argument('--no-http-cache', action='store_true',
+                        help='no If-None-Match or gzip: full downloads on every page load')
+    parser.add_argument('--subscribers', type=int, default=0,
+                        help='idle /events streams to hold open during the run')
+    parser.add_argument('--url', help='test a running server instead of starting one')
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        save_every = args.save_every or 0
+        print(f"🔥 {args.editors} editors for {args.duration:.0f}s against {args.url}")
+        run_load(url.hostname, url.port or 80, args.editors, args.duration, save_every, args.patch,
+                 not args.no_http_cache, args.subscribers)
+        return
+
+    save_every = 5 if args.save_every is None else args.save_every
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for folder in ('data', 'config', 'tools'):
+            shutil.copytree(BASE_PATH / folder, root / folder, ignore=shutil.ignore_patterns('backups', '__pycache__'))
+
+        for workers in [int(w) for w in args.server_workers.split(',')]:
+            process, port = start_server(root, workers)
+            print(f"\n🔥 {args.editors} editors for {args.duration:.0f}s, server with {workers} workers "
+                  f"(save every {save_every} page loads)")
+            try:
+                run_load('127.0.0.1', port, args.editors, args.duration, save_every, args.patch,
+                         not args.no_http_cache, args.subscribers, process.pid)
+            finally:
+                process.terminate()
+                process.wait()
+
+        # Every save posted a full copy of the file (or was compacted into it); it must still parse
+        with open(root / 'data' / 'pay_PizzaStatusRequirements.json', 'r', encoding='utf-8') as f:
+            json.load(f)
+        print("\n✓ pay_PizzaStatusRequirements.json intact after concurrent saves")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Certification Name Index (trigram)
+
+Indexes cert names by character trigrams so "which known names look like
+this one?" is answered from an inverted index instead of running
+difflib.SequenceMatcher against every name. Only names sharing at least one
+trigram with the query are scored, and a length filter drops candidates that
+cannot reach the threshold.
+
+Similarity is the Dice coefficient over trigram sets of the normalized name
+(see alias_resolver.normalize_key):  2 * |A & B| / (|A| + |B|)
+
+Usage (library):
+    from cert_name_index import CertNameIndex, CloseMatcher
+
+    index = CertNameIndex(['Background Check', 'BACKGROUND CHECK ', 'Drug Screen'])
+    index.top_k('Backgroud Check', k=3, threshold=0.6)
+    # [('Background Check', 0.8), ...]
+    CloseMatcher(['Background Check', 'Drug Screen']).close_matches('Backgroud Check', cutoff=0.85)
+    # every name with SequenceMatcher ratio >= 0.85 (same as scoring them all)
+
+Usage (CLI):
+    # Top matches for one name
+    python3 scripts/cert_name_index.py query "Backgroud Check" -k 5
+
+    # Alias suggestions from pay_CertTypes.json + certification extracts,
+    # written in certification_aliases.json format
+    python3 scripts/cert_name_index.py suggest --threshold 0.8
+"""
+
+import argparse
+import json
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from alias_resolver import AliasResolver, normalize_key
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_SOURCES = [
+    BASE_PATH / 'data' / 'pay_CertTypes.json',
+    BASE_PATH / 'data' / 'pay_Certifications.json',
+    BASE_PATH / 'external' / 'Certificates_raw_text_table.txt',
+]
+DEFAULT_OUTPUT = BASE_PATH / 'generated' / 'certification_alias_suggestions.json'
+
+
+def trigrams(cert_name: str) -> frozenset:
+    """Character trigrams of the normalized name, padded so short names still index."""
+    key = normalize_key(cert_name)
+    if not key:
+        return frozenset()
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Dice coefficient of two names' trigram sets (0.0 - 1.0)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class CertNameIndex:
+    """Inverted trigram index over distinct cert names."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._grams: List[frozenset] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> int:
+        """Index a name (idempotent); returns its id."""
+        if name in self._ids:
+            return self._ids[name]
+        grams = trigrams(name)
+        name_id = len(self.names)
+        self.names.append(name)
+        self._grams.append(grams)
+        self._ids[name] = name_id
+        for gram in grams:
+            self._postings[gram].append(name_id)
+        return name_id
+
+    def top_k(self, name: str, k: int = 5, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        """Up to k indexed names with similarity >= threshold, best first."""
+        query = trigrams(name)
+        if not query:
+            return []
+
+        shared = Counter()
+        for gram in query:
+            for name_id in self._postings.get(gram, ()):
+                shared[name_id] += 1
+
+        # Dice >= t needs |B| between |A| * t / (2 - t) and |A| * (2 - t) / t
+        size = len(query)
+        min_size = size * threshold / (2 - threshold) if threshold else 0
+        max_size = size * (2 - threshold) / threshold if threshold else float('inf')
+
+        scored = []
+        for name_id, overlap in shared.items():
+            other = len(self._grams[name_id])
+            if other < min_size or other > max_size:
+                continue
+            score = 2 * overlap / (size + other)
+            if score >= threshold:
+                scored.append((self.names[name_id], round(score, 4)))
+
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:k]
+
+    def best_match(self, name: str, threshold: float = 0.0):
+        """Single best (name, score) above threshold, or (None, 0.0)."""
+        matches = self.top_k(name, k=1, threshold=threshold)
+        return matches[0] if matches else (None, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class CloseMatcher:
+    """
+    SequenceMatcher ratio >= cutoff against a fixed list of names.
+
+    Scores are SequenceMatcher(None, query, name).ratio() on lowercased,
+    trimmed strings. ratio() is not symmetric, so each name stays seq2 and
+    keeps one matcher whose b2j is built once here; a query only sets seq1.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = list(dict.fromkeys(names))
+        self._matchers: List[SequenceMatcher] = []
+        for name in self.names:
+            matcher = SequenceMatcher()
+            matcher.set_seq2(name.lower().strip())
+            self._matchers.append(matcher)
+
+    def close_matches(self, name: str, cutoff: float = 0.85) -> Dict[str, float]:
+        """
+        Every name whose ratio with `name` is >= cutoff, as {name: ratio}.
+
+        Names are skipped only when difflib's length and character-count
+        upper bounds (real_quick_ratio / quick_ratio) fall below the cutoff,
+        so the result equals scoring every name.
+        """
+        query = name.lower().strip()
+        matches = {}
+        for other, matcher in zip(self.names, self._matchers):
+            total = len(query) + len(matcher.b)
+            if total and 2 * min(len(query), len(matcher.b)) < cutoff * total:
+                continue  # real_quick_ratio() < cutoff
+            matcher.set_seq1(query)
+            if matcher.quick_ratio() < cutoff:
+                continue
+            score = matcher.ratio()
+            if score >= cutoff:
+                matches[other] = score
+        return matches
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def suggest_aliases(name_counts: Counter, threshold: float = 0.8, k: int = 10,
+                    resolver: AliasResolver = None) -> Dict[str, List[str]]:
+    """
+    Group similar cert names into alias suggestions.
+
+    Names are linked when either is in the other's top-k above threshold, and
+    linked groups are merged. The canonical name for a group is its existing
+    canonical alias if any member already resolves to one, otherwise the most
+    frequently used spelling. Groups already fully covered by the resolver are
+    skipped.
+
+    Returns:
+        { 'Canonical Name': ['variation', ...] } (certification_aliases.json format)
+    """
+    names = sorted(name for name in name_counts if normalize_key(name))
+    index = CertNameIndex(names)
+
+    parent = list(range(len(names)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for name_id, name in enumerate(names):
+        for match, _score in index.top_k(name, k=k, threshold=threshold):
+            root_a, root_b = find(name_id), find(index._ids[match])
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups = defaultdict(list)
+    for name_id, name in enumerate(names):
+        groups[find(name_id)].append(name)
+
+    suggestions = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+
+        known = {resolver.resolve_canonical(m) for m in members} if resolver else {None}
+        known.discard(None)
+        if resolver and len(known) == 1 and all(resolver.is_known(m) for m in members):
+            continue  # already covered by certification_aliases.json
+
+        if len(known) == 1:
+            canonical = known.pop()
+        else:
+            canonical = max(members, key=lambda m: (name_counts[m], m == m.strip(), m))
+
+        variations = sorted(set(members) | {canonical})
+        suggestions.setdefault(canonical, [])
+        for variation in variations:
+            if variation not in suggestions[canonical]:
+                suggestions[canonical].append(variation)
+
+    return dict(sorted(suggestions.items()))
+
+
+def _read_pipe_table_column(file_path: Path, column: str) -> Iterable[str]:
+    """Yield one column from a pipe-delimited SQL text export."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        header = f.readline()
+        headers = [h.strip() for h in header.split('|')]
+        if column not in headers:
+            return
+        col = headers.index(column)
+        for line in f:
+            if not line.strip() or line.startswith('-'):
+                continue
+            values = line.rstrip('\n').split('|')
+            if col < len(values):
+                yield values[col]
+
+
+def collect_cert_names(sources: Iterable[Path]) -> Counter:
+    """Count cert name spellings across CertTypes and certification extracts."""
+    name_counts = Counter()
+    for source in sources:
+        source = Path(source)
+        if not source.exists():
+            continue
+        if source.suffix == '.txt':
+            for name in _read_pipe_table_column(source, 'Cert'):
+                if name.strip():
+                    name_counts[name.rstrip()] += 1
+            continue
+
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('certifications', data.get('certTypes', []))
+        for row in data:
+            name = row.get('Certification') or row.get('Cert') or row.get('CertType')
+            if name:
+                name_counts[name] += 1
+    return name_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzzy certification name index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    query_parser = subparsers.add_parser('query', help='top-k similar names for one cert name')
+    query_parser.add_argument('name')
+    query_parser.add_argument('-k', type=int, default=5)
+    query_parser.add_argument('--threshold', type=float, default=0.5)
+    query_parser.add_argument('--source', action='append', type=Path, help='name source (default: CertTypes + extracts)')
+
+    suggest_parser = subparsers.add_parser('suggest', help='write alias suggestions in certification_aliases.json format')
+    suggest_parser.add_argument('--threshold', type=float, default=0.8)
+    suggest_parser.add_argument('-k', type=int, default=10)
+    suggest_parser.add_argument('--source', action='append', type=Path, help='name source (default: CertTypes + extracts)')
+    suggest_parser.add_argument('--aliases', type=Path, default=BASE_PATH / 'config' / 'certification_aliases.json')
+    suggest_parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+
+    args = parser.parse_args()
+    sources = args.source or DEFAULT_SOURCES
+
+    print("📂 Collecting certification names...")
+    name_counts = collect_cert_names(sources)
+    print(f"   ✓ {len(name_counts)} distinct spellings from {sum(name_counts.values())} rows")
+
+    if args.command == 'query':
+        index = CertNameIndex(name_counts)
+        print(f"\n🔍 Top {args.k} matches for '{args.name}' (threshold {args.threshold}):")
+        for name, score in index.top_k(args.name, k=args.k, threshold=args.threshold):
+            print(f"   {score:.3f}  '{name}'  ({name_counts[name]} rows)")
+        return
+
+    resolver = AliasResolver.from_file(args.aliases) if args.aliases.exists() else None
+    suggestions = suggest_aliases(name_counts, threshold=args.threshold, k=args.k, resolver=resolver)
+
+    output = {'_description': f"Suggested aliases (trigram similarity >= {args.threshold}). Review before merging into config/certification_aliases.json."}
+    output.update(suggestions)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+
+    print(f"\n✓ {len(suggestions)} alias groups suggested")
+    for canonical, variations in list(suggestions.items())[:10]:
+        print(f"   {canonical}: {variations}")
+    print(f"\n💾 Saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
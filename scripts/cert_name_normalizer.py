@@ -12,21 +12,15 @@ Usage:
         print("Match!")
 """
 
-import re
 from typing import Dict, List, Set
 
-# Canonical mappings for known variations
+from alias_resolver import load_resolver, normalize_key
+
+# Canonical mappings for known variations, compiled from config/certification_aliases.json
+# (the same resolver the gap report and requirements generator use).
 # Format: { 'normalized_key': 'Canonical Name' }
-CANONICAL_CERT_NAMES = {
-    'background check': 'Background Check',
-    'ctaa passenger assistance': 'CTAA Passenger Assistance',
-    'defensive driving': 'Defensive Driving',
-    'dot driver questionnaire': 'DOT Driver Questionnaire ',  # Note: trailing space is canonical
-    'dot pre-contracting drug/alc screen': 'DOT Pre-Contracting Drug/Alc Screen ',  # Note: trailing space is canonical
-    "driver's license_backside": "Driver's License_BACKSIDE",
-    'service agreement': 'Service Agreement',
-    'social security card': 'Social Security Card',
-}
+# Note: some canonical names keep a trailing space (e.g. 'DOT Driver Questionnaire ')
+CANONICAL_CERT_NAMES = load_resolver().canonical_map()
 
 def normalize_cert_name(cert_name: str) -> str:
     """
@@ -54,11 +48,7 @@ def normalize_cert_name(cert_name: str) -> str:
     if not cert_name:
         return ''
     
-    # Basic normalization
-    normalized = cert_name.lower().strip()
-    normalized = re.sub(r'\s+', ' ', normalized)  # Replace multiple spaces with single space
-    
-    return normalized
+    return normalize_key(cert_name)
 
 def get_canonical_name(cert_name: str) -> str:
     """
@@ -80,12 +70,22 @@ def get_canonical_name(cert_name: str) -> str:
         >>> get_canonical_name('SOCIAL SECURITY CARD')
         'Social Security Card'
     """
-    normalized = normalize_cert_name(cert_name)
-    return CANONICAL_CERT_NAMES.get(normalized, cert_name)
+    return load_resolver().resolve_canonical(cert_name) or cert_name
+
+def get_match_key(cert_name: str) -> str:
+    """
+    Comparison key for a certification: the normalized form of its canonical name.
+    
+    Examples:
+        >>> get_match_key('BGC')
+        'background check'
+    """
+    return normalize_cert_name(get_canonical_name(cert_name))
 
 def certs_match(cert1: str, cert2: str) -> bool:
     """
-    Check if two certification names match (ignoring case and spacing variations).
+    Check if two certification names match (ignoring case, spacing variations
+    and known aliases from certification_aliases.json).
     
     Args:
         cert1: First certification name
@@ -101,14 +101,18 @@ def certs_match(cert1: str, cert2: str) -> bool:
         >>> certs_match('Defensive Driving', 'Defensive Driving ')
         True
         
+        >>> certs_match('BGC', 'Background Check')
+        True
+        
         >>> certs_match('Background Check', 'CTAA Passenger Assistance')
         False
     """
-    return normalize_cert_name(cert1) == normalize_cert_name(cert2)
+    return get_match_key(cert1) == get_match_key(cert2)
 
 def find_matching_cert(cert_name: str, cert_list: List[str]) -> str:
     """
-    Find a matching certification from a list (case-insensitive, space-insensitive).
+    Find a matching certification from a list (case-insensitive, space-insensitive,
+    alias-aware).
     
     Args:
         cert_name: Certification name to find
@@ -122,10 +126,10 @@ def find_matching_cert(cert_name: str, cert_list: List[str]) -> str:
         >>> find_matching_cert('ctaa passenger assistance', certs)
         'CTAA Passenger Assistance'
     """
-    normalized_target = normalize_cert_name(cert_name)
+    normalized_target = get_match_key(cert_name)
     
     for cert in cert_list:
-        if normalize_cert_name(cert) == normalized_target:
+        if get_match_key(cert) == normalized_target:
             return cert
     
     return None
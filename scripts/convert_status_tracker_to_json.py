@@ -1,68 +1,39 @@
 #!/usr/bin/env python3
 """
 Convert pay_StatusTracker.txt to JSON format.
+
+Streams the pipe-delimited export row by row (see pipe_table.py). Empty
+values become null and rows whose column count differs from the header are
+skipped. Pass an output path ending in .ndjson or .snap for NDJSON or a
+columnar snapshot instead of {"statusTracker": [...]}.
 """
 
 import json
+import sys
 from pathlib import Path
 
-def convert_status_tracker_to_json():
+from pipe_table import convert, print_stats
+
+def convert_status_tracker_to_json(input_file=None, output_file=None):
     """Convert StatusTracker data to JSON format."""
     
-    input_file = Path(__file__).parent.parent / 'data' / 'pay_StatusTracker.txt'
-    output_file = Path(__file__).parent.parent / 'data' / 'pay_StatusTracker.json'
+    input_file = Path(input_file or Path(__file__).parent.parent / 'data' / 'pay_StatusTracker.txt')
+    output_file = Path(output_file or Path(__file__).parent.parent / 'data' / 'pay_StatusTracker.json')
     
     print(f"Reading from: {input_file}")
     
-    # Read the file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    if not lines:
-        print("Error: File is empty")
-        return
-    
-    # Parse pipe-delimited data
-    # First line is header
-    header_line = lines[0].strip()
-    headers = [h.strip() for h in header_line.split('|')]
-    
-    print(f"✓ Found columns: {headers}")
-    
-    # Skip separator line (line with dashes)
-    data_lines = [line for line in lines[2:] if line.strip() and not line.strip().startswith('-')]
-    
-    records = []
-    for line in data_lines:
-        values = [v.strip() for v in line.split('|')]
-        
-        # Create record dict
-        if len(values) == len(headers):
-            record = {}
-            for i, header in enumerate(headers):
-                # Convert empty strings to None/null
-                value = values[i] if values[i] else None
-                record[header] = value
-            records.append(record)
-    
-    print(f"✓ Parsed {len(records)} status tracker records")
-    
-    # Wrap in standard format
-    output_data = {
-        'statusTracker': records
-    }
-    
-    # Save as formatted JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # Wrapped in the standard {"statusTracker": [...]} format
+    stats = convert(input_file, output_file, wrap='statusTracker', empty_as_null=True,
+                    complete_rows_only=True, table_name='pay_StatusTracker')
     
-    print(f"✓ Saved to: {output_file}")
-    print(f"✓ Total records: {len(records)}")
+    print(f"✓ Found columns: {stats['columns']}")
+    print_stats(stats, output_file)
+    print(f"✓ Total records: {stats['rows']}")
     
     # Show sample record
-    if records:
+    if stats['sample']:
         print("\nSample record:")
-        print(json.dumps(records[0], indent=2))
+        print(json.dumps(stats['sample'], indent=2))
 
 if __name__ == '__main__':
-    convert_status_tracker_to_json()
+    convert_status_tracker_to_json(*sys.argv[1:3])
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Per-Division Data Bundles for the Workflow Builder
+
+The builder used to download every CertTypes row (with the long
+Instructions/Description text), every StatusTypes row and every operator,
+then filter by division in the browser. A bundle holds one division's slice,
+cut down to the fields the builder uses:
+
+    operators            tools/pay_Operators.json rows for the division
+    cert_types           pay_CertTypes rows for the division (and division-less rows)
+    status_types         pay_StatusTypes rows for the division
+    pizza_status_requirements   entries mapped to the division's statuses
+    requirements         status -> division -> pizza status and required cert
+                         names (the builder's buildRequirementsFromPizzaStatus join)
+    divisions            every division that has a bundle
+
+Excluded divisions (EXCLUDED_DIVS) get no bundle. Each bundle is serialized
+and gzip-compressed once and cached with a fingerprint of the source rows it
+was built from; when a source file or the requirements document changes,
+only divisions whose rows changed are rebuilt.
+
+Usage:
+    from division_bundles import DivisionBundles
+
+    bundles = DivisionBundles(base_path, requirements=store.document)
+    bundle = bundles.get('12 - PA')   # Bundle(etag, variants, requirements_version) or None
+    bundles.divisions_for({'<PizzaStatusID>'})   # divisions whose bundle holds that entry
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import defaultdict, namedtuple
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent / 'reports'))
+
+from generate_compliance_gap_report import EXCLUDED_DIVS
+from snapshot import load_table
+
+BASE_PATH = Path(__file__).parent.parent
+
+# Fields the workflow builder reads from each table
+OPERATOR_FIELDS = ('ID', 'FirstName', 'LastName', 'DivisionID', 'StatusName', 'certifications')
+CERT_TYPE_FIELDS = ('ID', 'Certification', 'DivisionID', 'PizzaStatusID')
+STATUS_TYPE_FIELDS = ('Id', 'Status', 'DivisionID', 'OrderID', 'PizzaStatusID')
+
+Bundle = namedtuple('Bundle', 'etag variants requirements_version')
+
+
+def gzip_variants(body: bytes) -> Dict[str, bytes]:
+    return {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+
+
+def is_excluded(division: Optional[str]) -> bool:
+    return bool(division) and any(excluded in division for excluded in EXCLUDED_DIVS)
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _group(rows: List[Dict], fields: Tuple[str, ...]) -> Dict[Optional[str], List[Dict]]:
+    """Projected rows by DivisionID (excluded divisions dropped)."""
+    groups = defaultdict(list)
+    for row in rows:
+        division = row.get('DivisionID')
+        if not is_excluded(division):
+            groups[division].append({field: row.get(field) for field in fields if field in row})
+    return groups
+
+
+class _Source:
+    """One input table: projected rows and a digest per division, reloaded when its file changes."""
+
+    def __init__(self, path: Path, load: Callable[[], List[Dict]], fields: Tuple[str, ...]):
+        self.path = path
+        self.load = load
+        self.fields = fields
+        self.key = None
+        self.groups: Dict[Optional[str], List[Dict]] = {}
+        self.digests: Dict[Optional[str], str] = {}
+
+    def refresh(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key == self.key:
+            return False
+        self.groups = _group(self.load(), self.fields) if key else {}
+        self.digests = {division: _digest(rows) for division, rows in self.groups.items()}
+        self.key = key
+        return True
+
+
+class DivisionBundles:
+    """Cached per-division bundles, rebuilt per division when their source rows change."""
+
+    def __init__(self, base_path: Path = BASE_PATH, requirements: Callable[[], Tuple[Dict, str]] = None,
+                 compress: Callable[[bytes], Dict[str, bytes]] = gzip_variants):
+        """
+        requirements: returns (requirements document, version), e.g.
+        RequirementsStore.document; defaults to reading the JSON file.
+        compress: body -> {content-coding: bytes}.
+        """
+        base_path = Path(base_path)
+        data_dir = base_path / 'data'
+        operators_path = base_path / 'tools' / 'pay_Operators.json'
+        self.operators = _Source(operators_path, lambda: self._load_json(operators_path), OPERATOR_FIELDS)
+        self.cert_types = _Source(data_dir / 'pay_CertTypes.json',
+                                  lambda: load_table('pay_CertTypes', data_dir, fields=CERT_TYPE_FIELDS),
+                                  CERT_TYPE_FIELDS)
+        self.status_types = _Source(data_dir / 'pay_StatusTypes.json',
+                                    lambda: load_table('pay_StatusTypes', data_dir, fields=STATUS_TYPE_FIELDS),
+                                    STATUS_TYPE_FIELDS)
+        self.requirements_path = data_dir / 'pay_PizzaStatusRequirements.json'
+        self._requirements_file = (None, {})                 # (stat key, document) without a store
+        self.requirements = requirements or self._file_requirements
+        self.compress = compress
+
+        self.lock = threading.Lock()
+        self._requirements_version = object()
+        self._pizza_digests: Dict[str, Tuple[Dict, str]] = {}   # pizza id -> (entry, digest)
+        self._doc: Dict = {}
+        self._bundles: Dict[str, Tuple[str, Bundle]] = {}   # division -> (fingerprint, bundle)
+        self.rebuilt = 0                                     # bundles rebuilt by the last refresh
+
+    @staticmethod
+    def _load_json(path: Path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _file_requirements(self) -> Tuple[Dict, str]:
+        try:
+            stat = os.stat(self.requirements_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key != self._requirements_file[0]:
+            self._requirements_file = (key, self._load_json(self.requirements_path) if key else {})
+        return self._requirements_file[1], str(key)
+
+    def get(self, division: str) -> Optional[Bundle]:
+        """Current bundle for a division, or None if it has none (unknown or excluded)."""
+        with self.lock:
+            self._refresh()
+            entry = self._bundles.get(division)
+            return entry[1] if entry else None
+
+    def divisions(self) -> List[str]:
+        with self.lock:
+            self._refresh()
+            return sorted(self._bundles)
+
+    def divisions_for(self, pizza_ids) -> List[str]:
+        """
+        Divisions with a bundle whose statuses map to any of pizza_ids.
+
+        Reads the last loaded StatusTypes without taking the lock, so it is
+        safe to call from a RequirementsStore listener (which holds the store
+        lock while get() may be waiting on it).
+        """
+        pizza_ids = set(pizza_ids)
+        return sorted(division for division, rows in self.status_types.groups.items()
+                      if division and any(row.get('PizzaStatusID') in pizza_ids for row in rows))
+
+    def _refresh(self):
+        changed = [source.refresh() for source in (self.operators, self.cert_types, self.status_types)]
+        doc, version = self.requirements()
+        if version != self._requirements_version:
+            # Patched documents share unchanged entries, so only new entry objects are hashed
+            previous = self._pizza_digests
+            self._pizza_digests = {
+                pizza_id: previous[pizza_id] if pizza_id in previous and previous[pizza_id][0] is entry
+                else (entry, _digest(entry))
+                for pizza_id, entry in doc.items()
+            }
+            self._doc, self._requirements_version = doc, version
+            changed.append(True)
+        if not any(changed):
+            return
+
+        divisions = sorted(d for d in set(self.status_types.groups) | set(self.operators.groups) if d)
+        bundles, self.rebuilt = {}, 0
+        for division in divisions:
+            pizza_ids = sorted({st.get('PizzaStatusID') for st in self.status_types.groups.get(division, [])
+                                if st.get('PizzaStatusID') in self._doc})
+            fingerprint = _digest([
+                divisions,
+                self.operators.digests.get(division),
+                self.cert_types.digests.get(division),
+                self.cert_types.digests.get(None),
+                self.status_types.digests.get(division),
+                [self._pizza_digests[pizza_id][1] for pizza_id in pizza_ids]
+            ])
+            cached = self._bundles.get(division)
+            if cached and cached[0] == fingerprint:
+                bundles[division] = (fingerprint, cached[1]._replace(requirements_version=version))
+                continue
+            bundles[division] = (fingerprint, self._build(division, divisions, pizza_ids, version))
+            self.rebuilt += 1
+        self._bundles = bundles
+
+    def _build(self, division: str, divisions: List[str], pizza_ids: List[str], version: str) -> Bundle:
+        status_types = self.status_types.groups.get(division, [])
+        pizza_reqs = {pizza_id: self._doc[pizza_id] for pizza_id in pizza_ids}
+
+        # Same join as buildRequirementsFromPizzaStatus() in the builder, minus operator counts
+        requirements = {}
+        for st in status_types:
+            pizza = pizza_reqs.get(st.get('PizzaStatusID'))
+            if pizza is None:
+                continue
+            status = requirements.setdefault(st['Status'], {'order': st.get('OrderID') or '', 'divisions': {}})
+            status['divisions'][division] = {
+                'order': st.get('OrderID') or '',
+                'pizzaStatusId': st['PizzaStatusID'],
+                'pizzaStatusName': pizza.get('pizza_status_name'),
+                'required': [c.get('name') for c in pizza.get('required_certifications', [])]
+            }
+
+        bundle = {
+            'division': division,
+            'divisions': divisions,
+            'operators': self.operators.groups.get(division, []),
+            'cert_types': self.cert_types.groups.get(division, []) + self.cert_types.groups.get(None, []),
+            'status_types': status_types,
+            'pizza_status_requirements': pizza_reqs,
+            'requirements': requirements
+        }
+        body = json.dumps(bundle, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        return Bundle(etag, self.compress(body), version)
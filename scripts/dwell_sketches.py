@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Daily Dwell-Time Sketches
+
+Persists one KLL sketch (quantile_sketch.py) per (division, status) per day
+for the status stages that ended that day:
+
+    generated/dwell_sketches/2025-12-03.json
+        {"day": "2025-12-03", "sketches": {"<division>": {"<status>": {...sketch...}}}}
+
+Percentiles over any window (last 90 days, a quarter, all of history) are
+merged from the stored days instead of recomputed from every tracker
+event. A stage belongs to the day it ended, so stored days never change
+once the tracker has moved past them and `build --since` only rewrites
+recent days. Operators' current (open) stages are not stored; their dwell
+keeps growing until the next status change. Divisions are the journey's
+division, as in analyze_division_differences().
+
+Usage:
+    python3 scripts/dwell_sketches.py build [--since 2025-12-01]
+    python3 scripts/dwell_sketches.py window --days 90 [--end 2025-12-31] [--division "12 - PA"]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_status_progression import build_journeys, load_json, load_status_tracker
+from quantile_sketch import PERCENTILES, KLLSketch
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+DEFAULT_STORE = BASE_DIR / 'generated' / 'dwell_sketches'
+ALL_DIVISIONS = 'All divisions'
+
+# day -> division -> status -> sketch
+DaySketches = Dict[str, Dict[str, Dict[str, KLLSketch]]]
+
+
+def daily_sketches(journeys: List[Dict], since: Optional[str] = None) -> DaySketches:
+    """Sketch the dwell of every completed stage under the day it ended (from `since` on)"""
+    days: DaySketches = defaultdict(lambda: defaultdict(lambda: defaultdict(KLLSketch)))
+    for journey in journeys:
+        division = journey['division']
+        if not division:
+            continue
+        for stage in journey['stages']:
+            end_date = stage['end_date']
+            if not end_date or end_date == 'Current':
+                continue
+            day = end_date[:10]
+            if since is None or day >= since:
+                days[day][division][stage['status']].update(stage['days_in_status'])
+    return days
+
+
+def write_days(days: DaySketches, store_dir: Path = DEFAULT_STORE, since: Optional[str] = None) -> int:
+    """Write one file per day; days from `since` on that no longer have stages are removed"""
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for path in store_dir.glob('*.json'):
+        if (since is None or path.stem >= since) and path.stem not in days:
+            path.unlink()
+    for day, divisions in days.items():
+        payload = {'day': day, 'sketches': {
+            division: {status: sketch.to_dict() for status, sketch in statuses.items()}
+            for division, statuses in divisions.items()
+        }}
+        tmp_path = store_dir / f'.{day}.json.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, store_dir / f'{day}.json')
+    return len(days)
+
+
+def stored_days(store_dir: Path = DEFAULT_STORE) -> List[str]:
+    return sorted(path.stem for path in Path(store_dir).glob('*.json'))
+
+
+def window_sketches(start: str, end: str, store_dir: Path = DEFAULT_STORE,
+                    division: Optional[str] = None) -> Dict[Tuple[str, str], KLLSketch]:
+    """
+    Merge stored days start..end (inclusive, 'YYYY-MM-DD') into one sketch per
+    (division, status), plus (ALL_DIVISIONS, status) across divisions.
+    """
+    parts: Dict[Tuple[str, str], List[KLLSketch]] = defaultdict(list)
+    for day in stored_days(store_dir):
+        if not start <= day <= end:
+            continue
+        with open(Path(store_dir) / f'{day}.json', 'r', encoding='utf-8') as f:
+            sketches = json.load(f)['sketches']
+        for div, statuses in sketches.items():
+            if division and div != division:
+                continue
+            for status, data in statuses.items():
+                sketch = KLLSketch.from_dict(data)
+                parts[(div, status)].append(sketch)
+                parts[(ALL_DIVISIONS, status)].append(sketch)
+    # Each key is compacted once, after all of its days are in
+    return {key: KLLSketch.merged(sketches) for key, sketches in parts.items()}
+
+
+def window_report(start: str, end: str, store_dir: Path = DEFAULT_STORE,
+                  division: Optional[str] = None) -> List[Dict]:
+    """p50/p90/p99 dwell days per (division, status) for stages that ended in the window"""
+    rows = []
+    for (div, status), sketch in window_sketches(start, end, store_dir, division).items():
+        p50, p90, p99 = sketch.quantiles(PERCENTILES)
+        rows.append({
+            'division': div,
+            'status': status,
+            'stages': sketch.n,
+            'avg_days': round(sketch.mean(), 1),
+            'p50_days': p50,
+            'p90_days': p90,
+            'p99_days': p99,
+            'max_days': sketch.max
+        })
+    rows.sort(key=lambda r: (r['division'] != ALL_DIVISIONS, r['division'], -r['p90_days'], r['status']))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-day dwell-time sketches and rolling-window percentiles')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='sketch pay_StatusTracker stages per day')
+    build_parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    build_parser.add_argument('--store', type=Path, default=DEFAULT_STORE)
+    build_parser.add_argument('--since', help='only rewrite days from YYYY-MM-DD on')
+
+    window_parser = subparsers.add_parser('window', help='percentiles merged over a window of stored days')
+    window_parser.add_argument('--store', type=Path, default=DEFAULT_STORE)
+    window_parser.add_argument('--days', type=int, default=90)
+    window_parser.add_argument('--end', help='last day of the window (default: latest stored day)')
+    window_parser.add_argument('--division')
+    window_parser.add_argument('--output', type=Path, help='also write the rows as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        status_types = load_json(args.data_dir / 'pay_StatusTypes.json')
+        events = load_status_tracker(args.data_dir / 'pay_StatusTracker.json')
+        print(f"📥 Loaded {len(events):,} status tracking events")
+        days = daily_sketches(build_journeys(events, status_types), args.since)
+        written = write_days(days, args.store, args.since)
+        print(f"✓ Wrote {written} day sketches to {args.store} in {time.perf_counter() - start:.2f}s")
+        return
+
+    days = stored_days(args.store)
+    if not days:
+        print(f"❌ No sketches in {args.store} - run: python3 scripts/dwell_sketches.py build")
+        sys.exit(1)
+    end = args.end or days[-1]
+    start = (date.fromisoformat(end) - timedelta(days=args.days - 1)).isoformat()
+    rows = window_report(start, end, args.store, args.division)
+
+    print(f"📊 Dwell days for stages ended {start} .. {end}")
+    print(f"{'Division':<16} {'Status':<40} {'Stages':>7} {'Avg':>7} {'P50':>6} {'P90':>6} {'P99':>6}")
+    print("-" * 92)
+    for row in rows:
+        print(f"{row['division'][:16]:<16} {row['status'][:40]:<40} {row['stages']:>7} {row['avg_days']:>7} "
+              f"{row['p50_days']:>6} {row['p90_days']:>6} {row['p99_days']:>6}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'start': start, 'end': end, 'rows': rows}, f, indent=2)
+        print(f"✓ Saved {args.output}")
+
+
+if __name__ == '__main__':
+    main()
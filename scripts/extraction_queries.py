@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Chunked Extraction Query Generator
+
+The extraction scripts used to inline every operator GUID into one
+WHERE OperatorID IN (...) literal, which runs into SQL Server's 2,100
+parameter limit and compiles a fresh plan for every distinct list. This
+module writes the same extractions in three chunked forms:
+
+    batches     fixed-size ID batches, each one sp_executesql call with the
+                same statement text and parameter list (the last batch is
+                padded), so every batch reuses one cached plan
+    temp-table  IDs loaded into #extract_ids (<= 1,000-row VALUES inserts),
+                joined, and read a page of operators at a time by
+                sequence number (keyset on Seq)
+    watermark   incremental pull of rows changed since a high-water mark,
+                keyset-paginated on (COALESCE(UpdateAt, RecordAt), row ID);
+                optionally limited to the #extract_ids operators
+
+Statements use @name parameters, which SQL Server and Python's sqlite3
+both bind, so the run_* functions execute the same statement text against
+the local SQLite store (scripts/sqlite_store.py) and `check` verifies every
+form returns exactly the rows of the single IN-list query.
+
+Usage:
+    python3 scripts/extraction_queries.py status-tracker --mode temp-table --output sql/x.sql
+    python3 scripts/extraction_queries.py certifications --mode watermark --since "2025-06-01"
+    python3 scripts/extraction_queries.py check [--db generated/pay_tables.db]
+
+    from extraction_queries import STATUS_TRACKER, temp_table_script, run_id_batches
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+BASE_PATH = Path(__file__).parent.parent
+
+# SQL Server: at most 2,100 parameters per statement and 1,000 rows per VALUES list
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_WATERMARK_PAGE = 5000
+VALUES_ROWS = 1000
+
+Dialect = namedtuple('Dialect', 'name schema id_table id_type timestamp_type')
+TSQL = Dialect('tsql', 'dbo.', '#extract_ids', 'UNIQUEIDENTIFIER', 'DATETIME2')
+SQLITE = Dialect('sqlite', '', 'temp.extract_ids', 'TEXT', 'TEXT')
+
+# columns: select list; source: FROM/JOIN text ({schema} = dbo. or nothing);
+# id_column: matched against the operator IDs; row_id: unique row key (keyset tiebreak);
+# watermark: change timestamps, first non-null wins
+Extraction = namedtuple('Extraction', 'name columns source id_column row_id filters order_by watermark')
+
+CERTIFICATIONS = Extraction(
+    name='certifications',
+    columns=(
+        'o.ID', 'o.FirstName', 'o.LastName', 'o.Email', 'o.Mobile', 'o.DivisionID', 'o.Status',
+        'o.StatusID', 'o.StatusName', 'o.OrderID', 'o.StartDate', 'o.LastStatusDate', 'o.DateCreated',
+        'c.ID AS CertificationID', 'c.CertTypeID', 'c.FleetID', 'c.Cert', 'c.Date', 'c.Attachments',
+        'c.IsDeleted', 'c.ProviderID', 'c.isApproved', 'c.ApprovedBy', 'c.Comments', 'c.RecordAt',
+        'c.RecordBy', 'c.UpdateAt', 'c.UpdateBy', 'c.EsignStatus', 'c.DocumentID', 'c.FolderID',
+        'c.CompletionDate', 'c.ApprovedDate', 'c.SmsCount', 'c.isMobile', 'c.isProviderPortal',
+        'c.isOperatorPortal', 'c.isBackOffice', 'c.SignerID', 'c.isReviewed', 'c.Sent', 'c.ESignSendBy',
+        'c.ESignSendAt', 'c.ESignUpdatedAt', 'c.ESignUpdatedBy', 'c.ScheduledAppt',
+        'c.eSignInvitationExpiryDate', 'c.Passport', 'c.CloneID', 'c.isDisapproved', 'c.DisapprovedBy',
+        'c.DisapprovedAt', 'c.RejectedAt', 'c.RejectedBy', 'c.IsRejected', 'c.DisapprovalReason',
+        'c.RejectReason', 'c.SignNowInviteID', 'c.DeletedBy', 'c.UnDeletedBy', 'c.DeletedAt',
+        'c.UnDeletedAt', 'c.StripeAccountID', 'c.IsUploadByProvider', 'c.BatchID', 'c.BatchRemoveID',
+        'c.IsPaid', 'c.IsPaymentDate', 'c.PaymentReferenceID', 'c.I3ReferenceNumber', 'c.DonorPass',
+        'c.IsSensitive', 'c.IsRandom', 'c.SignedAttachments', 'c.IsDisqualified', 'c.AIReviewed',
+        'c.AINotes', 'c.AIRecommendation', 'c.DocumentReasonID', 'c.BETransactionHeaderID'
+    ),
+    source=('FROM {schema}pay_Operators AS o\n'
+            'INNER JOIN {schema}pay_StatusTypes AS st ON o.StatusID = st.Id\n'
+            'LEFT JOIN {schema}pay_Certifications AS c ON o.ID = c.OperatorId'),
+    id_column='o.ID',
+    row_id='c.ID',
+    filters=('(c.ID IS NULL OR COALESCE(c.IsDeleted, 0) = 0)',),
+    order_by=('st.Status', 'CAST(st.OrderID AS INT)', 'o.LastName', 'o.FirstName', 'c.Cert'),
+    watermark=('c.UpdateAt', 'c.RecordAt')
+)
+
+STATUS_TRACKER = Extraction(
+    name='status-tracker',
+    columns=('t.ID', 't.StatusID', 't.OperatorID', 't.Date', 't.RecordAt', 't.RecordBy', 't.UpdateAt',
+             't.UpdateBy', 't.DivisionID', 't.SequenceID', 't.ProviderID', 't.FleetID'),
+    source='FROM {schema}pay_StatusTracker AS t',
+    id_column='t.OperatorID',
+    row_id='t.ID',
+    filters=(),
+    order_by=('t.OperatorID', 't.SequenceID', 't.Date', 't.RecordAt'),
+    watermark=('t.UpdateAt', 't.RecordAt')
+)
+
+EXTRACTIONS = {extraction.name: extraction for extraction in (CERTIFICATIONS, STATUS_TRACKER)}
+
+
+def literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def operator_ids(operators: Sequence[Dict]) -> List[str]:
+    """Distinct operator IDs, in file order (ID / operatorID / Id, as the old generators read them)."""
+    ids = (op.get('ID') or op.get('operatorID') or op.get('Id') for op in operators)
+    return list(dict.fromkeys(op_id for op_id in ids if op_id))
+
+
+def id_batches(ids: Sequence[str], batch_size: int) -> List[List[str]]:
+    """ids in batches of exactly batch_size (the last one padded with its final ID)."""
+    batches = [list(ids[i:i + batch_size]) for i in range(0, len(ids), batch_size)]
+    if batches:
+        batches[-1] += batches[-1][-1:] * (batch_size - len(batches[-1]))
+    return batches
+
+
+def _watermark(extraction: Extraction) -> str:
+    return f"COALESCE({', '.join(extraction.watermark)})"
+
+
+def _select(extraction: Extraction, dialect: Dialect, where: Sequence[str] = (), joins: str = '',
+            order_by: Optional[Sequence[str]] = None, extra_columns: Sequence[str] = (),
+            top: Optional[str] = None, into: Optional[str] = None) -> str:
+    """One SELECT over the extraction; top is a T-SQL TOP / SQLite LIMIT expression."""
+    conditions = list(extraction.filters) + list(where)
+    lines = ['SELECT' + (f' TOP ({top})' if top and dialect is TSQL else '')]
+    lines.append(',\n'.join(f'    {column}' for column in list(extraction.columns) + list(extra_columns)))
+    if into:
+        lines.append(f'INTO {into}')
+    lines.append(extraction.source.format(schema=dialect.schema) + joins)
+    if conditions:
+        lines.append('WHERE ' + '\n  AND '.join(conditions))
+    lines.append('ORDER BY ' + ', '.join(extraction.order_by if order_by is None else order_by))
+    if top and dialect is not TSQL:
+        lines.append(f'LIMIT {top}')
+    return '\n'.join(lines)
+
+
+# --- statements -----------------------------------------------------------
+
+def in_list_statement(extraction: Extraction, ids: Sequence[str], dialect: Dialect = TSQL) -> str:
+    """The old single-statement form (every ID inlined); kept as the reference for check()."""
+    id_list = ',\n    '.join(literal(op_id) for op_id in ids)
+    return _select(extraction, dialect, [f'{extraction.id_column} IN (\n    {id_list}\n)']) + ';'
+
+
+def id_batch_statement(extraction: Extraction, batch_size: int, dialect: Dialect = TSQL) -> str:
+    """One statement text for every batch: IN (@p0, ..., @p<batch_size-1>)."""
+    params = ', '.join(f'@p{i}' for i in range(batch_size))
+    return _select(extraction, dialect, [f'{extraction.id_column} IN ({params})'])
+
+
+def id_table_sql(ids: Sequence[str], dialect: Dialect = TSQL) -> List[str]:
+    """Statements that (re)create the ID table with a dense Seq key and load ids into it."""
+    table = dialect.id_table
+    if dialect is TSQL:
+        statements = [f"IF OBJECT_ID('tempdb..{table}') IS NOT NULL DROP TABLE {table};",
+                      f'CREATE TABLE {table} (Seq INT IDENTITY(1, 1) PRIMARY KEY, '
+                      f'ID {dialect.id_type} NOT NULL UNIQUE);']
+    else:
+        statements = [f'DROP TABLE IF EXISTS {table};',
+                      f'CREATE TABLE {table} (Seq INTEGER PRIMARY KEY, ID {dialect.id_type} NOT NULL UNIQUE);']
+    for i in range(0, len(ids), VALUES_ROWS):
+        rows = ',\n    '.join(f'({literal(op_id)})' for op_id in ids[i:i + VALUES_ROWS])
+        statements.append(f'INSERT INTO {table} (ID) VALUES\n    {rows};')
+    return statements
+
+
+def id_page_statement(extraction: Extraction, dialect: Dialect = TSQL) -> str:
+    """Rows for operators @after_seq < Seq <= @through_seq of the ID table."""
+    return _select(extraction, dialect,
+                   ['k.Seq > @after_seq', 'k.Seq <= @through_seq'],
+                   joins=f'\nINNER JOIN {dialect.id_table} AS k ON k.ID = {extraction.id_column}',
+                   order_by=('k.Seq',) + tuple(extraction.order_by))
+
+
+def watermark_statement(extraction: Extraction, dialect: Dialect = TSQL, restrict_ids: bool = False,
+                        into: Optional[str] = None) -> str:
+    """
+    One page of rows changed after (@after_at, @after_id), oldest change
+    first; start with @after_at = the last run's high-water mark and
+    @after_id = NULL, then continue from the last row of each page.
+    """
+    changed_at = _watermark(extraction)
+    joins = f'\nINNER JOIN {dialect.id_table} AS k ON k.ID = {extraction.id_column}' if restrict_ids else ''
+    return _select(extraction, dialect,
+                   [f'({changed_at} > @after_at OR ({changed_at} = @after_at AND {extraction.row_id} > @after_id))'],
+                   joins=joins,
+                   order_by=(changed_at, extraction.row_id),
+                   extra_columns=(f'{changed_at} AS WatermarkAt', f'{extraction.row_id} AS WatermarkID'),
+                   top='@page_size', into=into)
+
+
+# --- T-SQL scripts --------------------------------------------------------
+
+def _header(extraction: Extraction, mode: str, ids: Sequence[str], note: str) -> str:
+    return (f'-- {extraction.name} extraction ({mode}) for {len(ids)} operator IDs\n'
+            f'-- Generated by scripts/extraction_queries.py; {note}\n\n')
+
+
+def id_batch_script(extraction: Extraction, ids: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> str:
+    """One sp_executesql call per batch, all sharing one statement text (one cached plan)."""
+    batch_size = min(batch_size, len(ids)) or 1
+    statement = id_batch_statement(extraction, batch_size).replace("'", "''")
+    declarations = ', '.join(f'@p{i} {TSQL.id_type}' for i in range(batch_size))
+    parts = [_header(extraction, 'ID batches', ids, f'{batch_size} IDs per batch, one result set each')]
+    parts.append(f"DECLARE @stmt NVARCHAR(MAX) = N'{statement}';\n"
+                 f"DECLARE @params NVARCHAR(MAX) = N'{declarations}';\n")
+    batches = id_batches(ids, batch_size)
+    for n, batch in enumerate(batches, 1):
+        values = ',\n    '.join(f'@p{i} = {literal(op_id)}' for i, op_id in enumerate(batch))
+        parts.append(f'\n-- Batch {n} of {len(batches)}\nEXEC sp_executesql @stmt, @params,\n    {values};\n')
+    return ''.join(parts)
+
+
+def temp_table_script(extraction: Extraction, ids: Sequence[str], page_size: int = DEFAULT_PAGE_SIZE) -> str:
+    """IDs into #extract_ids, then one result set per page of page_size operators."""
+    statement = id_page_statement(extraction).replace('\n', '\n    ')
+    return (_header(extraction, 'temp-table join', ids, f'{page_size} operators per result set')
+            + '\n\n'.join(id_table_sql(ids)) + '\n\n'
+            f'DECLARE @page_size INT = {page_size};\n'
+            f'DECLARE @after_seq INT = 0, @through_seq INT;\n'
+            f'DECLARE @last_seq INT = (SELECT MAX(Seq) FROM {TSQL.id_table});\n\n'
+            f'WHILE @after_seq < @last_seq\n'
+            f'BEGIN\n'
+            f'    SET @through_seq = @after_seq + @page_size;\n'
+            f'    {statement};\n'
+            f'    SET @after_seq = @through_seq;\n'
+            f'END\n\n'
+            f'DROP TABLE {TSQL.id_table};\n')
+
+
+def watermark_script(extraction: Extraction, since: str, ids: Optional[Sequence[str]] = None,
+                     page_size: int = DEFAULT_WATERMARK_PAGE) -> str:
+    """Rows changed after since, page_size rows per result set, keyset on (change time, row ID)."""
+    page = '#extract_page'
+    statement = watermark_statement(extraction, restrict_ids=bool(ids), into=page).replace('\n', '\n    ')
+    script = _header(extraction, 'watermark', ids or [],
+                     f'rows changed after {since}, {page_size} per result set; '
+                     'the last WatermarkAt is the next run\'s high-water mark')
+    if ids:
+        script += '\n\n'.join(id_table_sql(ids)) + '\n\n'
+    script += (f'DECLARE @page_size INT = {page_size};\n'
+               f'DECLARE @after_at {TSQL.timestamp_type} = {literal(since)};   -- last run\'s high-water mark\n'
+               f'DECLARE @after_id {TSQL.id_type} = NULL;\n'
+               f'DECLARE @rows INT = @page_size;\n\n'
+               f"IF OBJECT_ID('tempdb..{page}') IS NOT NULL DROP TABLE {page};\n\n"
+               f'WHILE @rows = @page_size\n'
+               f'BEGIN\n'
+               f'    {statement};\n'
+               f'    SET @rows = @@ROWCOUNT;\n\n'
+               f'    SELECT * FROM {page} ORDER BY WatermarkAt, WatermarkID;\n'
+               f'    SELECT TOP (1) @after_at = WatermarkAt, @after_id = WatermarkID\n'
+               f'    FROM {page} ORDER BY WatermarkAt DESC, WatermarkID DESC;\n'
+               f'    DROP TABLE {page};\n'
+               f'END\n')
+    if ids:
+        script += f'\nDROP TABLE {TSQL.id_table};\n'
+    return script
+
+
+def write_script(extraction: Extraction, mode: str, ids: Sequence[str], output: Path,
+                 batch_size: int = DEFAULT_BATCH_SIZE, page_size: Optional[int] = None,
+                 since: Optional[str] = None) -> str:
+    if mode == 'batches':
+        script = id_batch_script(extraction, ids, batch_size)
+    elif mode == 'temp-table':
+        script = temp_table_script(extraction, ids, page_size or DEFAULT_PAGE_SIZE)
+    elif mode == 'watermark':
+        if not since:
+            raise ValueError('watermark mode needs a since timestamp')
+        script = watermark_script(extraction, since, ids, page_size or DEFAULT_WATERMARK_PAGE)
+    else:
+        raise ValueError(f'unknown mode {mode!r}')
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(script)
+    return script
+
+
+# --- running against SQLite -----------------------------------------------
+
+def run_in_list(conn: sqlite3.Connection, extraction: Extraction, ids: Sequence[str]) -> List[sqlite3.Row]:
+    return conn.execute(in_list_statement(extraction, ids, SQLITE)).fetchall()
+
+
+def run_id_batches(conn: sqlite3.Connection, extraction: Extraction, ids: Sequence[str],
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+    batch_size = min(batch_size, len(ids)) or 1
+    statement = id_batch_statement(extraction, batch_size, SQLITE)
+    for batch in id_batches(ids, batch_size):
+        yield from conn.execute(statement, {f'p{i}': op_id for i, op_id in enumerate(batch)})
+
+
+def _load_ids(conn: sqlite3.Connection, ids: Sequence[str]):
+    for statement in id_table_sql(ids, SQLITE):
+        conn.execute(statement)
+
+
+def run_temp_table(conn: sqlite3.Connection, extraction: Extraction, ids: Sequence[str],
+                   page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[sqlite3.Row]:
+    _load_ids(conn, ids)
+    statement = id_page_statement(extraction, SQLITE)
+    for after_seq in range(0, len(ids), page_size):
+        yield from conn.execute(statement, {'after_seq': after_seq, 'through_seq': after_seq + page_size})
+
+
+def run_watermark(conn: sqlite3.Connection, extraction: Extraction, since: str,
+                  ids: Optional[Sequence[str]] = None,
+                  page_size: int = DEFAULT_WATERMARK_PAGE) -> Iterator[sqlite3.Row]:
+    """Changed rows in pages; the last row's WatermarkAt is the next high-water mark."""
+    if ids:
+        _load_ids(conn, ids)
+    statement = watermark_statement(extraction, SQLITE, restrict_ids=bool(ids))
+    params = {'after_at': since, 'after_id': None, 'page_size': page_size}
+    while True:
+        page = conn.execute(statement, params).fetchall()
+        yield from page
+        if len(page) < page_size:
+            return
+        params.update(after_at=page[-1]['WatermarkAt'], after_id=page[-1]['WatermarkID'])
+
+
+def check(db_path: Path, batch_size: int = 16, page_size: int = 16, since: str = '') -> bool:
+    """Run every form against the SQLite store and compare with the single IN-list query."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from sqlite_store import connect
+
+    conn = connect(db_path)
+    _production_views(conn)
+    ids = [op_id for (op_id,) in conn.execute('SELECT ID FROM pay_Operators WHERE ID IS NOT NULL')]
+    ids = list(dict.fromkeys(ids))
+    ok = True
+    for extraction in EXTRACTIONS.values():
+        try:
+            reference = run_in_list(conn, extraction, ids)
+        except sqlite3.OperationalError as e:
+            print(f"   ⚠️  {extraction.name}: skipped, the store lacks its columns ({e})")
+            continue
+        expected = sorted(map(tuple, reference), key=repr)
+        width = len(extraction.columns)
+        changed = sorted((tuple(row) for row in reference
+                          if _changed_at(row) is not None and _changed_at(row) > since), key=repr)
+        results = {
+            f'batches of {batch_size}': (expected, run_id_batches(conn, extraction, ids, batch_size)),
+            f'temp table, pages of {page_size}': (expected, run_temp_table(conn, extraction, ids, page_size)),
+            f'watermark > {since!r}, pages of {page_size}':
+                (changed, run_watermark(conn, extraction, since, ids, page_size)),
+        }
+        for label, (want, rows) in results.items():
+            got = sorted((tuple(row)[:width] for row in rows), key=repr)
+            match = got == want
+            ok &= match
+            print(f"   {'✓' if match else '❌'} {extraction.name}, {label}: {len(got)} rows"
+                  f"{'' if match else f' (expected {len(want)})'}")
+    conn.close()
+    return ok
+
+
+def _production_views(conn: sqlite3.Connection):
+    """
+    Certification extracts name the row key CertificationID and hold flags as
+    text; a temp view (which shadows the table) exposes them the way
+    dbo.pay_Certifications does, so the certifications extraction runs as written.
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA main.table_info(pay_Certifications)')]
+    if 'CertificationID' not in columns or 'ID' in columns:
+        return
+    select = ', '.join(f'CAST("{column}" AS INTEGER) AS "{column}"' if column.lower() == 'isdeleted'
+                       else f'"{column}"' for column in columns)
+    conn.execute(f'CREATE TEMP VIEW pay_Certifications AS '
+                 f'SELECT {select}, CertificationID AS ID FROM main.pay_Certifications')
+
+
+def _changed_at(row: sqlite3.Row):
+    keys = row.keys()
+    for column in ('UpdateAt', 'RecordAt'):
+        if column in keys and row[column] is not None:
+            return row[column]
+    return None
+
+
+# --- CLI ------------------------------------------------------------------
+
+def load_operator_ids(path: Path) -> List[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return operator_ids(data.get('operators', []) if isinstance(data, dict) else data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked / keyset-paginated extraction scripts for SQL Server')
+    parser.add_argument('extraction', choices=sorted(EXTRACTIONS) + ['check'])
+    parser.add_argument('--mode', choices=('batches', 'temp-table', 'watermark'), default='temp-table')
+    parser.add_argument('--operators', type=Path, default=BASE_PATH / 'data' / 'pay_Operators.json')
+    parser.add_argument('--batch-size', type=int, help=f'IDs per batch (default {DEFAULT_BATCH_SIZE}; check: 16)')
+    parser.add_argument('--page-size', type=int, help='operators (temp-table) or rows (watermark) per result set')
+    parser.add_argument('--since', help='watermark: last run\'s high-water mark, e.g. "2025-06-01 00:00:00"')
+    parser.add_argument('--all-operators', action='store_true', help='watermark: every operator, no ID list')
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--db', type=Path, default=BASE_PATH / 'generated' / 'pay_tables.db')
+    args = parser.parse_args()
+
+    if args.extraction == 'check':
+        print(f"🔎 Checking chunked extractions against {args.db} ...")
+        ok = check(args.db, args.batch_size or 16, args.page_size or 16, args.since or '')
+        print('✅ All forms match the IN-list query' if ok else '❌ Mismatch')
+        sys.exit(0 if ok else 1)
+
+    extraction = EXTRACTIONS[args.extraction]
+    ids = [] if args.all_operators else load_operator_ids(args.operators)
+    output = args.output or BASE_PATH / 'sql' / f"extract_{extraction.name.replace('-', '_')}_{args.mode.replace('-', '_')}.sql"
+    write_script(extraction, args.mode, ids, output, args.batch_size or DEFAULT_BATCH_SIZE, args.page_size, args.since)
+    print(f"✅ Generated {output} ({args.mode}, {len(ids)} operator IDs)")
+
+
+if __name__ == '__main__':
+    main()
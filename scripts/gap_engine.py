@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Indexed Certification Gap Engine
+
+Builds every lookup the gap analysis needs in a single pass over the
+certification rows, then answers gap queries for any number of operators
+without rescanning the certification list.
+
+Indexes built:
+    - operator ID -> set of approved, non-deleted cert names
+    - (status, division) -> required certs (80%+ adoption) + operator totals
+    - division -> statuses sorted by OrderID (for next-status lookups)
+
+Usage:
+    from gap_engine import GapEngine
+
+    engine = GapEngine(certifications, status_orders)
+    gaps = engine.analyze(operators)
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from records import parse_bool
+
+# Minimum adoption percentage for a cert to count as required at a status/division
+REQUIRED_THRESHOLD_PCT = 80
+
+
+def is_active_cert(cert) -> bool:
+    """True if a certification row/record is approved, not deleted and named."""
+    return (
+        parse_bool(cert.get('isApproved', '0'))
+        and not parse_bool(cert.get('IsDeleted', '0'))
+        and bool(cert.get('Cert'))
+    )
+
+
+class GapEngine:
+    """Operator/requirement indexes built once, queried per operator in O(1)."""
+
+    def __init__(self, certifications: List[Dict], status_orders: Dict,
+                 threshold: int = REQUIRED_THRESHOLD_PCT):
+        self.status_orders = status_orders
+        self.threshold = threshold
+        self.operator_certs: Dict[str, Set[str]] = defaultdict(set)
+        self.requirements: Dict[str, Dict] = {}
+        self._next_status_index: Dict[str, Tuple[List[int], List[str]]] = {}
+
+        self._index_certifications(certifications)
+        self._index_status_orders()
+
+    def _index_certifications(self, certifications: List[Dict]):
+        """Single pass: operator cert sets, per status/division cert counts and operator sets."""
+        status_div_certs = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+        seen_operators = defaultdict(lambda: defaultdict(set))
+
+        for cert in certifications:
+            operator_id = cert.get('ID')
+            status_name = cert.get('StatusName', 'Unknown')
+            division_id = cert.get('DivisionID', 'Unknown')
+
+            seen_operators[status_name][division_id].add(operator_id)
+
+            if is_active_cert(cert):
+                cert_name = cert.get('Cert')
+                self.operator_certs[operator_id].add(cert_name)
+                status_div_certs[status_name][division_id][cert_name] += 1
+
+        for status_name, divisions in status_div_certs.items():
+            self.requirements[status_name] = {'divisions': {}}
+
+            for division_id, cert_counts in divisions.items():
+                total_ops = len(seen_operators[status_name][division_id])
+                required_certs = []
+
+                for cert_name, count in cert_counts.items():
+                    percentage = (count / total_ops) * 100 if total_ops > 0 else 0
+                    if percentage >= self.threshold:
+                        required_certs.append(cert_name)
+
+                self.requirements[status_name]['divisions'][division_id] = {
+                    'required_certs': sorted(required_certs),
+                    'total_operators': total_ops,
+                    'order': self.status_orders.get(division_id, {}).get(status_name, '99')
+                }
+
+    def _index_status_orders(self):
+        """Sort each division's statuses by order once so next-status is a bisect."""
+        for division_id, statuses in self.status_orders.items():
+            # Stable sort keeps file order for statuses sharing an OrderID
+            ordered = sorted(((int(o), s) for s, o in statuses.items()), key=lambda x: x[0])
+            self._next_status_index[division_id] = (
+                [order for order, _ in ordered],
+                [status for _, status in ordered]
+            )
+
+    def get_operator_certs(self, operator_id: str) -> Set[str]:
+        """Approved certs held by an operator."""
+        return self.operator_certs.get(operator_id, set())
+
+    def get_required_certs(self, status_name: str, division_id: str) -> Set[str]:
+        """Required certs for a status in a division."""
+        reqs = self.requirements.get(status_name, {}).get('divisions', {}).get(division_id, {})
+        return set(reqs.get('required_certs', []))
+
+    def get_next_status(self, current_status: str, division_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Next status in lifecycle progression for this division."""
+        try:
+            current_order = int(self.status_orders.get(division_id, {}).get(current_status, '99'))
+        except (TypeError, ValueError):
+            return None, None
+
+        orders, statuses = self._next_status_index.get(division_id, ([], []))
+        pos = bisect_right(orders, current_order)
+        if pos >= len(orders):
+            return None, None
+        return statuses[pos], str(orders[pos])
+
+    def operator_gap(self, operator: Dict) -> Dict:
+        """Gap record for one operator (same shape as operator_certification_gaps.json)."""
+        operator_id = operator.get('ID')
+        first_name = operator.get('FirstName', '')
+        last_name = operator.get('LastName', '')
+        current_status = operator.get('StatusName', 'Unknown')
+        division_id = operator.get('DivisionID', 'Unknown')
+
+        operator_info = {
+            'id': operator_id,
+            'name': f"{first_name} {last_name}".strip(),
+            'email': operator.get('Email', ''),
+            'division': division_id
+        }
+        current_info = {
+            'name': current_status,
+            'order': operator.get('OrderID', '99')
+        }
+        current_certs = self.get_operator_certs(operator_id)
+
+        next_status, next_order = self.get_next_status(current_status, division_id)
+
+        if not next_status:
+            # Already at final status or status not found
+            return {
+                'operator': operator_info,
+                'current_status': current_info,
+                'current_certs': sorted(current_certs),
+                'next_status': None,
+                'required_certs': [],
+                'missing_certs': [],
+                'has_certs': [],
+                'progress': 'FINAL STATUS' if current_status != 'Unknown' else 'UNKNOWN STATUS'
+            }
+
+        required_certs = self.get_required_certs(next_status, division_id)
+        missing_certs = sorted(required_certs - current_certs)
+        has_certs = sorted(required_certs & current_certs)
+
+        progress_pct = 0
+        if required_certs:
+            progress_pct = int((len(has_certs) / len(required_certs)) * 100)
+
+        return {
+            'operator': operator_info,
+            'current_status': current_info,
+            'next_status': {
+                'name': next_status,
+                'order': next_order
+            },
+            'required_certs': sorted(required_certs),
+            'missing_certs': missing_certs,
+            'has_certs': has_certs,
+            'progress': f"{len(has_certs)}/{len(required_certs)} ({progress_pct}%)" if required_certs else "No requirements"
+        }
+
+    def analyze(self, operators: List[Dict]) -> List[Dict]:
+        """Gap records for every operator, in input order."""
+        return [self.operator_gap(operator) for operator in operators]
@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 """
 Generate SQL query to fetch certifications for all operators in the sample data.
-Reads operator IDs from pay_Operators_sample_across_statuses.txt and generates 
-get_operator_certifications.sql dynamically.
+Reads operator IDs from pay_Operators.json and generates
+get_operator_certifications.sql dynamically, chunked through a temp table
+(or --mode batches / watermark, see extraction_queries.py).
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
 
+from extraction_queries import CERTIFICATIONS, DEFAULT_BATCH_SIZE, operator_ids, write_script
+
 def load_operators(data_file: Path) -> list:
     """Load operators from JSON data file."""
     try:
@@ -26,122 +30,33 @@ def load_operators(data_file: Path) -> list:
         print(f"Error loading {data_file}: {e}", file=sys.stderr)
         sys.exit(1)
 
-def generate_cert_query(operators: list, output_file: Path):
-    """Generate SQL query with all operator IDs."""
-    
-    # Build operator ID list without comments
-    operator_list = []
-    for op in operators:
-        op_id = op.get('ID') or op.get('operatorID') or op.get('Id')
-        operator_list.append(f"        '{op_id}',")
+def generate_cert_query(operators: list, output_file: Path, mode: str = 'temp-table',
+                        batch_size: int = DEFAULT_BATCH_SIZE, page_size: int = None, since: str = None):
+    """Generate the certification extraction script for all operator IDs.
     
-    # Join all but last with comma, last without comma
-    operator_ids_formatted = '\n'.join(operator_list[:-1]) + '\n' + operator_list[-1].rstrip(',')
-    
-    # Generate SQL with ALL 67 certification fields - using updated operator fields
-    sql = f"""SELECT 
-    o.ID,
-    o.FirstName,
-    o.LastName,
-    o.Email,
-    o.Mobile,
-    o.DivisionID,
-    o.Status,
-    o.StatusID,
-    o.StatusName,
-    o.OrderID,
-    o.StartDate,
-    o.LastStatusDate,
-    o.DateCreated,
-    c.ID AS CertificationID,
-    c.CertTypeID,
-    c.FleetID,
-    c.Cert,
-    c.Date,
-    c.Attachments,
-    c.IsDeleted,
-    c.ProviderID,
-    c.isApproved,
-    c.ApprovedBy,
-    c.Comments,
-    c.RecordAt,
-    c.RecordBy,
-    c.UpdateAt,
-    c.UpdateBy,
-    c.EsignStatus,
-    c.DocumentID,
-    c.FolderID,
-    c.CompletionDate,
-    c.ApprovedDate,
-    c.SmsCount,
-    c.isMobile,
-    c.isProviderPortal,
-    c.isOperatorPortal,
-    c.isBackOffice,
-    c.SignerID,
-    c.isReviewed,
-    c.Sent,
-    c.ESignSendBy,
-    c.ESignSendAt,
-    c.ESignUpdatedAt,
-    c.ESignUpdatedBy,
-    c.ScheduledAppt,
-    c.eSignInvitationExpiryDate,
-    c.Passport,
-    c.CloneID,
-    c.isDisapproved,
-    c.DisapprovedBy,
-    c.DisapprovedAt,
-    c.RejectedAt,
-    c.RejectedBy,
-    c.IsRejected,
-    c.DisapprovalReason,
-    c.RejectReason,
-    c.SignNowInviteID,
-    c.DeletedBy,
-    c.UnDeletedBy,
-    c.DeletedAt,
-    c.UnDeletedAt,
-    c.StripeAccountID,
-    c.IsUploadByProvider,
-    c.BatchID,
-    c.BatchRemoveID,
-    c.IsPaid,
-    c.IsPaymentDate,
-    c.PaymentReferenceID,
-    c.I3ReferenceNumber,
-    c.DonorPass,
-    c.IsSensitive,
-    c.IsRandom,
-    c.SignedAttachments,
-    c.IsDisqualified,
-    c.AIReviewed,
-    c.AINotes,
-    c.AIRecommendation,
-    c.DocumentReasonID,
-    c.BETransactionHeaderID
-FROM dbo.pay_Operators AS o
-INNER JOIN dbo.pay_StatusTypes AS st ON o.StatusID = st.Id
-LEFT JOIN dbo.pay_Certifications AS c ON o.ID = c.OperatorId
-WHERE o.ID IN (
-{operator_ids_formatted}
-)
-AND (c.ID IS NULL OR ISNULL(c.IsDeleted, 0) = 0)
-ORDER BY st.Status, CAST(st.OrderID AS INT), o.LastName, o.FirstName, c.Cert;
-"""
+    IDs go through a temp table, fixed-size batches or a watermark pull
+    (see extraction_queries.py) instead of one giant IN (...) list.
+    """
+    operator_list = operator_ids(operators)
     
     # Write SQL file
     try:
-        with open(output_file, 'w') as f:
-            f.write(sql)
+        write_script(CERTIFICATIONS, mode, operator_list, output_file, batch_size, page_size, since)
         print(f"✅ Generated {output_file}")
-        print(f"   Included {len(operators)} operators")
+        print(f"   Included {len(operator_list)} operators ({mode})")
         return True
     except Exception as e:
         print(f"Error writing {output_file}: {e}", file=sys.stderr)
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate get_operator_certifications.sql')
+    parser.add_argument('--mode', choices=('temp-table', 'batches', 'watermark'), default='temp-table')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--page-size', type=int)
+    parser.add_argument('--since', help='watermark mode: pull rows changed after this timestamp')
+    args = parser.parse_args()
+    
     # Setup paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -168,7 +83,7 @@ def main():
     print()
     
     # Generate query
-    success = generate_cert_query(operators, output_file)
+    success = generate_cert_query(operators, output_file, args.mode, args.batch_size, args.page_size, args.since)
     
     print()
     print("=" * 80)
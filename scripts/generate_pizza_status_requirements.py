@@ -14,6 +14,10 @@ from pathlib import Path
 from typing import Dict, List, Set
 from collections import defaultdict
 
+from alias_resolver import AliasResolver
+from records import CertType, StatusType
+from snapshot import load_table_records
+
 
 # Excluded divisions that should not be considered
 EXCLUDED_DIVS = ['PA - BROOKES', '2 - LAHORE']
@@ -38,12 +42,16 @@ def load_json_data(filepath: Path) -> any:
 
 
 def get_cert_types_by_pizza_status(cert_types: List[Dict], pizza_statuses: List[Dict], 
-                                    aliases: Dict) -> Dict:
+                                    aliases) -> Dict:
     """Group certification types by their PizzaStatusID.
     
+    Cert names are resolved to canonical names with the shared AliasResolver
+    (aliases may be a resolver or the raw certification_aliases.json dict).
+    
     Returns a dict mapping PizzaStatusID to list of required certifications.
     """
     pizza_groups = defaultdict(list)
+    resolver = AliasResolver.ensure(aliases)
     
     # Create pizza status lookup for names
     pizza_lookup = {ps['ID']: ps for ps in pizza_statuses}
@@ -66,11 +74,8 @@ def get_cert_types_by_pizza_status(cert_types: List[Dict], pizza_statuses: List[
         
         cert_name = cert_type.get('Certification', '').strip()
         
-        # Normalize using aliases - handle both string and list values
-        normalized_name = aliases.get(cert_name, cert_name)
-        if isinstance(normalized_name, list):
-            # If alias maps to a list, use the first (canonical) name
-            normalized_name = normalized_name[0] if normalized_name else cert_name
+        # Normalize using aliases
+        normalized_name = resolver.resolve(cert_name)
         
         pizza_groups[pizza_id].append({
             'cert_type_id': cert_type.get('ID'),
@@ -162,10 +167,12 @@ def main():
     
     # Load data files
     print("\n📂 Loading data files...")
-    cert_types = load_json_data(base_path / 'data' / 'pay_CertTypes.json')
-    status_types = load_json_data(base_path / 'data' / 'pay_StatusTypes.json')
+    # Cert and status types are read by column from the memory-mapped snapshot
+    # (scripts/snapshot.py build) when fresh; records keep dict-style get()
+    cert_types = load_table_records('pay_CertTypes', CertType, base_path / 'data')
+    status_types = load_table_records('pay_StatusTypes', StatusType, base_path / 'data')
     pizza_statuses = load_json_data(base_path / 'data' / 'pay_PizzaStatuses.json')
-    aliases = load_json_data(base_path / 'config' / 'certification_aliases.json')
+    aliases = AliasResolver.from_file(base_path / 'config' / 'certification_aliases.json')
     
     print(f"   ✓ Certification Types: {len(cert_types)}")
     print(f"   ✓ Status Types: {len(status_types)}")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+JSON Patch (RFC 6902)
+
+Applies add / remove / replace / move / copy / test operations to a JSON
+document and returns the patched document. The input is never modified:
+only the containers along each operation's path are copied, so patching one
+cert list in the 350 KB requirements document copies a few small
+containers, and the previous version stays valid for diffs and history.
+
+Usage:
+    from json_patch import apply_patch, touched_keys
+
+    new_doc = apply_patch(doc, [
+        {'op': 'add', 'path': '/<PizzaStatusID>/required_certifications/-', 'value': {'name': 'W9'}},
+        {'op': 'remove', 'path': '/<PizzaStatusID>/status_mappings/0'},
+    ])
+    touched_keys(ops)   # {'<PizzaStatusID>'} - top-level keys the patch touches
+"""
+
+import copy
+from typing import Dict, List, Optional, Set
+
+_VALUE_OPS = ('add', 'replace', 'test')
+_FROM_OPS = ('move', 'copy')
+
+
+class JsonPatchError(ValueError):
+    """Malformed patch, or an operation that does not apply to the document."""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """JSON Pointer (RFC 6901) -> reference tokens ('' is the whole document)."""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"Path must be a string, got {pointer!r}")
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise JsonPatchError(f"Path must start with '/': {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _json_equal(a, b) -> bool:
+    """JSON equality: like ==, except booleans never equal numbers."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+class _Patcher:
+    """Applies operations with path copying; containers it created are mutated in place."""
+
+    def __init__(self, document):
+        self.root = document
+        self._owned: Dict[int, object] = {}  # id -> container (kept alive so ids stay unique)
+
+    def _own(self, container):
+        if id(container) in self._owned:
+            return container
+        owned = dict(container) if isinstance(container, dict) else list(container)
+        self._owned[id(owned)] = owned
+        return owned
+
+    @staticmethod
+    def _index(node, token: str, path: str, adding: bool = False):
+        if isinstance(node, dict):
+            return token
+        if adding and token == '-':
+            return len(node)
+        if not token.isdigit() or (token != '0' and token.startswith('0')):
+            raise JsonPatchError(f"Invalid array index {token!r} in {path!r}")
+        index = int(token)
+        if index > len(node) or (index == len(node) and not adding):
+            raise JsonPatchError(f"Array index {index} out of range in {path!r}")
+        return index
+
+    def _get(self, tokens: List[str], path: str):
+        node = self.root
+        for token in tokens:
+            if not isinstance(node, (dict, list)):
+                raise JsonPatchError(f"{path!r} goes through a non-container value")
+            key = self._index(node, token, path)
+            if isinstance(node, dict) and key not in node:
+                raise JsonPatchError(f"{path!r} does not exist")
+            node = node[key]
+        return node
+
+    def _parent(self, tokens: List[str], path: str):
+        """Owned copy of the container holding the last token (copies the path down to it)."""
+        if not isinstance(self.root, (dict, list)):
+            raise JsonPatchError(f"{path!r}: document is not a container")
+        self.root = node = self._own(self.root)
+        for token in tokens[:-1]:
+            key = self._index(node, token, path)
+            if isinstance(node, dict) and key not in node:
+                raise JsonPatchError(f"{path!r} does not exist")
+            child = node[key]
+            if not isinstance(child, (dict, list)):
+                raise JsonPatchError(f"{path!r} goes through a non-container value")
+            node[key] = node = self._own(child)
+        return node
+
+    def add(self, tokens, path, value):
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens, path)
+        key = self._index(parent, tokens[-1], path, adding=True)
+        if isinstance(parent, list):
+            parent.insert(key, value)
+        else:
+            parent[key] = value
+
+    def remove(self, tokens, path):
+        if not tokens:
+            raise JsonPatchError("Cannot remove the whole document")
+        parent = self._parent(tokens, path)
+        key = self._index(parent, tokens[-1], path)
+        if isinstance(parent, dict) and key not in parent:
+            raise JsonPatchError(f"{path!r} does not exist")
+        value = parent[key]
+        del parent[key]
+        return value
+
+    def replace(self, tokens, path, value):
+        if not tokens:
+            self.root = value
+            return
+        parent = self._parent(tokens, path)
+        key = self._index(parent, tokens[-1], path)
+        if isinstance(parent, dict) and key not in parent:
+            raise JsonPatchError(f"{path!r} does not exist")
+        parent[key] = value
+
+    def apply(self, operation: Dict):
+        if not isinstance(operation, dict):
+            raise JsonPatchError(f"Operation must be an object, got {operation!r}")
+        op, path = operation.get('op'), operation.get('path')
+        tokens = parse_pointer(path)
+        if op in _VALUE_OPS and 'value' not in operation:
+            raise JsonPatchError(f"'{op}' operation needs a 'value'")
+        if op in _FROM_OPS:
+            from_tokens = parse_pointer(operation.get('from'))
+
+        if op == 'add':
+            self.add(tokens, path, operation['value'])
+        elif op == 'remove':
+            self.remove(tokens, path)
+        elif op == 'replace':
+            self.replace(tokens, path, operation['value'])
+        elif op == 'move':
+            if tokens[:len(from_tokens)] == from_tokens and tokens != from_tokens:
+                raise JsonPatchError(f"Cannot move {operation['from']!r} into its own child {path!r}")
+            self.add(tokens, path, self.remove(from_tokens, operation['from']))
+        elif op == 'copy':
+            self.add(tokens, path, copy.deepcopy(self._get(from_tokens, operation['from'])))
+        elif op == 'test':
+            if not _json_equal(self._get(tokens, path), operation['value']):
+                raise JsonPatchError(f"Test failed at {path!r}")
+        else:
+            raise JsonPatchError(f"Unknown operation {op!r}")
+
+
+def apply_patch(document, operations: List[Dict]):
+    """
+    Apply RFC 6902 operations and return the new document.
+
+    All-or-nothing: if any operation fails, JsonPatchError is raised and no
+    new document is produced. The input document is not modified.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A patch must be a list of operations")
+    patcher = _Patcher(document)
+    for operation in operations:
+        patcher.apply(operation)
+    return patcher.root
+
+
+def touched_keys(operations: List[Dict]) -> Optional[Set[str]]:
+    """Top-level keys a patch reads or writes, or None if it targets the whole document."""
+    keys = set()
+    for operation in operations:
+        for pointer in (operation.get('path'), operation.get('from')):
+            if pointer is None:
+                continue
+            tokens = parse_pointer(pointer)
+            if not tokens:
+                return None
+            keys.add(tokens[0])
+    return keys
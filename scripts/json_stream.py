@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Record Loader
+
+Reads the records of a large JSON extract one at a time instead of
+json.load()-ing the whole document. Handles the two layouts used in data/:
+
+    [ {...}, {...}, ... ]                      # pay_CertTypes.json, pay_Operators.json
+    { "statusTracker": [ {...}, ... ] }        # pay_StatusTracker.json
+    { "certifications": [ {...}, ... ] }       # certification extracts
+
+Only one record (plus a read buffer) is held in memory at a time, so
+multi-GB extracts can be processed with a flat memory profile.
+
+Usage:
+    from json_stream import iter_records
+
+    for cert in iter_records('data/pay_Certifications.json', fields=('OperatorID', 'Cert')):
+        ...
+
+    # Wrapper key is auto-detected (first array value) or can be given explicitly
+    for event in iter_records('data/pay_StatusTracker.json', key='statusTracker'):
+        ...
+"""
+
+import json
+from typing import Dict, Iterator, Optional, Sequence
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+# Longest token prefix a cut-off value can end with ('\\u00e' of an escape, 'fals')
+_PARTIAL_TOKEN = 6
+
+
+class _Reader:
+    """Chunked text buffer with a cursor, refilled on demand."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """Read another chunk; returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file), without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found {self.peek()!r}")
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder):
+        """Decode the next complete JSON value, reading more input until it parses."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Value straddles the buffer end; read more (bigger reads for big values).
+                # An error before the end is malformed input: reading on would not fix it
+                if not self._cut_off(e) or not self.fill(size):
+                    raise
+                size = min(size * 2, 1 << 24)
+                continue
+            # A number running into the buffer end may continue in the next chunk
+            # ('12' of '123', '2' of '2.5' and '1.5' of '1.5e10' all decode on their own)
+            if isinstance(value, (int, float)) and self._runs_to_end(end) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def _cut_off(self, error: json.JSONDecodeError) -> bool:
+        """True if the decode error could come from the value running past the buffer end."""
+        # An unterminated string reports where it starts, which can be far back
+        return error.pos >= len(self.buf) - _PARTIAL_TOKEN or error.msg.startswith('Unterminated string')
+
+    def _runs_to_end(self, end: int) -> bool:
+        """True if only number characters follow `end` up to the buffer end."""
+        while end < len(self.buf) and self.buf[end] in _NUMBER_CHARS:
+            end += 1
+        return end == len(self.buf)
+
+
+def _iter_array(reader: _Reader, decoder: json.JSONDecoder) -> Iterator:
+    """Yield elements of the array whose '[' is the next token."""
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode(decoder)
+        char = reader.peek()
+        reader.pos += 1
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError(f"Expected ',' or ']' in array, found {char!r}")
+
+
+def _iter_wrapped(reader: _Reader, decoder: json.JSONDecoder, key: Optional[str]) -> Iterator:
+    """Yield elements of one array-valued key of a top-level object."""
+    reader.expect('{')
+    while reader.peek() != '}':
+        name = reader.decode(decoder)
+        reader.expect(':')
+        if reader.peek() == '[' and (key is None or name == key):
+            yield from _iter_array(reader, decoder)
+            return
+        reader.decode(decoder)  # skip this member's value
+        if reader.peek() == ',':
+            reader.pos += 1
+    if key is not None:
+        raise KeyError(f"No array under key '{key}'")
+
+
+def _project(record, fields: Optional[Sequence[str]]):
+    if fields is None or not isinstance(record, dict):
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def iter_records(file_path, key: Optional[str] = None, fields: Optional[Sequence[str]] = None,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Stream records from a JSON file.
+
+    Args:
+        file_path: JSON file whose top level is an array, or an object wrapping one
+        key: wrapper key to stream (default: first array-valued key)
+        fields: optional projection - only these keys (when present) are kept in each record
+        chunk_size: bytes read per refill
+
+    Yields:
+        One record (dict) at a time
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        first = reader.peek()
+        if first == '[':
+            records = _iter_array(reader, decoder)
+        elif first == '{':
+            records = _iter_wrapped(reader, decoder, key)
+        else:
+            raise ValueError(f"{file_path}: expected a JSON array or object, found {first!r}")
+
+        for record in records:
+            yield _project(record, fields)
+
+
+def count_records(file_path, key: Optional[str] = None) -> int:
+    """Number of records in a JSON extract, without holding them in memory."""
+    return sum(1 for _ in iter_records(file_path, key=key, fields=()))
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipe-Table Converter
+
+Converts the pipe-delimited text tables SQL clients export (header line,
+dashed separator line, one row per line):
+
+    OperatorID                          |FirstName|LastName |DivisionID|...
+    ------------------------------------+---------+---------+----------+...
+    A91D2F7D-ECF5-4892-8FB7-AA303AEDA5D0|Damious  |Eason    |7 - MI    |...
+
+into one of:
+
+    json        a JSON array (or {"<key>": [...]}) with one row per line,
+                readable by json.load() and json_stream.iter_records()
+    ndjson      one JSON object per line
+    snapshot    a one-table columnar snapshot (snapshot.py), memory-mapped on load
+
+Rows are parsed and written one at a time, so multi-GB exports convert in
+bounded memory (the snapshot keeps each column's distinct values). Shared by
+convert_operators_table_to_json.py, convert_certifications_table_to_json.py
+and convert_status_tracker_to_json.py.
+
+Usage:
+    python3 scripts/pipe_table.py external/Certificates_raw_text_table.txt data/pay_Certifications.ndjson
+    python3 scripts/pipe_table.py data/pay_StatusTracker.txt data/pay_StatusTracker.json \\
+        --wrap statusTracker --empty-as-null --complete-rows-only
+    python3 scripts/pipe_table.py data/pay_Certifications.txt generated/pay_Certifications.snap
+
+    # Library
+    from pipe_table import PipeTable, convert
+
+    for row in PipeTable('data/pay_Operators.txt'):
+        ...
+    stats = convert('data/pay_Operators.txt', 'data/pay_Operators.json')
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from snapshot import TableSnapshotWriter
+
+FORMATS = ('json', 'ndjson', 'snapshot')
+CHUNK_SIZE = 1 << 16        # characters parsed per batch (small enough to stay in CPU cache)
+PROGRESS_EVERY = 1_000_000  # rows between progress lines
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_ROW_END = '\x1e'           # marker swapped in for newlines to check row widths after one split
+# Bytes allowed in the fast path: printable ASCII and newline (no control characters, no marker)
+_FAST_BYTES = bytes(range(32, 127)) + b'\n'
+
+# A batch is either `values`: count rows * len(columns) stripped strings, row-major
+# ('' for empty values) or `rows`: dicts, for chunks with irregular lines
+Batch = namedtuple('Batch', 'count values rows')
+
+
+def format_for(path) -> str:
+    """Output format implied by a file name (.ndjson/.jsonl, .snap, else json)."""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if suffix == '.snap':
+        return 'snapshot'
+    return 'json'
+
+
+def _is_separator(stripped: str) -> bool:
+    return stripped.startswith('-') and not stripped.strip('-+| ')
+
+
+def _skip_line(stripped: str) -> bool:
+    """Blank, dashed separator and '(N rows affected)' lines carry no row."""
+    return not stripped or _is_separator(stripped) or (
+        stripped[0] == '(' and stripped.endswith('rows affected)'))
+
+
+def _json_unescape(value: str) -> str:
+    return json.loads('"' + value + '"') if '\\' in value else value
+
+
+class PipeTable:
+    """
+    Rows of a pipe-delimited export, parsed a chunk at a time.
+
+    Values are whitespace-stripped strings. Columns with an empty header are
+    dropped; a short row only gets the columns it has.
+
+    empty_as_null: '' values become None
+    complete_rows_only: skip rows whose value count differs from the header's
+
+    A chunk where every line has exactly the header's column count is split
+    in one pass over the whole chunk (batches() yields its values flat);
+    chunks with blank, separator, short or long lines are parsed line by line.
+
+    chunk_size: characters per batch (default: CHUNK_SIZE when batches() runs)
+    """
+
+    def __init__(self, path, empty_as_null: bool = False, complete_rows_only: bool = False,
+                 chunk_size: Optional[int] = None):
+        self.path = Path(path)
+        self.empty_as_null = empty_as_null
+        self.complete_rows_only = complete_rows_only
+        self.chunk_size = chunk_size
+        self.headers: List[str] = []
+        self.rows_read = 0
+        self.rows_skipped = 0
+
+    @property
+    def columns(self) -> List[str]:
+        return [header for header in self.headers if header]
+
+    def __iter__(self) -> Iterator[Dict]:
+        headers = None
+        for batch in self.batches():
+            if batch.rows is not None:
+                yield from batch.rows
+                continue
+            headers = headers or self.columns
+            width = len(headers)
+            values = batch.values
+            if self.empty_as_null:
+                values = [value or None for value in values]
+            for i in range(0, len(values), width):
+                yield dict(zip(headers, values[i:i + width]))
+
+    def batches(self, json_escape: bool = False) -> Iterator[Batch]:
+        """
+        Batch per chunk of the file. With json_escape, flat values come
+        escaped for use inside a JSON string (dict rows never are).
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                stripped = line.strip()
+                if not _skip_line(stripped):
+                    self.headers = [header.strip() for header in stripped.split('|')]
+                    break
+            else:
+                raise ValueError(f"{self.path}: no header line found")
+
+            # The dashed line under the header would send the first chunk down the slow path
+            carry = ''
+            for line in f:
+                if not _skip_line(line.strip()):
+                    carry = line
+                    break
+            chunk_size = self.chunk_size or CHUNK_SIZE
+            while True:
+                data = f.read(chunk_size)
+                text = carry + data
+                if not data:
+                    if text.strip():
+                        yield self._parse(text if text.endswith('\n') else text + '\n', json_escape)
+                    return
+                cut = text.rfind('\n') + 1
+                carry = text[cut:]
+                if cut:
+                    yield self._parse(text[:cut], json_escape)
+
+    def _parse(self, chunk: str, json_escape: bool) -> Batch:
+        values = self._split_regular(chunk, json_escape)
+        if values is not None:
+            count = len(values) // len(self.headers)
+            self.rows_read += count
+            return Batch(count, values, None)
+        rows = list(self._parse_lines(chunk))
+        return Batch(len(rows), None, rows)
+
+    def _split_regular(self, chunk: str, json_escape: bool) -> Optional[List[str]]:
+        """Stripped values of every line, or None unless each line has exactly the header's columns."""
+        width = len(self.headers)
+        if not all(self.headers):
+            return None
+        try:
+            if chunk.encode('ascii').translate(None, _FAST_BYTES):
+                return None  # control characters: leave them to the JSON encoder
+        except UnicodeEncodeError:
+            if not chunk.replace('\n', '').isprintable():
+                return None
+        if json_escape and ('"' in chunk or '\\' in chunk):
+            chunk = chunk.replace('\\', '\\\\').replace('"', '\\"')
+
+        lines = chunk.count('\n')
+        values = chunk.replace('\n', '|' + _ROW_END + '|').split('|')
+        # Every row boundary must sit exactly width values after the previous one
+        if len(values) != lines * (width + 1) + 1 or values[width::width + 1].count(_ROW_END) != lines:
+            return None
+        del values[width::width + 1]
+        values.pop()
+        values = list(map(str.strip, values))
+        # Lines _skip_line drops start blank, '-' or '('; leave chunks with any such row to _parse_lines
+        firsts = values[::width]
+        if firsts and min(firsts) < '.' and any(not first or first[0] in '-(' for first in firsts):
+            return None
+        return values
+
+    def _parse_lines(self, chunk: str) -> Iterator[Dict]:
+        headers = self.headers
+        width = len(headers)
+        all_named = all(headers)
+        keep = [i for i, header in enumerate(headers) if header]
+        strip = str.strip
+        for line in chunk.split('\n'):
+            stripped = line.strip()
+            if _skip_line(stripped):
+                continue
+            values = list(map(strip, stripped.split('|')))
+            if self.complete_rows_only and len(values) != width:
+                self.rows_skipped += 1
+                continue
+            if self.empty_as_null:
+                values = [value or None for value in values]
+            if all_named:
+                row = dict(zip(headers, values))
+            else:
+                row = {headers[i]: values[i] for i in keep if i < len(values)}
+            if row:
+                self.rows_read += 1
+                yield row
+
+
+class _JsonWriter:
+    """NDJSON, or a JSON array with one row per line; replaces output when closed."""
+
+    def __init__(self, output: Path, wrap: Optional[str], ndjson: bool, empty_as_null: bool):
+        self.output = output
+        self.tmp_path = output.with_suffix(output.suffix + '.tmp')
+        self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        self.ndjson = ndjson
+        self.wrap = wrap
+        self.empty_as_null = empty_as_null
+        self.separator = '\n' if ndjson else ',\n'
+        self.first = True
+        self.pieces = None
+        if not ndjson:
+            self.f.write('{' + _encode(wrap) + ':[\n' if wrap else '[\n')
+
+    def write(self, table: PipeTable, batch: Batch):
+        if batch.count == 0:
+            return
+        if batch.rows is not None:
+            body = self.separator.join(map(_encode, batch.rows))
+        else:
+            if self.pieces is None:
+                # The text before each value: '"}<separator>{"Col1":"', '","Col2":"', ...
+                keys = [_encode(column) for column in table.columns]
+                self.row_start = '{' + keys[0] + ':"'
+                self.pieces = ['"}' + self.separator + self.row_start] + ['","' + key[1:] + ':"' for key in keys[1:]]
+            # Interleave pieces and (already escaped) values, then one join for the whole batch
+            parts = [None] * (2 * len(batch.values))
+            parts[0::2] = self.pieces * batch.count
+            parts[1::2] = batch.values
+            parts[0] = self.row_start
+            parts.append('"}')
+            body = ''.join(parts)
+            if self.empty_as_null:
+                body = body.replace(':"",', ':null,').replace(':""}', ':null}')
+        self.f.write(body + '\n' if self.ndjson else ('' if self.first else ',\n') + body)
+        self.first = False
+
+    def close(self):
+        if not self.ndjson:
+            self.f.write('\n]}\n' if self.wrap else '\n]\n')
+        self.f.close()
+        os.replace(self.tmp_path, self.output)
+
+
+def _count(counts: Dict[str, Counter], table: PipeTable, batch: Batch):
+    if batch.rows is not None:
+        for column, counter in counts.items():
+            counter.update(row.get(column) for row in batch.rows if column in row)
+        return
+    columns = table.columns
+    for column, counter in counts.items():
+        if column in columns:
+            counter.update(batch.values[columns.index(column)::len(columns)])
+
+
+def _finish_counts(counts: Dict[str, Counter], escaped: bool, empty_as_null: bool) -> Dict[str, Counter]:
+    """Undo JSON escaping in counted flat values and apply empty_as_null to them."""
+    finished = {}
+    for column, counter in counts.items():
+        result = Counter()
+        for value, count in counter.items():
+            if isinstance(value, str):
+                value = _json_unescape(value) if escaped else value
+                value = None if empty_as_null and value == '' else value
+            result[value] += count
+        finished[column] = result
+    return finished
+
+
+def convert(input_path, output_path, fmt: Optional[str] = None, wrap: Optional[str] = None,
+            empty_as_null: bool = False, complete_rows_only: bool = False, table_name: Optional[str] = None,
+            count_columns: Sequence[str] = (), progress: bool = True) -> Dict:
+    """
+    Convert a pipe-delimited export in one pass; returns
+    {'rows', 'skipped', 'columns', 'sample', 'counts', 'seconds', 'rows_per_sec', 'bytes_in', 'bytes_out'}.
+
+    fmt: json / ndjson / snapshot (default: from the output file name)
+    wrap: for json, write {"<wrap>": [...]} instead of a bare array
+    count_columns: value counts (Counter) per column, gathered on the way through
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    fmt = fmt or format_for(output_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = PipeTable(input_path, empty_as_null=empty_as_null, complete_rows_only=complete_rows_only)
+    escaped = fmt != 'snapshot'
+    counts = {column: Counter() for column in count_columns}
+    sample = None
+    start = time.perf_counter()
+    next_report = PROGRESS_EVERY
+    writer = None
+
+    def open_writer():
+        if fmt == 'snapshot':
+            return TableSnapshotWriter(table_name or input_path.stem, output_path, source=input_path)
+        return _JsonWriter(output_path, wrap, fmt == 'ndjson', empty_as_null)
+
+    for batch in table.batches(json_escape=escaped):
+        writer = writer or open_writer()
+        if sample is None and batch.count:
+            sample = batch.rows[0] if batch.rows is not None else {
+                column: None if empty_as_null and value == '' else (_json_unescape(value) if escaped else value)
+                for column, value in zip(table.columns, batch.values)}
+        _count(counts, table, batch)
+
+        if fmt == 'snapshot':
+            if batch.rows is not None:
+                for row in batch.rows:
+                    writer.add_row(row)
+            elif batch.count:
+                columns = table.columns
+                width = len(columns)
+                writer.add_columns({
+                    column: [value or None for value in batch.values[i::width]] if empty_as_null
+                    else batch.values[i::width]
+                    for i, column in enumerate(columns)})
+        else:
+            writer.write(table, batch)
+
+        if progress and table.rows_read >= next_report:
+            elapsed = time.perf_counter() - start
+            print(f"   … {table.rows_read:,} rows ({table.rows_read / elapsed:,.0f} rows/sec)", flush=True)
+            next_report += PROGRESS_EVERY
+
+    writer = writer or open_writer()   # header only, no rows
+    if fmt == 'snapshot':
+        writer.finish()
+    else:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': table.rows_read,
+        'skipped': table.rows_skipped,
+        'columns': table.columns,
+        'sample': sample,
+        'counts': _finish_counts(counts, escaped, empty_as_null),
+        'seconds': elapsed,
+        'rows_per_sec': table.rows_read / elapsed if elapsed else 0.0,
+        'bytes_in': input_path.stat().st_size,
+        'bytes_out': output_path.stat().st_size
+    }
+
+
+def print_stats(stats: Dict, output_path):
+    print(f"   ✓ {stats['rows']:,} rows, {len(stats['columns'])} columns in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec)")
+    if stats['skipped']:
+        print(f"   ⚠️  {stats['skipped']:,} rows skipped (column count differs from the header)")
+    print(f"   ✓ {stats['bytes_in']:,} bytes -> {stats['bytes_out']:,} bytes: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a pipe-delimited table export, streaming')
+    parser.add_argument('input', type=Path)
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--format', choices=FORMATS, default=None,
+                        help='default: from the output name (.ndjson/.jsonl, .snap, else json)')
+    parser.add_argument('--wrap', default=None, help='json: wrap rows as {"<key>": [...]}')
+    parser.add_argument('--empty-as-null', action='store_true', help="write '' values as null")
+    parser.add_argument('--complete-rows-only', action='store_true',
+                        help='skip rows whose column count differs from the header')
+    parser.add_argument('--table', default=None, help='snapshot table name (default: input file name)')
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"❌ ERROR: Input file not found: {args.input}")
+        return 1
+    fmt = args.format or format_for(args.output)
+    print(f"🔄 Converting {args.input} -> {args.output} ({fmt})")
+    stats = convert(args.input, args.output, fmt, wrap=args.wrap, empty_as_null=args.empty_as_null,
+                    complete_rows_only=args.complete_rows_only, table_name=args.table)
+    print_stats(stats, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
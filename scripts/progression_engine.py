@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Vectorized Status Progression Engine
+
+Loads pay_StatusTracker events into parallel NumPy arrays (operator codes,
+status codes, division codes and int64 microsecond timestamps), sorts them
+once by (operator, date) and computes every stage's dwell time with one
+vectorized diff. Status names and orders are looked up through arrays
+indexed by status code instead of scanning the status types per event.
+
+Produces the same journeys, bottlenecks and division comparison as
+analyze_operator_journey(), identify_bottlenecks() and
+analyze_division_differences() in analyze_status_progression.py, which
+falls back to those when NumPy is not installed. Percentiles here are
+exact; the fallback's streaming sketches match them until a group passes
+quantile_sketch.DEFAULT_K values, then stay within ~1% in rank.
+
+Usage:
+    from progression_engine import ProgressionEngine, StatusEvents
+
+    events = StatusEvents.load('data/pay_StatusTracker.json')
+    engine = ProgressionEngine(events, status_types)
+    engine.bottlenecks()
+    engine.division_comparison()
+    engine.journeys()
+"""
+
+import gc
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np  # optional: pip install numpy
+
+from date_parser import NO_TIME, epoch_microseconds
+from json_stream import iter_records
+from quantile_sketch import PERCENTILES
+
+EVENT_FIELDS = ('OperatorID', 'StatusID', 'Date', 'DivisionID', 'RecordBy')
+DAY_US = 86_400_000_000
+
+
+def group_percentiles(values, groups, counts, fractions: Sequence[float] = PERCENTILES):
+    """
+    Exact percentiles of `values` per group code (0..len(counts)-1), picked by
+    the same rank rule as KLLSketch.quantiles(), plus each group's min and max.
+    Returns (percentiles: one array per fraction, mins, maxes).
+    """
+    ordered = values[np.lexsort((values, groups))]
+    offsets = np.cumsum(counts) - counts    # empty counts: empty offsets, not [0]
+    percentiles = [ordered[offsets + np.maximum(np.ceil(fraction * counts).astype(np.int64) - 1, 0)]
+                   for fraction in fractions]
+    return percentiles, ordered[offsets], ordered[offsets + counts - 1]
+
+
+def _status_order(status_type: Dict) -> int:
+    order = status_type.get('OrderID', '')
+    return int(order) if order and order.isdigit() else 999
+
+
+class StatusEvents:
+    """pay_StatusTracker events as parallel arrays, in file order"""
+
+    __slots__ = ('operators', 'statuses', 'divisions', 'recorders',
+                 'operator', 'status', 'division', 'recorder', 'time', 'dates')
+
+    def __init__(self, operators, statuses, divisions, recorders,
+                 operator, status, division, recorder, time, dates):
+        self.operators = operators      # code -> OperatorID (codes in order of first appearance)
+        self.statuses = statuses        # code -> StatusID
+        self.divisions = divisions      # code -> DivisionID
+        self.recorders = recorders      # code -> RecordBy
+        self.operator = operator        # int32 code per event
+        self.status = status
+        self.division = division
+        self.recorder = recorder
+        self.time = time                # int64 microseconds per event
+        self.dates = dates              # original Date strings
+
+    def __len__(self):
+        return len(self.dates)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'StatusEvents':
+        operators, statuses, divisions, recorders = {}, {}, {}, {}
+        operator, status, division, recorder, dates = [], [], [], [], []
+        for record in records:
+            operator.append(operators.setdefault(record['OperatorID'], len(operators)))
+            status.append(statuses.setdefault(record['StatusID'], len(statuses)))
+            division.append(divisions.setdefault(record.get('DivisionID'), len(divisions)))
+            recorder.append(recorders.setdefault(record.get('RecordBy'), len(recorders)))
+            dates.append(record.get('Date'))
+
+        def codes(values):
+            return np.array(values, dtype=np.int32)
+
+        return cls(list(operators), list(statuses), list(divisions), list(recorders),
+                   codes(operator), codes(status), codes(division), codes(recorder),
+                   epoch_microseconds(dates), dates)
+
+    @classmethod
+    def load(cls, path) -> 'StatusEvents':
+        """Stream a pay_StatusTracker JSON file ({"statusTracker": [...]} or a bare array)"""
+        return cls.from_records(iter_records(path, fields=EVENT_FIELDS))
+
+
+class ProgressionEngine:
+    """
+    Operator journeys over StatusEvents. Events are sorted by (operator code,
+    date, file order), which is the order analyze_status_progression.py walks
+    them in: operators in order of first appearance, each one's events sorted
+    by date with undated events first.
+    """
+
+    def __init__(self, events: StatusEvents, status_types: List[Dict], now: Optional[datetime] = None):
+        self.events = events
+
+        by_id, order_by_name = {}, {}
+        for status_type in status_types:
+            by_id.setdefault(status_type['Id'], status_type)
+            order_by_name.setdefault(status_type['Status'], _status_order(status_type))
+
+        # Status code -> name code / order; names are shared by several status IDs
+        name_codes = {}
+        status_name, status_order = [], []
+        for status_id in events.statuses:
+            status_type = by_id.get(status_id)
+            name = status_type['Status'] if status_type else status_id
+            status_name.append(name_codes.setdefault(name, len(name_codes)))
+            status_order.append(_status_order(status_type) if status_type else 999)
+        self.names = list(name_codes)
+        self.name_order = [order_by_name.get(name, 999) for name in self.names]
+        self.status_order = np.array(status_order, dtype=np.int32)
+
+        count = len(events)
+        self.sort = np.lexsort((np.arange(count), events.time, events.operator))
+        self.operator = events.operator[self.sort]
+        self.status = events.status[self.sort]
+        self.name = np.array(status_name, dtype=np.int32)[self.status] if count else np.zeros(0, np.int32)
+        self.time = events.time[self.sort]
+
+        # One stage per event: it lasts until the operator's next event, the last one until now
+        self.is_last = np.ones(count, dtype=bool)
+        self.is_last[:-1] = self.operator[1:] != self.operator[:-1]
+        self.starts = np.flatnonzero(np.concatenate(([True], self.is_last[:-1]))) if count else np.zeros(0, np.intp)
+        self.now_us = int(np.datetime64(now or datetime.now(), 'us').astype(np.int64))
+        end = np.empty_like(self.time)
+        end[:-1] = self.time[1:]
+        end[self.is_last] = self.now_us
+        dated = (self.time != NO_TIME) & (end != NO_TIME)
+        self.days = np.zeros(count, dtype=np.int64)
+        self.days[dated] = (end[dated] - self.time[dated]) // DAY_US
+
+    def journeys(self) -> List[Dict]:
+        """Same shape as analyze_operator_journey(), one per operator"""
+        events = self.events
+        if not len(events):
+            return []
+        # A stage ends at the next event's date, formatted like datetime.strftime('%Y-%m-%d %H:%M:%S.%f')
+        end_text = np.datetime_as_string(self.time.view('datetime64[us]'), unit='us')
+        dated = self.time != NO_TIME
+        end_text.view(np.uint32).reshape(len(end_text), -1)[dated, 10] = ord(' ')
+        end_text[~dated] = ''
+        end_dates = end_text[1:].tolist() + ['']
+        end_dates = ['Current' if last else (text or None)
+                     for text, last in zip(end_dates, self.is_last.tolist())]
+        names = [self.names[code] for code in self.name.tolist()]
+
+        columns = (
+            names,
+            [events.statuses[code] for code in self.status.tolist()],
+            self.status_order[self.status].tolist(),
+            [events.dates[i] for i in self.sort.tolist()],
+            end_dates,
+            self.days.tolist(),
+            [events.recorders[code] for code in events.recorder[self.sort].tolist()],
+        )
+        starts = self.starts.tolist()
+        bounds = starts + [len(names)]
+        operators = events.operator[self.sort][self.starts].tolist()
+        divisions = events.division[self.sort][self.starts].tolist()
+        totals = np.add.reduceat(self.days, self.starts).tolist()
+
+        # Millions of small dicts: skip the cyclic GC passes their allocation would trigger
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            stages = [{
+                'status': status,
+                'status_id': status_id,
+                'order': order,
+                'start_date': start_date,
+                'end_date': end_date,
+                'days_in_status': days,
+                'recorded_by': recorded_by
+            } for status, status_id, order, start_date, end_date, days, recorded_by in zip(*columns)]
+            return [{
+                'operator_id': events.operators[operator],
+                'division': events.divisions[division],
+                'stages': stages[lo:hi],
+                'total_days': total,
+                'current_status': names[hi - 1]
+            } for operator, division, total, lo, hi in zip(operators, divisions, totals, bounds, bounds[1:])]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def bottlenecks(self) -> List[Dict]:
+        """Same as identify_bottlenecks(): per status name, sorted by average days"""
+        if not len(self.days):
+            return []
+        names, first_seen, inverse = np.unique(self.name, return_index=True, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=self.days)
+        (p50, p90, p99), mins, maxes = group_percentiles(self.days, inverse, counts)
+
+        bottlenecks = []
+        for k in np.argsort(first_seen).tolist():
+            name = self.names[names[k]]
+            bottlenecks.append({
+                'status': name,
+                'order': self.name_order[names[k]],
+                'avg_days': round(float(sums[k] / counts[k]), 1),
+                'max_days': int(maxes[k]),
+                'min_days': int(mins[k]),
+                'p50_days': int(p50[k]),
+                'p90_days': int(p90[k]),
+                'p99_days': int(p99[k]),
+                'operator_count': int(counts[k]),
+                'total_transitions': int(counts[k])
+            })
+        bottlenecks.sort(key=lambda x: x['avg_days'], reverse=True)
+        return bottlenecks
+
+    def division_comparison(self) -> List[Dict]:
+        """Same as analyze_division_differences(): divisions sorted by average journey days"""
+        events = self.events
+        if not len(self.days):
+            return []
+        # A journey's division is its first event's division
+        journey_division = events.division[self.sort][self.starts]
+        journey_days = np.add.reduceat(self.days, self.starts)
+        journey_stages = np.diff(np.append(self.starts, len(self.days)))
+        kept = np.array([bool(d) for d in events.divisions])[journey_division]
+        if not kept.any():
+            return []   # no journey has a division
+
+        divisions, first_seen, inverse = np.unique(journey_division[kept], return_index=True, return_inverse=True)
+        operator_counts = np.bincount(inverse)
+        total_days = np.bincount(inverse, weights=journey_days[kept])
+        total_stages = np.bincount(inverse, weights=journey_stages[kept])
+
+        # Per (division, status name) dwell totals, in order of first appearance
+        stage_kept = np.repeat(kept, journey_stages)
+        stage_division = np.repeat(journey_division, journey_stages)[stage_kept]
+        keys = stage_division.astype(np.int64) * len(self.names) + self.name[stage_kept]
+        pairs, pair_first, pair_inverse = np.unique(keys, return_index=True, return_inverse=True)
+        pair_counts = np.bincount(pair_inverse)
+        pair_days = np.bincount(pair_inverse, weights=self.days[stage_kept])
+        (p50, p90, p99), _, _ = group_percentiles(self.days[stage_kept], pair_inverse, pair_counts)
+        status_times = {}
+        for k in np.argsort(pair_first).tolist():
+            division, name = divmod(int(pairs[k]), len(self.names))
+            percentiles = {'p50_days': int(p50[k]), 'p90_days': int(p90[k]), 'p99_days': int(p99[k])}
+            status_times.setdefault(division, []).append(
+                (self.names[name], float(pair_days[k] / pair_counts[k]), percentiles))
+
+        division_comparison = []
+        for k in np.argsort(first_seen).tolist():
+            division = int(divisions[k])
+            comparison = {
+                'division': events.divisions[division],
+                'operator_count': int(operator_counts[k]),
+                'avg_total_journey_days': round(float(total_days[k] / operator_counts[k]), 1),
+                'avg_stages_count': round(float(total_stages[k] / operator_counts[k]), 1),
+                'slowest_status': None,
+                'slowest_status_avg_days': 0,
+                'status_percentiles': {}
+            }
+            for status, avg_time, percentiles in status_times.get(division, []):
+                comparison['status_percentiles'][status] = percentiles
+                if avg_time > comparison['slowest_status_avg_days']:
+                    comparison['slowest_status'] = status
+                    comparison['slowest_status_avg_days'] = round(avg_time, 1)
+            division_comparison.append(comparison)
+
+        division_comparison.sort(key=lambda x: x['avg_total_journey_days'], reverse=True)
+        return division_comparison
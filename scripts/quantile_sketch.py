@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Mergeable Streaming Quantile Sketch (KLL)
+
+A KLL sketch (Karnin, Lang, Liberty 2016) keeps a stack of compactors:
+level h holds items that each stand for 2^h of the values seen. When a
+level fills up it is sorted and every other item is promoted to the level
+above, so a sketch of n values holds O(k log(n/k)) items while quantile
+ranks stay within about 1.7/k of exact (k=200: ~1%). Below k values
+nothing is compacted and quantiles are exact.
+
+Sketches merge by concatenating levels and compacting, so per-day sketches
+can be combined into any window. Compaction offsets alternate per level
+instead of being random, so the same values in the same order always give
+the same sketch (and the same report). Count, sum, min and max are kept
+exactly alongside.
+
+Usage:
+    from quantile_sketch import KLLSketch
+
+    sketch = KLLSketch()
+    for days in dwell_times:
+        sketch.update(days)
+    p50, p90, p99 = sketch.quantiles((0.5, 0.9, 0.99))
+    merged = KLLSketch.merged([monday, tuesday])
+    KLLSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_K = 200             # top-level capacity: rank error ~1.7/k
+MIN_CAPACITY = 2            # lower levels shrink by 2/3 per level, down to this
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+@lru_cache(maxsize=None)
+def _level_capacities(k: int, height: int) -> Tuple[Tuple[int, ...], int]:
+    """Per-level capacities for a sketch `height` levels tall, and their sum"""
+    capacities = tuple(max(MIN_CAPACITY, int(math.ceil(k * (2 / 3) ** (height - h - 1)))) for h in range(height))
+    return capacities, sum(capacities)
+
+
+class KLLSketch:
+    """Quantiles of a stream of numbers in bounded memory"""
+
+    __slots__ = ('k', 'n', 'total', 'min', 'max', 'levels', 'offsets', '_size', '_capacities', '_max_size')
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.levels: List[List] = [[]]
+        self.offsets: List[int] = [0]   # next compaction offset (0/1) per level
+        self._size = 0                  # items held, across levels
+        self._set_capacities()
+
+    def __len__(self):
+        return self.n
+
+    def _set_capacities(self):
+        self._capacities, self._max_size = _level_capacities(self.k, len(self.levels))
+
+    def _add_level(self):
+        self.levels.append([])
+        self.offsets.append(0)
+        self._set_capacities()
+
+    def update(self, value):
+        """Add one value"""
+        self.n += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.levels[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values: Iterable):
+        for value in values:
+            self.update(value)
+
+    def _compress(self):
+        """Compact full levels (lowest first) until the sketch is back under capacity"""
+        while self._size >= self._max_size:
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacities[h]:
+                    break
+            if h + 1 == len(self.levels):
+                self._add_level()
+            level.sort()
+            # An odd item out stays at this level; pairs promote one of each
+            kept = [level.pop()] if len(level) % 2 else []
+            offset = self.offsets[h]
+            self.offsets[h] = 1 - offset
+            promoted = level[offset::2]
+            self.levels[h + 1].extend(promoted)
+            self.levels[h] = kept
+            self._size -= len(level) - len(promoted)
+
+    def _absorb(self, other: 'KLLSketch'):
+        """Take over another sketch's items and totals, without compacting"""
+        if not other.n:
+            return
+        while len(self.levels) < len(other.levels):
+            self._add_level()
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self._size += other._size
+        self.n += other.n
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold another sketch into this one (in place) and return self"""
+        self._absorb(other)
+        self._compress()
+        return self
+
+    @classmethod
+    def merged(cls, sketches: Iterable['KLLSketch'], k: int = DEFAULT_K) -> 'KLLSketch':
+        """One sketch of many (e.g. a window of daily sketches), compacted once at the end"""
+        result = cls(k)
+        for sketch in sketches:
+            result._absorb(sketch)
+        result._compress()
+        return result
+
+    def quantiles(self, fractions: Sequence[float] = PERCENTILES) -> List[Optional[float]]:
+        """
+        Smallest value whose rank reaches fraction * n, per fraction (None when
+        empty). Exact while fewer than k values have been added.
+        """
+        if not self.n:
+            return [None] * len(fractions)
+        items = sorted((value, 1 << h) for h, level in enumerate(self.levels) for value in level)
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+            target = fraction * self.n
+            rank = 0
+            for value, weight in items:
+                rank += weight
+                if rank >= target:
+                    break
+            results.append(value)
+        return results
+
+    def quantile(self, fraction: float):
+        return self.quantiles((fraction,))[0]
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.n if self.n else None
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'n': self.n, 'total': self.total, 'min': self.min, 'max': self.max,
+                'levels': self.levels, 'offsets': self.offsets}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'KLLSketch':
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.levels = [list(level) for level in data['levels']]
+        sketch.offsets = list(data['offsets'])
+        sketch._size = sum(len(level) for level in sketch.levels)
+        sketch._set_capacities()
+        return sketch
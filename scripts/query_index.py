@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Warm Query Index for the Lifecycle Server
+
+Loads the pay_* tables, pizza status requirements and aliases once and
+keeps the answers to the common compliance questions in memory:
+
+    - operator ID -> gap entry (missing / has / required certs)
+    - (STATUS, DivisionID) -> roster of operators, longest in status first
+    - DivisionID -> compliance summary and status headcounts
+
+Gap entries use the same pizza status requirement logic as
+reports/generate_compliance_gap_report.py. IndexReloader rebuilds the index
+in the background when any file in data/ (or the alias file) changes and
+swaps it in whole, so readers never see a half-built index.
+
+Usage:
+    from query_index import IndexReloader
+
+    reloader = IndexReloader(base_path).start()
+    reloader.index.operator_gaps('87E4B7EB-C319-4D54-9A0D-011FB8654F46')
+    reloader.index.roster('DOT SCREENING', '12 - PA')
+"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent / 'reports'))
+
+from alias_resolver import AliasResolver
+from generate_compliance_gap_report import (LookupContext, build_operator_cert_map, generate_gap_report,
+                                            load_certifications, load_json_data)
+from records import Operator, StatusType
+from snapshot import load_table_records
+
+BASE_PATH = Path(__file__).parent.parent
+
+
+def roster_key(status: str, division: Optional[str] = None):
+    """Roster lookup key: status upper-cased and trimmed, division trimmed."""
+    return ((status or '').strip().upper(), (division or '').strip() or None)
+
+
+class QueryIndex:
+    """Operator, roster and division lookups built from one load of the data."""
+
+    def __init__(self, operators: List[Dict], certifications, status_types: List[Dict],
+                 pizza_reqs: Dict, aliases):
+        self.built_at = time.time()
+        context = LookupContext(status_types, pizza_reqs, aliases)
+        operator_certs = build_operator_cert_map(certifications, operators)
+
+        self.gaps: Dict[str, Dict] = {}
+        self.report = generate_gap_report(operator_certs, status_types, pizza_reqs, aliases, context, self.gaps)
+        self.operators = {op.get('ID'): op for op in operators}
+
+        self.rosters = defaultdict(list)
+        self.division_statuses = defaultdict(lambda: defaultdict(int))
+        for operator_id, gap in self.gaps.items():
+            entry = self._roster_entry(gap)
+            self.rosters[roster_key(gap['status'], gap['division'])].append(entry)
+            self.rosters[roster_key(gap['status'])].append(entry)
+            self.division_statuses[gap['division']][gap['status']] += 1
+
+        # Longest time at the current status first; operators with no date last
+        for roster in self.rosters.values():
+            roster.sort(key=lambda entry: (not entry['last_status_date'], entry['last_status_date'] or ''))
+
+    def _roster_entry(self, gap: Dict) -> Dict:
+        operator = self.operators.get(gap['operator_id'])
+        required = len(gap['required_certs'])
+        return {
+            'operator_id': gap['operator_id'],
+            'name': f"{gap['first_name'] or ''} {gap['last_name'] or ''}".strip(),
+            'status': gap['status'],
+            'division': gap['division'],
+            'last_status_date': operator.get('LastStatusDate') if operator else None,
+            'missing_count': len(gap['missing_certs']),
+            'progress': f"{required - len(gap['missing_certs'])}/{required}" if required else 'No requirements'
+        }
+
+    @classmethod
+    def load(cls, base_path: Path = BASE_PATH) -> 'QueryIndex':
+        """Build an index from data/ and config/ under base_path."""
+        data_dir = Path(base_path) / 'data'
+        cert_file = data_dir / 'pay_Certifications.json'
+        # Without a certification extract every operator is listed with no certs held
+        certifications = load_certifications(cert_file) if cert_file.exists() else {}
+        return cls(
+            operators=load_table_records('pay_Operators', Operator, data_dir),
+            certifications=certifications,
+            status_types=load_table_records('pay_StatusTypes', StatusType, data_dir),
+            pizza_reqs=load_json_data(data_dir / 'pay_PizzaStatusRequirements.json'),
+            aliases=AliasResolver.from_file(Path(base_path) / 'config' / 'certification_aliases.json')
+        )
+
+    def operator_gaps(self, operator_id: str) -> Optional[Dict]:
+        """Gap entry for one operator, or None if unknown / in an excluded division."""
+        return self.gaps.get(operator_id)
+
+    def roster(self, status: str, division: Optional[str] = None) -> List[Dict]:
+        """Operators currently at a status (optionally in one division)."""
+        return self.rosters.get(roster_key(status, division), [])
+
+    def division_summary(self, division: str) -> Optional[Dict]:
+        """Compliance counters, top missing certs and status headcounts for a division."""
+        bucket = self.report['by_division'].get(division)
+        if bucket is None:
+            return None
+        top_missing = sorted(bucket['missing_cert_counts'].items(), key=lambda x: -x[1])[:10]
+        return {
+            'division': division,
+            'total_operators': bucket['total_operators'],
+            'compliant': bucket['compliant'],
+            'non_compliant': bucket['non_compliant'],
+            'compliance_rate': round(bucket['compliant'] / bucket['total_operators'] * 100, 1),
+            'top_missing_certs': [{'cert': cert, 'operators': count} for cert, count in top_missing],
+            'status_counts': dict(sorted(self.division_statuses[division].items()))
+        }
+
+    def divisions(self) -> List[Dict]:
+        """Summary of every division, sorted by DivisionID."""
+        return [self.division_summary(division) for division in sorted(self.report['by_division'])]
+
+    def stats(self) -> Dict:
+        return {
+            'built_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.built_at)),
+            'operators': len(self.gaps),
+            'divisions': len(self.report['by_division']),
+            'summary': self.report['summary']
+        }
+
+
+class IndexReloader:
+    """Holds the current QueryIndex and rebuilds it when data/ changes."""
+
+    def __init__(self, base_path: Path = BASE_PATH, interval: float = 2.0):
+        self.base_path = Path(base_path)
+        self.interval = interval
+        self._fingerprint = self._current_fingerprint()
+        self.index = QueryIndex.load(self.base_path)
+
+    def _watched_files(self) -> List[Path]:
+        data_files = sorted((self.base_path / 'data').glob('*.json'))
+        return data_files + [self.base_path / 'config' / 'certification_aliases.json']
+
+    def _current_fingerprint(self):
+        fingerprint = []
+        for path in self._watched_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            fingerprint.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def check(self) -> bool:
+        """Rebuild if any watched file changed; returns True if the index was replaced."""
+        fingerprint = self._current_fingerprint()
+        if fingerprint == self._fingerprint:
+            return False
+        try:
+            index = QueryIndex.load(self.base_path)
+        except Exception as e:
+            # Mid-write or bad JSON: keep serving the old index and retry next poll
+            print(f"⚠️  Index reload failed, keeping previous index: {e}")
+            return False
+        self.index = index
+        self._fingerprint = fingerprint
+        print(f"🔄 Query index reloaded ({len(index.gaps)} operators)")
+        return True
+
+    def start(self) -> 'IndexReloader':
+        """Poll for changes on a daemon thread."""
+        def poll():
+            while True:
+                time.sleep(self.interval)
+                self.check()
+
+        threading.Thread(target=poll, name='index-reloader', daemon=True).start()
+        return self
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Compact Record Classes for the pay_* Tables
+
+Slotted record types used by the report loaders instead of holding every
+row as a 20-70 key dict:
+
+    Operator, StatusType, CertType, Certification, StatusTrackerEvent
+
+Each class keeps only the columns the scripts use (slot names are the
+source column names), interns repeated strings (DivisionID, status names,
+status/type/operator GUIDs, cert names) so equal values share one object,
+and parses '1'/'0', 'true'/'false' and JSON booleans once at load time.
+
+Records keep a dict-style get(key, default) so the existing helpers that do
+row.get('DivisionID', 'Unknown') work unchanged on either form.
+
+See docs/technical/DATA_SCHEMA.md ("In-Memory Records") for the measured
+memory comparison against plain dicts
+(scripts/benchmarks/benchmark_record_memory.py).
+
+Usage:
+    from records import Certification, load_records
+
+    certs = load_records(rows, Certification)
+    certs[0].isApproved      # True / False, parsed once
+    certs[0].get('Cert')     # dict-style access
+"""
+
+import sys
+from typing import Dict, Iterable, List, Type
+
+_ABSENT = object()
+
+
+def parse_bool(value) -> bool:
+    """True for True / 1 / '1' / 'true' (any case, padded), False otherwise."""
+    if value is True or value is False:
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in ('1', 'true')
+
+
+class Record:
+    """Base for slotted records built from source rows."""
+
+    __slots__ = ()
+
+    # Subclasses: columns kept, which of them are booleans / interned strings
+    FIELDS: tuple = ()
+    BOOL_FIELDS: frozenset = frozenset()
+    INTERN_FIELDS: frozenset = frozenset()
+
+    @classmethod
+    def from_dict(cls, row: Dict) -> 'Record':
+        """Build a record from a source row (extra columns are dropped)."""
+        record = cls.__new__(cls)
+        for field in cls.FIELDS:
+            if field not in row:
+                continue  # left unset so get() falls back to its default, like a dict
+            value = row[field]
+            if field in cls.BOOL_FIELDS:
+                value = parse_bool(value)
+            elif field in cls.INTERN_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(record, field, value)
+        return record
+
+    def get(self, key: str, default=None):
+        """Dict-style access by source column name."""
+        return getattr(self, key, default) if key in self.FIELDS else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def keys(self) -> List[str]:
+        return [field for field in self.FIELDS if field in self]
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.keys()}
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{k}={v!r}" for k, v in list(self.to_dict().items())[:4])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+def _record_class(name: str, fields: tuple, bool_fields=(), intern_fields=(), doc: str = ''):
+    """Define a Record subclass with __slots__ matching its fields."""
+    return type(name, (Record,), {
+        '__slots__': fields,
+        '__doc__': doc,
+        'FIELDS': fields,
+        'BOOL_FIELDS': frozenset(bool_fields),
+        'INTERN_FIELDS': frozenset(intern_fields),
+    })
+
+
+Operator = _record_class(
+    'Operator',
+    ('ID', 'FirstName', 'LastName', 'Email', 'DivisionID', 'Status', 'StatusID',
+     'StatusName', 'CurrentStatus', 'OrderID', 'StartDate', 'LastStatusDate',
+     'DateCreated', 'isDeleted', 'RecordAt', 'UpdateAt'),
+    bool_fields=('isDeleted',),
+    intern_fields=('DivisionID', 'Status', 'StatusID', 'StatusName', 'CurrentStatus', 'OrderID'),
+    doc='Row of pay_Operators.'
+)
+
+StatusType = _record_class(
+    'StatusType',
+    ('Id', 'Status', 'Description', 'OrderID', 'DivisionID', 'Fleet', 'CertFlag',
+     'Providers', 'OutOfServiceFlag', 'isTracked', 'isHireEvent', 'isTermEvent',
+     'isDeleted', 'PizzaStatusID'),
+    bool_fields=('Fleet', 'CertFlag', 'Providers', 'OutOfServiceFlag', 'isTracked',
+                 'isHireEvent', 'isTermEvent', 'isDeleted'),
+    intern_fields=('Status', 'Description', 'OrderID', 'DivisionID', 'PizzaStatusID'),
+    doc='Row of pay_StatusTypes.'
+)
+
+CertType = _record_class(
+    'CertType',
+    ('ID', 'Certification', 'DivisionID', 'PizzaStatusID', 'isFleet', 'isProvider',
+     'isRequired', 'isDeleted', 'isExpiration', 'isTraining', 'isAttachment', 'isEsign',
+     'addDays'),
+    bool_fields=('isFleet', 'isProvider', 'isRequired', 'isDeleted', 'isExpiration',
+                 'isTraining', 'isAttachment', 'isEsign'),
+    intern_fields=('Certification', 'DivisionID', 'PizzaStatusID', 'addDays'),
+    doc='Row of pay_CertTypes.'
+)
+
+Certification = _record_class(
+    'Certification',
+    ('ID', 'OperatorID', 'FirstName', 'LastName', 'Email', 'DivisionID', 'StatusID',
+     'StatusName', 'OrderID', 'CertificationID', 'CertTypeID', 'Cert', 'Date',
+     'CompletionDate', 'ApprovedDate', 'isApproved', 'IsDeleted', 'RecordAt', 'UpdateAt'),
+    bool_fields=('isApproved', 'IsDeleted'),
+    intern_fields=('ID', 'OperatorID', 'FirstName', 'LastName', 'Email', 'DivisionID',
+                   'StatusID', 'StatusName', 'OrderID', 'CertTypeID', 'Cert'),
+    doc='Row of a certification extract (operator columns joined to pay_Certifications).'
+)
+
+StatusTrackerEvent = _record_class(
+    'StatusTrackerEvent',
+    ('ID', 'StatusID', 'OperatorID', 'Date', 'RecordAt', 'RecordBy', 'UpdateAt',
+     'DivisionID', 'SequenceID'),
+    intern_fields=('StatusID', 'OperatorID', 'RecordBy', 'DivisionID'),
+    doc='Row of pay_StatusTracker.'
+)
+
+
+def load_records(rows: Iterable[Dict], record_class: Type[Record]) -> List[Record]:
+    """Convert source rows (e.g. from json_stream.iter_records) into records."""
+    from_dict = record_class.from_dict
+    return [from_dict(row) for row in rows]
@@ -5,31 +5,73 @@ Generate Compliance Gap Report based on Pizza Status Requirements.
 This script uses pay_PizzaStatusRequirements.json which maps pizza statuses
 to required certifications. The pizza status grouping provides more consistent
 and accurate requirements across divisions.
+
+Every run also saves each operator's gap entry to
+generated/compliance_gap_state.json. With --incremental, only operators
+whose entry in the operator cert map differs from the saved one (added,
+dropped, or a different cert set, status, division or name) are recomputed,
+and the previous report's summary, by_status and by_division counters are
+patched in place. A gap entry depends on nothing else, so this diff is
+authoritative and no RecordAt/UpdateAt watermarks are kept: a row stamped
+since the last run that leaves the map unchanged cannot change a gap.
+Changes to the requirements, status types or alias files fall back to a
+full rebuild.
+
+A full rebuild can be split across processes with --workers N: operators are
+sharded by DivisionID and the shard counters merged in serial order, so the
+JSON output is byte-identical to the single-process run.
+
+Usage:
+    python3 scripts/reports/generate_compliance_gap_report.py [--incremental] [--workers N]
 """
 
+import argparse
+import hashlib
 import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
+
+# Ensure we can import shared modules from the scripts folder
+sys.path.append(str(Path(__file__).parent.parent))
+
+from alias_resolver import AliasResolver
+from records import Certification, Operator, StatusType, load_records, parse_bool
+from snapshot import load_table_records
 
 # Divisions to exclude from analysis
 EXCLUDED_DIVS = ['PA - BROOKES', '2 - LAHORE']
 
+# Bump when the per-operator state layout changes (forces a full rebuild)
+GAP_STATE_VERSION = 2
+
 def load_json_data(file_path: Path):
     """Load JSON data from file."""
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def normalize_cert_name(cert_name: str, aliases: Dict) -> str:
-    """Normalize certification name using aliases."""
-    cert_lower = cert_name.strip().lower()
-    
-    for canonical, variations in aliases.items():
-        for variation in variations:
-            if cert_lower == variation.lower():
-                return canonical
+def load_certifications(file_path: Path):
+    """
+    Load certifications as Certification records.
+    Keeps the file's shape: a flat list, or a dict keyed by operator ID.
+    """
+    cert_data = load_json_data(file_path)
+    if isinstance(cert_data, dict) and isinstance(cert_data.get('certifications'), list):
+        cert_data = cert_data['certifications']
     
-    return cert_name.strip()
+    if isinstance(cert_data, dict):
+        return {
+            operator_id: load_records(certs if isinstance(certs, list) else [certs], Certification)
+            for operator_id, certs in cert_data.items()
+        }
+    return load_records(cert_data, Certification)
+
+def normalize_cert_name(cert_name: str, aliases) -> str:
+    """Normalize certification name using aliases (dict or AliasResolver)."""
+    return AliasResolver.ensure(aliases).resolve(cert_name)
 
 def get_pizza_status_id(status: str, division: str, status_types: List[Dict]) -> str:
     """Get the PizzaStatusID for a given status and division."""
@@ -49,8 +91,10 @@ def get_required_certs_for_operator(status: str, division: str, status_types: Li
     if not pizza_id or pizza_id not in pizza_reqs:
         return set()
     
-    # Get required certs for this pizza status
-    pizza_req = pizza_reqs[pizza_id]
+    return required_certs_for_pizza_status(pizza_reqs[pizza_id])
+
+def required_certs_for_pizza_status(pizza_req: Dict) -> Set[str]:
+    """Get the set of required certification names for one pizza status."""
     required_certs = set()
     
     for cert_info in pizza_req.get('required_certifications', []):
@@ -60,6 +104,64 @@ def get_required_certs_for_operator(status: str, division: str, status_types: Li
     
     return required_certs
 
+class LookupContext:
+    """
+    Lookup tables compiled once per report run.
+    
+    Replaces the per-operator linear scans of pay_StatusTypes and the alias
+    file with hash lookups:
+      - (Status, DivisionID) -> PizzaStatusID
+      - PizzaStatusID -> required cert names
+      - normalized alias variation -> canonical cert name (AliasResolver)
+    
+    Held and required names are both resolved through the same AliasResolver
+    before they are compared; required names are reported as written in the
+    requirements file.
+    """
+    
+    def __init__(self, status_types: List[Dict], pizza_reqs: Dict, aliases):
+        # First matching row wins, same as get_pizza_status_id()
+        self.pizza_status_ids = {}
+        for st in status_types:
+            key = (st.get('Status'), st.get('DivisionID'))
+            if key not in self.pizza_status_ids:
+                self.pizza_status_ids[key] = st.get('PizzaStatusID', '')
+        
+        self.required_by_pizza = {
+            pizza_id: frozenset(required_certs_for_pizza_status(pizza_req))
+            for pizza_id, pizza_req in pizza_reqs.items()
+        }
+        
+        self.aliases = AliasResolver.ensure(aliases)
+        self.required_canonical = {
+            cert: self.aliases.resolve(cert)
+            for required_certs in self.required_by_pizza.values()
+            for cert in required_certs
+        }
+    
+    def get_pizza_status_id(self, status: str, division: str) -> str:
+        """PizzaStatusID for a status+division combo ('' if unmapped)."""
+        return self.pizza_status_ids.get((status, division), '')
+    
+    def get_required_certs(self, status: str, division: str) -> frozenset:
+        """Required cert names for an operator's status+division."""
+        pizza_id = self.get_pizza_status_id(status, division)
+        if not pizza_id:
+            return frozenset()
+        return self.required_by_pizza.get(pizza_id, frozenset())
+    
+    def normalize_cert_name(self, cert_name: str) -> str:
+        """Canonical cert name via the alias table."""
+        return self.aliases.resolve(cert_name)
+    
+    def missing_certs(self, required_certs: frozenset, normalized_actual: Set[str]) -> Set[str]:
+        """Required certs whose canonical name is not among the held (canonical) names."""
+        canonical = self.required_canonical
+        return {
+            cert for cert in required_certs
+            if (canonical.get(cert) or self.normalize_cert_name(cert)) not in normalized_actual
+        }
+
 def build_operator_cert_map(certifications, operators: List[Dict]) -> Dict:
     """
     Build a map of operator -> their current certifications.
@@ -97,10 +199,10 @@ def build_operator_cert_map(certifications, operators: List[Dict]) -> Dict:
             
             for cert in cert_list:
                 cert_name = cert.get('Cert')
-                is_approved = str(cert.get('isApproved', '0')) == '1'
-                is_deleted = str(cert.get('IsDeleted', '0')) == '0'
+                is_approved = parse_bool(cert.get('isApproved', '0'))
+                is_deleted = parse_bool(cert.get('IsDeleted', '0'))
                 
-                if cert_name and is_approved and is_deleted:
+                if cert_name and is_approved and not is_deleted:
                     operator_certs[operator_id]['certs'].add(cert_name)
     else:
         # Certifications as flat list (old format)
@@ -108,8 +210,8 @@ def build_operator_cert_map(certifications, operators: List[Dict]) -> Dict:
             operator_id = cert.get('ID') or cert.get('OperatorID')
             division_id = cert.get('DivisionID', 'Unknown')
             cert_name = cert.get('Cert')
-            is_approved = str(cert.get('isApproved', '0')) == '1'
-            is_deleted = str(cert.get('IsDeleted', '0')) == '1'
+            is_approved = parse_bool(cert.get('isApproved', '0'))
+            is_deleted = parse_bool(cert.get('IsDeleted', '0'))
             
             # Skip excluded divisions
             if any(excluded in division_id for excluded in EXCLUDED_DIVS):
@@ -124,83 +226,319 @@ def build_operator_cert_map(certifications, operators: List[Dict]) -> Dict:
     
     return operator_certs
 
-def generate_gap_report(operator_certs: Dict, status_types: List[Dict], pizza_reqs: Dict, aliases: Dict) -> Dict:
-    """
-    Generate compliance gap report showing what certifications each operator is missing.
-    Uses pizza status requirements to determine what certs should be held.
-    """
-    gap_report = {
+def new_gap_group() -> Dict:
+    """Empty by_status / by_division bucket."""
+    return {
+        'total_operators': 0,
+        'compliant': 0,
+        'non_compliant': 0,
+        'missing_cert_counts': {}
+    }
+
+def new_gap_report() -> Dict:
+    """Empty gap report."""
+    return {
         'summary': {
             'total_operators': 0,
             'compliant_operators': 0,
             'non_compliant_operators': 0,
             'total_missing_certs': 0
         },
-        'by_status': defaultdict(lambda: {
-            'total_operators': 0,
-            'compliant': 0,
-            'non_compliant': 0,
-            'missing_cert_counts': defaultdict(int)
-        }),
-        'by_division': defaultdict(lambda: {
-            'total_operators': 0,
-            'compliant': 0,
-            'non_compliant': 0,
-            'missing_cert_counts': defaultdict(int)
-        }),
+        'by_status': {},
+        'by_division': {},
         'operator_gaps': []
     }
+
+def operator_gap_state(operator_id: str, op_data: Dict, context: LookupContext) -> Dict:
+    """
+    Gap entry for one operator (the operator_gaps record shape).
+    Built for compliant operators too (empty missing_certs), so it can be
+    persisted and later subtracted from the aggregates.
+    """
+    status = op_data['StatusName']
+    division = op_data['DivisionID']
+    actual_certs = op_data['certs']
     
-    for operator_id, op_data in operator_certs.items():
-        status = op_data['StatusName']
-        division = op_data['DivisionID']
-        actual_certs = op_data['certs']
+    # Normalize actual cert names
+    normalized_actual = {context.normalize_cert_name(cert) for cert in actual_certs}
+    
+    # Get what they should have (based on pizza status)
+    required_certs = context.get_required_certs(status, division)
+    
+    # Find gaps (required names compared by canonical name too)
+    missing_certs = context.missing_certs(required_certs, normalized_actual)
+    
+    return {
+        'operator_id': operator_id,
+        'first_name': op_data['FirstName'],
+        'last_name': op_data['LastName'],
+        'status': status,
+        'division': division,
+        'missing_certs': sorted(missing_certs),
+        'has_certs': sorted(actual_certs),
+        'required_certs': sorted(required_certs)
+    }
+
+def apply_gap_state(gap_report: Dict, state: Dict, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) one operator's contribution to the
+    summary / by_status / by_division counters. Buckets and cert counts that
+    drop to zero are removed, so the result matches a full rebuild.
+    """
+    missing_certs = state['missing_certs']
+    summary = gap_report['summary']
+    summary['total_operators'] += sign
+    
+    if missing_certs:
+        summary['non_compliant_operators'] += sign
+        summary['total_missing_certs'] += sign * len(missing_certs)
+    else:
+        summary['compliant_operators'] += sign
+    
+    for section, key in (('by_status', state['status']), ('by_division', state['division'])):
+        groups = gap_report[section]
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = new_gap_group()
+        
+        if missing_certs:
+            group['non_compliant'] += sign
+            counts = group['missing_cert_counts']
+            for cert in missing_certs:
+                counts[cert] = counts.get(cert, 0) + sign
+                if counts[cert] == 0:
+                    del counts[cert]
+        else:
+            group['compliant'] += sign
         
-        # Normalize actual cert names
-        normalized_actual = set()
-        for cert in actual_certs:
-            normalized_actual.add(normalize_cert_name(cert, aliases))
+        group['total_operators'] += sign
+        if group['total_operators'] == 0:
+            del groups[key]
+
+def generate_gap_report(operator_certs: Dict, status_types: List[Dict], pizza_reqs: Dict, aliases,
+                        context: LookupContext = None, states: Dict = None) -> Dict:
+    """
+    Generate compliance gap report showing what certifications each operator is missing.
+    Uses pizza status requirements to determine what certs should be held.
+    
+    Status and alias lookups go through a LookupContext (built here unless one
+    is passed in), so the whole report is a single pass over operators.
+    If a states dict is given it is filled with every operator's gap entry
+    (compliant ones included) for a later incremental run.
+    """
+    if context is None:
+        context = LookupContext(status_types, pizza_reqs, aliases)
+    
+    gap_report = new_gap_report()
+    
+    for operator_id, op_data in operator_certs.items():
+        state = operator_gap_state(operator_id, op_data, context)
+        apply_gap_state(gap_report, state)
         
-        # Get what they should have (based on pizza status)
-        required_certs = get_required_certs_for_operator(status, division, status_types, pizza_reqs)
+        if state['missing_certs']:
+            # Record operator-specific gap
+            gap_report['operator_gaps'].append(state)
+        if states is not None:
+            states[operator_id] = state
+    
+    return gap_report
+
+# Set in each worker process by _init_gap_worker (inherited copy-on-write under fork)
+_worker_operators = None
+_worker_context = None
+
+def _init_gap_worker(operators: List[Tuple[str, Dict]], context: LookupContext):
+    global _worker_operators, _worker_context
+    _worker_operators = operators
+    _worker_context = context
+
+def _gap_shard(positions: List[int], keep_states: bool) -> Tuple[Dict, Dict, List]:
+    """
+    Partial report for one shard of operators (positions into the operator list).
+    
+    Returns (partial report, first position at which each bucket / bucket cert
+    was seen, [(position, state)] for gaps or - with keep_states - everyone).
+    """
+    partial = new_gap_report()
+    first_seen = {}
+    states = []
+    
+    for pos in positions:
+        operator_id, op_data = _worker_operators[pos]
+        state = operator_gap_state(operator_id, op_data, _worker_context)
+        apply_gap_state(partial, state)
         
-        # Find gaps
-        missing_certs = required_certs - normalized_actual
+        for section, key in (('by_status', state['status']), ('by_division', state['division'])):
+            first_seen.setdefault((section, key), pos)
+            for cert in state['missing_certs']:
+                first_seen.setdefault((section, key, cert), pos)
         
-        # Update summary
-        gap_report['summary']['total_operators'] += 1
+        if keep_states or state['missing_certs']:
+            states.append((pos, state))
+    
+    return partial, first_seen, states
+
+def merge_gap_shards(shards: List[Tuple[Dict, Dict, List]], states: Dict = None) -> Dict:
+    """
+    Sum shard counters into one report. Buckets and cert counts are ordered by
+    the position of the operator that first produced them (ties between certs
+    of one operator broken by name), which is the order the serial loop
+    inserts them in - so the merged report serializes byte-identically.
+    """
+    gap_report = new_gap_report()
+    first_seen = {}
+    shard_states = []
+    
+    for partial, shard_first_seen, shard_entries in shards:
+        for key, value in partial['summary'].items():
+            gap_report['summary'][key] += value
         
-        if missing_certs:
-            gap_report['summary']['non_compliant_operators'] += 1
-            gap_report['summary']['total_missing_certs'] += len(missing_certs)
-            gap_report['by_status'][status]['non_compliant'] += 1
-            gap_report['by_division'][division]['non_compliant'] += 1
-            
-            for cert in missing_certs:
-                gap_report['by_status'][status]['missing_cert_counts'][cert] += 1
-                gap_report['by_division'][division]['missing_cert_counts'][cert] += 1
-            
-            # Record operator-specific gap
-            gap_report['operator_gaps'].append({
-                'operator_id': operator_id,
-                'first_name': op_data['FirstName'],
-                'last_name': op_data['LastName'],
-                'status': status,
-                'division': division,
-                'missing_certs': sorted(list(missing_certs)),
-                'has_certs': sorted(list(actual_certs)),
-                'required_certs': sorted(list(required_certs))
-            })
-        else:
-            gap_report['summary']['compliant_operators'] += 1
-            gap_report['by_status'][status]['compliant'] += 1
-            gap_report['by_division'][division]['compliant'] += 1
+        for section in ('by_status', 'by_division'):
+            for key, group in partial[section].items():
+                merged = gap_report[section].setdefault(key, new_gap_group())
+                for field in ('total_operators', 'compliant', 'non_compliant'):
+                    merged[field] += group[field]
+                counts = merged['missing_cert_counts']
+                for cert, count in group['missing_cert_counts'].items():
+                    counts[cert] = counts.get(cert, 0) + count
         
-        gap_report['by_status'][status]['total_operators'] += 1
-        gap_report['by_division'][division]['total_operators'] += 1
+        for key, pos in shard_first_seen.items():
+            if pos < first_seen.get(key, pos + 1):
+                first_seen[key] = pos
+        shard_states.extend(shard_entries)
+    
+    for section in ('by_status', 'by_division'):
+        groups = gap_report[section]
+        ordered = {}
+        for key in sorted(groups, key=lambda k: first_seen[(section, k)]):
+            group = groups[key]
+            counts = group['missing_cert_counts']
+            group['missing_cert_counts'] = {
+                cert: counts[cert]
+                for cert in sorted(counts, key=lambda c: (first_seen[(section, key, c)], c))
+            }
+            ordered[key] = group
+        gap_report[section] = ordered
+    
+    shard_states.sort(key=lambda entry: entry[0])
+    for _, state in shard_states:
+        if state['missing_certs']:
+            gap_report['operator_gaps'].append(state)
+        if states is not None:
+            states[state['operator_id']] = state
     
     return gap_report
 
+def generate_gap_report_sharded(operator_certs: Dict, context: LookupContext, workers: int,
+                                states: Dict = None) -> Dict:
+    """
+    generate_gap_report() across a process pool, one shard per DivisionID.
+    
+    Lookup tables and the operator map are handed to each worker once through
+    the pool initializer (shared copy-on-write where fork is available); each
+    task only carries its list of operator positions. Output is identical to
+    the serial run.
+    """
+    operators = list(operator_certs.items())
+    shards = defaultdict(list)
+    for pos, (_, op_data) in enumerate(operators):
+        shards[op_data['DivisionID']].append(pos)
+    # Largest divisions first so one big shard doesn't start last
+    shard_positions = sorted(shards.values(), key=len, reverse=True)
+    
+    start_methods = multiprocessing.get_all_start_methods()
+    mp_context = multiprocessing.get_context('fork' if 'fork' in start_methods else None)
+    with ProcessPoolExecutor(max_workers=min(workers, len(shard_positions)) or 1, mp_context=mp_context,
+                             initializer=_init_gap_worker, initargs=(operators, context)) as pool:
+        results = list(pool.map(_gap_shard, shard_positions, [states is not None] * len(shard_positions)))
+    
+    return merge_gap_shards(results, states)
+
+def find_moved_operators(operator_certs: Dict, states: Dict) -> Set[str]:
+    """
+    Operators whose entry in the operator cert map differs from their saved
+    gap state: added, dropped (e.g. every approved cert row deleted), or with
+    a different cert set, status, division or name.
+    """
+    moved = set(operator_certs.keys() ^ states.keys())
+    for operator_id, op_data in operator_certs.items():
+        state = states.get(operator_id)
+        if state is not None and (
+                sorted(op_data['certs']) != state['has_certs']
+                or op_data['StatusName'] != state['status']
+                or op_data['DivisionID'] != state['division']
+                or op_data['FirstName'] != state['first_name']
+                or op_data['LastName'] != state['last_name']):
+            moved.add(operator_id)
+    return moved
+
+def input_fingerprint(paths: List[Path]) -> Dict[str, str]:
+    """SHA-256 of each input that affects every operator (requirements, status types, aliases)."""
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest() for path in paths if path.exists()}
+
+def load_gap_state(state_file: Path, fingerprint: Dict[str, str]):
+    """Previous run's state, or None if missing or built from different inputs."""
+    if not state_file.exists():
+        return None
+    state = load_json_data(state_file)
+    if state.get('version') != GAP_STATE_VERSION or state.get('inputs') != fingerprint:
+        return None
+    if state.get('excluded_divisions') != EXCLUDED_DIVS:
+        return None
+    return state
+
+def save_gap_state(state_file: Path, states: Dict, fingerprint: Dict[str, str]):
+    """Persist per-operator gap entries."""
+    state = {
+        'version': GAP_STATE_VERSION,
+        'inputs': fingerprint,
+        'excluded_divisions': EXCLUDED_DIVS,
+        'operators': states
+    }
+    tmp_file = state_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    tmp_file.replace(state_file)
+
+def update_gap_report(gap_report: Dict, states: Dict, operator_ids: Set[str], operator_certs: Dict,
+                      context: LookupContext) -> int:
+    """
+    Recompute only the given operators and patch a previous report in place.
+    
+    Each operator's old entry (from states) is subtracted from the aggregates
+    and its new entry (from the current operator cert map) added;
+    operator_gaps entries are replaced in place, dropped when the operator
+    became compliant or left the map, and newly non-compliant operators are
+    appended. Returns the number of operators recomputed.
+    """
+    operator_certs = {op_id: op_data for op_id, op_data in operator_certs.items() if op_id in operator_ids}
+    
+    updated = {}
+    for operator_id in list(operator_certs) + sorted(operator_ids - operator_certs.keys(), key=str):
+        old_state = states.pop(operator_id, None)
+        if old_state is not None:
+            apply_gap_state(gap_report, old_state, -1)
+        
+        new_state = None
+        if operator_id in operator_certs:
+            new_state = operator_gap_state(operator_id, operator_certs[operator_id], context)
+            apply_gap_state(gap_report, new_state)
+            states[operator_id] = new_state
+        updated[operator_id] = new_state
+    
+    operator_gaps = []
+    for gap in gap_report['operator_gaps']:
+        if gap['operator_id'] not in updated:
+            operator_gaps.append(gap)
+            continue
+        new_state = updated.pop(gap['operator_id'])
+        if new_state is not None and new_state['missing_certs']:
+            operator_gaps.append(new_state)
+    operator_gaps.extend(state for state in updated.values() if state is not None and state['missing_certs'])
+    gap_report['operator_gaps'] = operator_gaps
+    
+    return len(operator_ids)
+
 def format_text_report(gap_report: Dict) -> str:
     """Format gap report as readable text."""
     lines = []
@@ -290,34 +628,75 @@ def format_text_report(gap_report: Dict) -> str:
 
 def main():
     """Main execution."""
+    parser = argparse.ArgumentParser(description='Generate the compliance gap report')
+    parser.add_argument('--incremental', action='store_true',
+                        help='recompute only operators changed since the last run and patch the previous report')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes for a full rebuild, sharded by division (default: 1, serial)')
+    args = parser.parse_args()
+    
     base_path = Path(__file__).parent.parent.parent
+    output_json = base_path / 'generated' / 'compliance_gap_report.json'
+    state_file = base_path / 'generated' / 'compliance_gap_state.json'
+    requirements_file = base_path / 'data' / 'pay_PizzaStatusRequirements.json'
+    aliases_file = base_path / 'config' / 'certification_aliases.json'
     
     print("🍕 Loading pizza status requirements...")
-    pizza_reqs = load_json_data(base_path / 'data' / 'pay_PizzaStatusRequirements.json')
+    pizza_reqs = load_json_data(requirements_file)
     print(f"   ✓ Loaded {len(pizza_reqs)} pizza status definitions")
     
     print("\n📂 Loading operator and certification data...")
-    operators = load_json_data(base_path / 'data' / 'pay_Operators.json')
-    cert_data = load_json_data(base_path / 'data' / 'pay_Certifications.json')
-    status_types = load_json_data(base_path / 'data' / 'pay_StatusTypes.json')
-    aliases = load_json_data(base_path / 'config' / 'certification_aliases.json')
+    # pay_* row tables are read by column from the memory-mapped snapshot when it
+    # is fresh, held as slotted records (see records.py)
+    operators = load_table_records('pay_Operators', Operator, base_path / 'data')
+    cert_data = load_certifications(base_path / 'data' / 'pay_Certifications.json')
+    status_types = load_table_records('pay_StatusTypes', StatusType, base_path / 'data')
+    aliases = AliasResolver.from_file(aliases_file)
     
     print(f"   ✓ Operators: {len(operators)}")
     print(f"   ✓ Status Types: {len(status_types)}")
     
+    print("\n🗂️  Compiling status and alias lookup tables...")
+    context = LookupContext(status_types, pizza_reqs, aliases)
+    print(f"   ✓ {len(context.pizza_status_ids)} status+division mappings, {len(context.aliases)} alias variations")
+    
+    # Requirement, status type or alias edits change every operator's gap
+    fingerprint = input_fingerprint([requirements_file, base_path / 'data' / 'pay_StatusTypes.json', aliases_file])
+    previous = load_gap_state(state_file, fingerprint) if args.incremental else None
+    if args.incremental and (previous is None or not output_json.exists()):
+        print("\n⚠️  No usable previous state (missing, or requirements/status types/aliases changed) - running a full rebuild")
+        previous = None
+    
     print("\n🔍 Building operator certification map...")
     operator_certs = build_operator_cert_map(cert_data, operators)
     print(f"   ✓ Found {len(operator_certs)} unique operators with certifications")
     
-    print("\n📊 Generating compliance gap report...")
-    gap_report = generate_gap_report(operator_certs, status_types, pizza_reqs, aliases)
+    if previous is not None:
+        print("\n🔄 Finding operators changed since the last run...")
+        states = previous['operators']
+        affected = find_moved_operators(operator_certs, states)
+        print(f"   ✓ {len(affected)} of {len(states)} operators affected")
+        
+        print("\n📊 Patching compliance gap report...")
+        gap_report = load_json_data(output_json)
+        update_gap_report(gap_report, states, affected, operator_certs, context)
+    else:
+        states = {}
+        if args.workers > 1:
+            print(f"\n📊 Generating compliance gap report ({args.workers} workers, sharded by division)...")
+            gap_report = generate_gap_report_sharded(operator_certs, context, args.workers, states)
+        else:
+            print("\n📊 Generating compliance gap report...")
+            gap_report = generate_gap_report(operator_certs, status_types, pizza_reqs, aliases, context, states)
     
     # Save JSON report
-    output_json = base_path / 'generated' / 'compliance_gap_report.json'
     print(f"\nSaving detailed JSON report to: {output_json}")
     with open(output_json, 'w', encoding='utf-8') as f:
         json.dump(gap_report, f, indent=2, default=list)
     
+    print(f"Saving incremental state to: {state_file}")
+    save_gap_state(state_file, states, fingerprint)
+    
     # Save text report
     output_txt = base_path / 'generated' / 'compliance_gap_report.txt'
     print(f"Saving summary text report to: {output_txt}")
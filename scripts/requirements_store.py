@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Versioned Store for pay_PizzaStatusRequirements.json
+
+Every read and write of the requirements file by tools/custom_server.py goes
+through RequirementsStore, which keeps the parsed document in memory and
+supports two kinds of write:
+
+    save(document, if_match)      full replacement, written atomically
+    patch(operations, if_match)   RFC 6902 operations (see json_patch.py)
+
+A patch is not written into the 350 KB file. It is appended as one line to an
+operation log next to it (pay_PizzaStatusRequirements.json.oplog) and fsynced,
+and a background compaction COMPACT_DELAY seconds later writes the current
+document over the file. Save cost and backup size follow the size of the
+edit; the file on disk trails the served version by a few seconds. Every
+version written to the file is kept in the delta-compressed backup store
+(backup_store.py).
+
+Versions (the ETags editors send back as If-Match) are a hash of the file
+bytes for a loaded or fully saved document, and a hash chained from the
+previous version for a patch. A stale If-Match raises VersionConflict with
+only the pizza statuses that changed since that version.
+
+Change listeners: every callable in store.listeners is called as
+listener(version, pizza_ids) after a save, a patch or a reload of a file
+changed on disk. They run under the store lock, so they must be quick (the
+server just queues a notification).
+
+Crash safety: the file is only ever replaced by temp file + fsync + rename,
+and compaction logs a marker with the new file's hash before replacing it.
+On load the log is replayed from the last header/marker matching the file on
+disk; a log matching nothing (file edited by hand) is set aside unreplayed.
+
+Log lines:
+    {"base": {"version": V, "file_hash": H}}                first line
+    {"version": V2, "prev": V1, "at": "...", "ops": [...]}  one per patch
+    {"compact": {"version": V, "file_hash": H}}             before compaction
+
+Usage:
+    from requirements_store import RequirementsStore, VersionConflict
+
+    store = RequirementsStore('data/pay_PizzaStatusRequirements.json')
+    body, version = store.read()
+    version = store.patch([{'op': 'add', 'path': '/<id>/threshold', 'value': 0.9}], version)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from backup_store import BackupStore, atomic_write
+from json_patch import JsonPatchError, apply_patch, touched_keys
+
+COMPACT_DELAY = 2.0      # seconds after a patch before the file is rewritten
+VERSION_HISTORY = 256    # version transitions kept to diff stale saves against
+LOG_SUFFIX = '.oplog'
+
+
+def content_version(body: bytes) -> str:
+    """Strong ETag for file contents."""
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def chained_version(previous: str, operations: List[Dict]) -> str:
+    """Version after applying a patch to a known version."""
+    ops = json.dumps(operations, sort_keys=True, separators=(',', ':'))
+    return '"' + hashlib.sha256((previous + ops).encode('utf-8')).hexdigest()[:16] + '"'
+
+
+def serialize(document: Dict) -> bytes:
+    # Indent 4 matches the existing file
+    return json.dumps(document, indent=4).encode('utf-8')
+
+
+def requirement_names(entry: Optional[Dict]) -> set:
+    return {c.get('name') for c in (entry or {}).get('required_certifications', [])}
+
+
+class VersionConflict(Exception):
+    """A save or patch was based on a version that is no longer current."""
+
+    def __init__(self, diff: Dict):
+        super().__init__('Requirements were changed by someone else')
+        self.diff = diff
+
+
+class RequirementsStore:
+    """In-memory requirements document with versioned full saves and logged patches."""
+
+    def __init__(self, path, backup_dir=None, compact_delay: float = COMPACT_DELAY):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + LOG_SUFFIX)
+        self.backups = BackupStore(self.path, backup_dir)
+        self.compact_delay = compact_delay
+        self.lock = threading.RLock()
+
+        self._doc: Optional[Dict] = None
+        self._version: Optional[str] = None
+        self._body: Optional[bytes] = None   # serialized current document, built on demand
+        self._file_key = None                # (inode, mtime, size) of the file as last read/written here
+        self._file_hash: Optional[str] = None
+        self._pending = 0                    # patches logged since the last compaction
+        self._timer: Optional[threading.Timer] = None
+        self._history = OrderedDict()        # version -> (previous version, {pizza id: entry before})
+        self.listeners: List[Callable[[str, Set[str]], None]] = []
+
+    # ----- reads -----
+
+    def read(self) -> Tuple[bytes, str]:
+        """(serialized current document, version)"""
+        with self.lock:
+            self._sync()
+            if self._body is None:
+                self._body = serialize(self._doc)
+            return self._body, self._version
+
+    def document(self) -> Tuple[Dict, str]:
+        """(current document, version). The document is shared: treat it as read-only."""
+        with self.lock:
+            self._sync()
+            return self._doc, self._version
+
+    # ----- writes -----
+
+    def save(self, document: Dict, if_match: str) -> str:
+        """Replace the whole document if if_match is current ('*' = any); returns the new version."""
+        with self.lock:
+            self._sync()
+            self._check(if_match, submitted=document)
+            if self._pending:
+                # Patched version that never reached the file
+                self.backups.add(serialize(self._doc), source='patch')
+
+            body = serialize(document)
+            version = content_version(body)
+            changed = {key for key in set(self._doc) | set(document) if self._doc.get(key) != document.get(key)}
+            self._remember(version, {key: self._doc.get(key) for key in changed})
+
+            atomic_write(self.path, body)
+            # The file now holds everything; an old log would not match it on reload
+            if self.log_path.exists():
+                os.remove(self.log_path)
+            self._cancel_compaction()
+            self._set_file(body, version)
+            self._doc, self._version, self._body, self._pending = document, version, body, 0
+            self.backups.add(body, source='save')
+            self._notify(version, changed)
+            return version
+
+    def patch(self, operations: List[Dict], if_match: str) -> str:
+        """Apply RFC 6902 operations if if_match is current ('*' = any); returns the new version."""
+        with self.lock:
+            self._sync()
+            self._check(if_match)
+
+            document = apply_patch(self._doc, operations)
+            if not isinstance(document, dict):
+                raise JsonPatchError("The requirements document must stay a JSON object")
+
+            keys = touched_keys(operations)
+            if keys is None:
+                keys = set(self._doc) | set(document)
+            version = chained_version(self._version, operations)
+
+            self._append_log({
+                'version': version,
+                'prev': self._version,
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'ops': operations
+            })
+            self._remember(version, {key: self._doc.get(key) for key in keys})
+            self._doc, self._version, self._body = document, version, None
+            self._pending += 1
+            self._schedule_compaction()
+            self._notify(version, keys)
+            return version
+
+    def compact(self):
+        """Write the current document over the file and restart the log."""
+        with self.lock:
+            if self._pending == 0:
+                return
+            body = serialize(self._doc)
+            file_hash = content_version(body)
+
+            self._append_log({'compact': {'version': self._version, 'file_hash': file_hash}})
+            atomic_write(self.path, body)
+            atomic_write(self.log_path, self._log_line({'base': {'version': self._version, 'file_hash': file_hash}}))
+            self._set_file(body, file_hash)
+            self._body, self._pending = body, 0
+            self.backups.add(body, source='patch')
+
+    def close(self):
+        """Flush pending patches to the file (call on shutdown)."""
+        with self.lock:
+            self._cancel_compaction()
+            self.compact()
+
+    # ----- conflicts -----
+
+    def _check(self, if_match: str, submitted: Optional[Dict] = None):
+        if if_match != '*' and if_match != self._version:
+            raise VersionConflict(self.diff(if_match, submitted))
+
+    def diff(self, base_version: str, submitted: Optional[Dict] = None) -> Dict:
+        """
+        Pizza statuses that changed since base_version, with their current entries.
+
+        If base_version is no longer in the history (e.g. after a restart), a
+        full save is compared against the submitted document instead and a
+        patch gets every entry ('base_known': False). Saves name versions by
+        content, so a save restoring earlier content (A -> B -> A) loops the
+        history; a walk that comes back to a version it passed is a miss too.
+        """
+        current = self._doc
+        before = {}
+        version = self._version
+        known = True
+        visited = set()
+        while version != base_version:
+            step = self._history.get(version)
+            if step is None or version in visited:
+                known = False
+                break
+            visited.add(version)
+            version, entries = step
+            before.update(entries)  # walking back: older entries win
+
+        if known:
+            keys = [key for key in before if before[key] != current.get(key)]
+        elif submitted is not None:
+            before = submitted
+            keys = [key for key in set(submitted) | set(current) if submitted.get(key) != current.get(key)]
+        else:
+            keys = list(current)
+
+        changed, summary = {}, []
+        for pizza_id in sorted(keys):
+            after = current.get(pizza_id)
+            changed[pizza_id] = after
+            if known or submitted is not None:
+                previous = before.get(pizza_id)
+                summary.append({
+                    'pizza_status_id': pizza_id,
+                    'name': (after or previous or {}).get('pizza_status_name'),
+                    'added': sorted(requirement_names(after) - requirement_names(previous), key=str),
+                    'removed': sorted(requirement_names(previous) - requirement_names(after), key=str),
+                    'deleted': after is None
+                })
+        return {
+            'base_version': base_version,
+            'base_known': known,
+            'current_version': self._version,
+            'changed': changed,
+            'summary': summary
+        }
+
+    def changes_since(self, base_version: str) -> Tuple[str, Optional[Set[str]]]:
+        """(current version, pizza ids changed since base_version), or None if that version is unknown."""
+        with self.lock:
+            self._sync()
+            diff = self.diff(base_version)
+            return self._version, set(diff['changed']) if diff['base_known'] else None
+
+    def _notify(self, version: str, pizza_ids: Set[str]):
+        for listener in self.listeners:
+            try:
+                listener(version, set(pizza_ids))
+            except Exception as e:
+                print(f"⚠️  Change listener failed: {e}")
+
+    def _remember(self, version: str, before: Dict):
+        self._history[version] = (self._version, before)
+        self._history.move_to_end(version)
+        while len(self._history) > VERSION_HISTORY:
+            self._history.popitem(last=False)
+
+    # ----- file and log -----
+
+    def _stat_key(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _set_file(self, body: bytes, file_hash: str):
+        self._file_key = self._stat_key()
+        self._file_hash = file_hash
+
+    def _sync(self):
+        """Load the file (and replay the log) on first use or if it was changed by someone else."""
+        key = self._stat_key()
+        if self._doc is not None and key == self._file_key:
+            return
+
+        if key is None:
+            body = b'{}'
+            document = {}
+        else:
+            with open(self.path, 'rb') as f:
+                body = f.read()
+            document = json.loads(body)
+        file_hash = content_version(body)
+        document, version, pending = self._replay(document, file_hash)
+
+        changed = None
+        if self._doc is not None:
+            print(f"🔄 {self.path.name} changed on disk, reloaded")
+            changed = {k for k in set(self._doc) | set(document) if self._doc.get(k) != document.get(k)}
+            self._remember(version, {k: self._doc.get(k) for k in changed})
+
+        self._cancel_compaction()
+        self._file_key, self._file_hash = key, file_hash
+        self._doc, self._version, self._pending = document, version, pending
+        self._body = body if pending == 0 else None
+        if pending:
+            self._schedule_compaction()
+        if key is not None:
+            self.backups.add(body, source='load')
+        if changed is not None:
+            self._notify(version, changed)
+
+    def _replay(self, document: Dict, file_hash: str):
+        """(document, version, patches replayed) after applying the log on top of the file."""
+        if not self.log_path.exists():
+            return document, file_hash, 0
+
+        entries = []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # torn last line from a crash mid-append
+
+        start = None
+        for i, entry in enumerate(entries):
+            mark = entry.get('base') or entry.get('compact')
+            if mark and mark.get('file_hash') == file_hash:
+                start = (i, mark['version'])
+        if start is None:
+            orphan = self.log_path.with_name(f"{self.log_path.name}.orphaned-{time.strftime('%Y%m%d-%H%M%S')}")
+            os.replace(self.log_path, orphan)
+            print(f"⚠️  {self.log_path.name} does not match {self.path.name}; set aside as {orphan.name}")
+            return document, file_hash, 0
+
+        position, version = start
+        pending = 0
+        for entry in entries[position + 1:]:
+            if 'ops' in entry:
+                document = apply_patch(document, entry['ops'])
+                version = entry['version']
+                pending += 1
+        return document, version, pending
+
+    @staticmethod
+    def _log_line(entry: Dict) -> bytes:
+        return (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def _append_log(self, entry: Dict):
+        lines = b''
+        if not self.log_path.exists():
+            # Log starts from the file on disk, which holds the current version
+            lines = self._log_line({'base': {'version': self._version, 'file_hash': self._file_hash}})
+        with open(self.log_path, 'ab') as f:
+            f.write(lines + self._log_line(entry))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _schedule_compaction(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.compact_delay, self._compact_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_compaction(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _compact_in_background(self):
+        with self.lock:
+            self._timer = None
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"⚠️  Compaction of {self.path.name} failed, will retry on the next patch: {e}")
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Time-to-Service Forecast (absorbing Markov chain)
+
+Fits a per-division Markov chain over status names from pay_StatusTracker
+and forecasts, for every active operator, the probability of reaching
+IN-SERVICE and the expected days until they do.
+
+    stays          consecutive events with the same status collapse into one
+                   stay; a stay belongs to the division of its first event
+    transitions    sparse counts per (division, from status, to status), plus
+                   the same pooled over all divisions
+    dwell          sorted days of every completed stay per (division, status)
+
+IN-SERVICE and the exit statuses (TERMINATED, DISQUALIFIED) are absorbing.
+A division's row with no observed exits falls back to the pooled row, and
+statuses from which a division's chain never reaches an absorbing status
+(e.g. a young division whose operators only loop) take the pooled chain's
+answer. Statuses that lead nowhere even when pooled are dead ends, and
+operators in them get no forecast. With Q the transient part of
+the chain, the fundamental matrix N = (I - Q)^-1 gives:
+
+    b = N R_service           probability of reaching service, per status
+    N (b * mean dwell) / b    expected days to service, given it is reached
+
+For an operator already `a` days into a status, the rest of this stay is
+E[dwell - a | dwell > a] from that status's dwell distribution (0 when they
+have outlasted every completed stay). Transition probabilities do not
+depend on a. Each division's dense (statuses x statuses) matrix is built
+from its slice of the sorted transition keys while that division is solved,
+and the whole roster is then forecast with array lookups.
+Needs NumPy.
+
+Usage:
+    python3 scripts/service_forecast.py [--division "12 - PA"] [--top 20] [--output forecast.json]
+    python3 scripts/service_forecast.py --transitions "12 - PA"
+
+    # Library
+    from service_forecast import ServiceForecaster
+
+    forecaster = ServiceForecaster(ProgressionEngine(events, status_types))
+    forecaster.forecast()
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np  # optional: pip install numpy
+    from progression_engine import DAY_US, ProgressionEngine, StatusEvents
+except ImportError:
+    np = None
+
+from analyze_status_progression import load_json
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+SERVICE_STATUS = 'IN-SERVICE'
+EXIT_STATUSES = ('TERMINATED', 'DISQUALIFIED')
+ALL_DIVISIONS = 'All divisions'
+
+
+class ServiceForecaster:
+    """Per-division absorbing Markov chains over ProgressionEngine stays"""
+
+    def __init__(self, engine: 'ProgressionEngine', service: str = SERVICE_STATUS,
+                 exits: Sequence[str] = EXIT_STATUSES):
+        self.engine = engine
+        self.names = engine.names
+        self.divisions = engine.events.divisions + [ALL_DIVISIONS]
+        size = len(self.names)
+        pooled = len(self.divisions) - 1
+        self.size, self.pooled = size, pooled
+
+        # Stays: runs of one status name within an operator's sorted events
+        count = len(engine.days)
+        run_start = np.zeros(count, dtype=bool)
+        run_start[engine.starts] = True
+        run_start[1:] |= engine.name[1:] != engine.name[:-1]
+        runs = np.flatnonzero(run_start)
+        run_ends = np.append(runs[1:], count)[:len(runs)] - 1
+        self.stay_operator = engine.operator[runs]
+        self.stay_name = engine.name[runs].astype(np.int64)
+        self.stay_division = engine.events.division[engine.sort][runs].astype(np.int64)
+        self.stay_days = np.add.reduceat(engine.days, runs) if count else np.zeros(0, np.int64)
+        self.stay_open = engine.is_last[run_ends]
+
+        # Sparse transition counts: ((division * size + from) * size + to) -> count
+        moved = np.flatnonzero(~self.stay_open)
+        source, target = self.stay_name[moved], self.stay_name[moved + 1]
+        division_source = self.stay_division[moved] * size + source
+        division_keys, division_counts = np.unique(division_source * size + target, return_counts=True)
+        pooled_keys, pooled_counts = np.unique(source * size + target, return_counts=True)
+        # The pooled division comes last, so its keys sort after every division's
+        self.transition_keys = np.concatenate((division_keys, pooled * size * size + pooled_keys))
+        self.transition_counts = np.concatenate((division_counts, pooled_counts))
+
+        # Dwell distributions: completed stay days sorted per group (division * size + status),
+        # as one sorted int64 key group * span + days
+        self._dwell_span = int(self.stay_days.max()) + 2 if len(self.stay_days) else 2
+        days = self.stay_days[moved]
+        self._dwell_keys = np.sort(np.concatenate((division_source, pooled * size + source)) * self._dwell_span
+                                   + np.concatenate((days, days)))
+        self.dwell_groups, self.dwell_days = np.divmod(self._dwell_keys, self._dwell_span)
+        self.dwell_offsets = np.searchsorted(self._dwell_keys,
+                                             np.arange(len(self.divisions) * size + 1) * self._dwell_span)
+        self.dwell_sums = np.concatenate(([0], np.cumsum(self.dwell_days)))
+
+        service_codes = [code for code, name in enumerate(self.names) if name == service]
+        exit_codes = [code for code, name in enumerate(self.names) if name in exits]
+        self.probability, self.days_after = self._solve(service_codes, exit_codes)
+
+    def _dwell_group(self, groups):
+        """Fall back to the pooled distribution where a division has no completed stays"""
+        counts = self.dwell_offsets[groups + 1] - self.dwell_offsets[groups]
+        return np.where(counts > 0, groups, self.pooled * self.size + groups % self.size)
+
+    def _transition_slice(self, d: int):
+        """Bounds of division d's keys in transition_keys"""
+        size = self.size
+        return np.searchsorted(self.transition_keys, [d * size * size, (d + 1) * size * size])
+
+    def _counts(self, d: int):
+        """Dense (from, to) transition counts of one division"""
+        size = self.size
+        lo, hi = self._transition_slice(d)
+        counts = np.zeros(size * size)
+        counts[self.transition_keys[lo:hi] - d * size * size] = self.transition_counts[lo:hi]
+        return counts.reshape(size, size)
+
+    def _solve(self, service_codes: List[int], exit_codes: List[int]):
+        """
+        Per division: probability of service from each status, and the expected
+        days from leaving that status to service given it is reached (NaN where
+        the status is not transient).
+        """
+        size, divisions = self.size, len(self.divisions)
+        groups = self._dwell_group(np.arange(divisions * size))
+        dwell_counts = self.dwell_offsets[groups + 1] - self.dwell_offsets[groups]
+        dwell_totals = self.dwell_sums[self.dwell_offsets[groups + 1]] - self.dwell_sums[self.dwell_offsets[groups]]
+        mean_dwell = np.divide(dwell_totals, dwell_counts, out=np.zeros(len(groups)),
+                               where=dwell_counts > 0).reshape(divisions, size)
+
+        probability = np.full((divisions, size), np.nan)
+        days_after = np.full((divisions, size), np.nan)
+        self.absorbing = absorbing = np.zeros(size, dtype=bool)
+        absorbing[service_codes + exit_codes] = True
+        target = np.zeros(size, dtype=bool)
+        target[service_codes] = True
+        pooled_counts = self._counts(self.pooled)
+        for d in range(divisions):
+            counts = self._counts(d)
+            fallback = counts.sum(axis=1) == 0
+            counts[fallback] = pooled_counts[fallback]
+            outgoing = counts.sum(axis=1, keepdims=True)
+            chain = np.divide(counts, outgoing, out=np.zeros_like(counts), where=outgoing > 0)
+            # Transient: not absorbing and able to reach an absorbing status
+            reaches = absorbing.copy()
+            while True:
+                grown = reaches | ((chain[:, reaches].sum(axis=1) > 0) & ~absorbing)
+                if (grown == reaches).all():
+                    break
+                reaches = grown
+            transient = np.flatnonzero(reaches & ~absorbing)
+            if not len(transient):
+                continue
+            q = chain[np.ix_(transient, transient)]
+            fundamental = np.eye(len(transient)) - q
+            b = np.linalg.solve(fundamental, chain[np.ix_(transient, np.flatnonzero(target))].sum(axis=1))
+            # x_j = sum_k N_jk b_k m_k: expected days to service weighted by reaching it
+            x = np.linalg.solve(fundamental, b * mean_dwell[d, transient])
+            ahead = q @ x
+            probability[d, transient] = b
+            days_after[d, transient] = np.divide(ahead, b, out=np.full(len(b), np.nan), where=b > 0)
+        # A division that never leaves some statuses borrows the pooled chain's answers for them
+        borrowed = np.isnan(probability) & ~absorbing
+        borrowed_status = np.nonzero(borrowed)[1]
+        probability[borrowed] = probability[self.pooled, borrowed_status]
+        days_after[borrowed] = days_after[self.pooled, borrowed_status]
+        return probability, days_after
+
+    def transition_counts_for(self, division: Optional[str] = None) -> Dict[tuple, int]:
+        """{(from status, to status): count} for one division (None: pooled)"""
+        d = self.pooled if division is None else self.divisions.index(division)
+        size = self.size
+        lo, hi = self._transition_slice(d)
+        return {(self.names[int(key) // size % size], self.names[int(key) % size]): int(count)
+                for key, count in zip(self.transition_keys[lo:hi], self.transition_counts[lo:hi])}
+
+    def dwell_distribution(self, status: str, division: Optional[str] = None):
+        """Sorted days of completed stays in `status` (None: all divisions)"""
+        d = self.pooled if division is None else self.divisions.index(division)
+        group = d * self.size + self.names.index(status)
+        return self.dwell_days[self.dwell_offsets[group]:self.dwell_offsets[group + 1]]
+
+    def _remaining_dwell(self, groups, elapsed):
+        """E[dwell - elapsed | dwell > elapsed] per (group, elapsed), 0 past every completed stay"""
+        groups = self._dwell_group(groups)
+        probe = groups * self._dwell_span + np.minimum(elapsed, self._dwell_span - 1)
+        lo = np.searchsorted(self._dwell_keys, probe, side='right')
+        hi = self.dwell_offsets[groups + 1]
+        longer = hi - lo
+        total = self.dwell_sums[hi] - self.dwell_sums[lo]
+        return np.divide(total, longer, out=np.zeros(len(groups)), where=longer > 0) - np.where(longer > 0, elapsed, 0)
+
+    def forecast(self, division: Optional[str] = None) -> List[Dict]:
+        """One row per active operator (current status not absorbing), soonest service first"""
+        current = np.flatnonzero(self.stay_open)
+        division_codes, names = self.stay_division[current], self.stay_name[current]
+        probability = self.probability[division_codes, names]
+        active = ~self.absorbing[names]
+        if division is not None:
+            active &= division_codes == self.divisions.index(division)
+        current, division_codes, names = current[active], division_codes[active], names[active]
+        probability = probability[active]
+        elapsed = self.stay_days[current]
+        days = self._remaining_dwell(division_codes * self.size + names, elapsed) + self.days_after[division_codes, names]
+
+        # Soonest first, unknown last; dates formatted as one array
+        order = np.lexsort((days, np.isnan(days)))
+        current, division_codes, names = current[order], division_codes[order], names[order]
+        elapsed, probability, days = elapsed[order], probability[order], days[order]
+        known = ~np.isnan(days)
+        eta = np.full(len(days), self.engine.now_us, dtype=np.int64)
+        eta[known] += (days[known] * DAY_US).astype(np.int64)
+        eta_dates = np.datetime_as_string(eta.view('datetime64[us]'), unit='D').tolist()
+
+        operators, statuses = self.engine.events.operators, self.names
+        rows = []
+        for operator, d, name, in_status, p, remaining, eta_date in zip(
+                self.stay_operator[current].tolist(), division_codes.tolist(), names.tolist(),
+                elapsed.tolist(), probability.tolist(), days.tolist(), eta_dates):
+            known = remaining == remaining      # NaN: dead end, or service never reached from here
+            rows.append({
+                'operator_id': operators[operator],
+                'division': self.divisions[d],
+                'current_status': statuses[name],
+                'days_in_status': in_status,
+                'probability_of_service': round(p, 3) if p == p else None,
+                'expected_days_to_service': round(remaining, 1) if known else None,
+                'expected_service_date': eta_date if known else None
+            })
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forecast time to IN-SERVICE for active operators')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    parser.add_argument('--division', help='only forecast operators in this division')
+    parser.add_argument('--exit-status', action='append', help=f'absorbing exit status (default: {", ".join(EXIT_STATUSES)})')
+    parser.add_argument('--top', type=int, default=20, help='operators to print')
+    parser.add_argument('--output', type=Path, help='write every forecast row as JSON')
+    parser.add_argument('--transitions', metavar='DIVISION', nargs='?', const=ALL_DIVISIONS,
+                        help='print transition counts for a division instead')
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy is required: pip install numpy")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    events = StatusEvents.load(args.data_dir / 'pay_StatusTracker.json')
+    engine = ProgressionEngine(events, load_json(args.data_dir / 'pay_StatusTypes.json'))
+    print(f"📥 Loaded {len(events):,} status tracking events ({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    forecaster = ServiceForecaster(engine, exits=args.exit_status or EXIT_STATUSES)
+    fitted = time.perf_counter() - start
+
+    if args.transitions:
+        division = None if args.transitions == ALL_DIVISIONS else args.transitions
+        if division is not None and division not in forecaster.divisions:
+            print(f"❌ Unknown division: {division}")
+            sys.exit(1)
+        counts = forecaster.transition_counts_for(division)
+        print(f"\n🔀 Transitions ({args.transitions}): {sum(counts.values())} across {len(counts)} status pairs")
+        for (source, target), n in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {source[:38]:<38} -> {target[:38]:<38} {n:>6}")
+        return
+
+    start = time.perf_counter()
+    rows = forecaster.forecast(args.division)
+    print(f"🔮 Forecast {len(rows):,} active operators (fit {fitted:.2f}s, forecast {time.perf_counter() - start:.2f}s)")
+
+    reachable = [r for r in rows if r['expected_days_to_service'] is not None]
+    if reachable:
+        expected = sum(r['probability_of_service'] for r in rows if r['probability_of_service'] is not None)
+        print(f"  {len(reachable):,} can reach {SERVICE_STATUS}; about {expected:,.0f} expected to")
+    print(f"\n{'Operator':<38} {'Division':<10} {'Status':<32} {'In':>5} {'P(svc)':>7} {'Days':>7} {'ETA':>11}")
+    print("-" * 115)
+    for row in rows[:args.top]:
+        print(f"{row['operator_id']:<38} {str(row['division'])[:10]:<10} {row['current_status'][:32]:<32} "
+              f"{row['days_in_status']:>5} {str(row['probability_of_service']):>7} "
+              f"{str(row['expected_days_to_service']):>7} {str(row['expected_service_date']):>11}")
+
+    if args.output:
+        tmp_path = args.output.with_name(args.output.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+        os.replace(tmp_path, args.output)
+        print(f"\n✓ Saved {args.output}")
+
+
+if __name__ == '__main__':
+    main()
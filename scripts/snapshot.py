@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Columnar Binary Snapshot of the pay_* Tables
+
+Compiles every data/pay_*.json table into one columnar file that is
+memory-mapped on load, so scripts skip re-parsing pretty-printed JSON and
+processes reading the same snapshot share its pages through the OS cache.
+
+File layout (little-endian):
+    b'ORSNAP01' | u32 header length | header JSON | pad to 8 | column blocks
+
+Column encodings (chosen per column at build time):
+    bool  - columns whose values are all JSON true/false/null
+            (Fleet, Providers, isDeleted, CertFlag, ...): bit-packed values
+            plus a bit-packed non-null mask
+    str   - dictionary-encoded strings (DivisionID, Status, GUIDs, ...):
+            uint8/16/32 codes into a string dictionary; code 0 = null
+    int   - int64 values plus a non-null mask
+    json  - anything else, dictionary-encoded as JSON text
+A 'present' bit mask is added to columns some rows do not have at all, so
+rows round-trip exactly.
+
+Usage:
+    # Build generated/pay_tables.snap from data/pay_*.json
+    python3 scripts/snapshot.py build
+
+    # Inspect a snapshot
+    python3 scripts/snapshot.py info
+
+    # Library
+    from snapshot import Snapshot, load_table, load_table_records
+
+    with Snapshot.open() as snap:
+        divisions = snap.table('pay_StatusTypes').column('DivisionID')
+        fleet = snap.table('pay_StatusTypes').column('Fleet')
+        rows = snap.table('pay_StatusTypes').to_records()
+
+    status_types = load_table('pay_StatusTypes')  # snapshot if fresh, else JSON
+    cert_types = load_table('pay_CertTypes', fields=('ID', 'DivisionID'))  # decodes 2 of 68 columns
+    operators = load_table_records('pay_Operators', Operator)  # records built column by column
+
+    # One large table streamed into its own snapshot (see pipe_table.py)
+    write_table_snapshot('pay_Certifications', rows, 'generated/pay_Certifications.snap',
+                         source='data/pay_Certifications.txt')
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Type
+
+from json_stream import iter_records
+from records import Record, load_records, parse_bool
+
+BASE_PATH = Path(__file__).parent.parent
+DATA_DIR = BASE_PATH / 'data'
+DEFAULT_SNAPSHOT = BASE_PATH / 'generated' / 'pay_tables.snap'
+
+MAGIC = b'ORSNAP01'
+_ALIGN = 8
+_MISSING = object()
+
+
+# --- encoding -------------------------------------------------------------
+
+def _pack_bits(flags) -> bytes:
+    out = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            out[i >> 3] |= 1 << (i & 7)
+    return bytes(out)
+
+
+def _code_typecode(dictionary_size: int) -> str:
+    if dictionary_size < (1 << 8):
+        return 'B'
+    if dictionary_size < (1 << 16):
+        return 'H'
+    return 'I'
+
+
+def _encode_strings(strings: List[str]) -> Dict[str, bytes]:
+    """String dictionary as uint32 end offsets + one UTF-8 blob."""
+    blob = bytearray()
+    ends = array('I')
+    for s in strings:
+        blob += s.encode('utf-8')
+        ends.append(len(blob))
+    return {'dict_ends': ends.tobytes(), 'dict_blob': bytes(blob)}
+
+
+def _classify(values) -> str:
+    kinds = set()
+    for value in values:
+        if value is None or value is _MISSING:
+            continue
+        if isinstance(value, bool):
+            kinds.add('bool')
+        elif isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+            kinds.add('int')
+        elif isinstance(value, str):
+            kinds.add('str')
+        else:
+            kinds.add('json')
+    if len(kinds) == 1:
+        return kinds.pop()
+    return 'str' if not kinds else 'json'
+
+
+def _encode_column(values: list) -> (Dict, Dict[str, bytes]):
+    """Encode one column; returns (column meta, named byte blocks)."""
+    kind = _classify(values)
+    blocks = {}
+
+    if any(value is _MISSING for value in values):
+        blocks['present'] = _pack_bits([value is not _MISSING for value in values])
+    values = [None if value is _MISSING else value for value in values]
+
+    if kind == 'bool':
+        blocks['values'] = _pack_bits([value is True for value in values])
+        blocks['valid'] = _pack_bits([value is not None for value in values])
+        return {'kind': kind}, blocks
+
+    if kind == 'int':
+        blocks['values'] = array('q', (value or 0 for value in values)).tobytes()
+        blocks['valid'] = _pack_bits([value is not None for value in values])
+        return {'kind': kind}, blocks
+
+    # str / json: dictionary encoding, code 0 reserved for null
+    codes_by_value = {}
+    dictionary = []
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(0)
+            continue
+        key = value if kind == 'str' else json.dumps(value, ensure_ascii=False)
+        code = codes_by_value.get(key)
+        if code is None:
+            dictionary.append(key)
+            code = codes_by_value[key] = len(dictionary)
+        codes.append(code)
+
+    typecode = _code_typecode(len(dictionary) + 1)
+    blocks['codes'] = array(typecode, codes).tobytes()
+    blocks.update(_encode_strings(dictionary))
+    return {'kind': kind, 'code_type': typecode, 'dict_size': len(dictionary)}, blocks
+
+
+def build_snapshot(data_dir: Path = DATA_DIR, output: Path = DEFAULT_SNAPSHOT,
+                   pattern: str = 'pay_*.json') -> Dict:
+    """Compile every table matching pattern in data_dir into one snapshot file."""
+    header = {'version': 1, 'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'tables': {}}
+    data = bytearray()
+
+    for json_file in sorted(Path(data_dir).glob(pattern)):
+        rows = list(iter_records(json_file))
+        if not rows or not all(isinstance(row, dict) for row in rows):
+            continue  # e.g. pay_PizzaStatusRequirements.json is not a row table
+
+        # Union of keys in first-seen order -> column index
+        column_index = {}
+        for row in rows:
+            for key in row:
+                column_index.setdefault(key, len(column_index))
+        columns = list(column_index)
+
+        table_meta = {
+            'source': json_file.name,
+            'source_mtime': json_file.stat().st_mtime,
+            'row_count': len(rows),
+            'columns': {}
+        }
+        column_values = [[_MISSING] * len(rows) for _ in columns]
+        for r, row in enumerate(rows):
+            for key, value in row.items():
+                column_values[column_index[key]][r] = value
+
+        for name, values in zip(columns, column_values):
+            meta, blocks = _encode_column(values)
+            meta['blocks'] = {}
+            for block_name, payload in blocks.items():
+                data += b'\0' * (-len(data) % _ALIGN)
+                meta['blocks'][block_name] = [len(data), len(payload)]
+                data += payload
+            table_meta['columns'][name] = meta
+
+        header['tables'][json_file.stem] = table_meta
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix = MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes
+    prefix += b'\0' * (-len(prefix) % _ALIGN)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(output.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(prefix)
+        f.write(data)
+    tmp_path.replace(output)
+    return header
+
+
+class _StreamedColumn:
+    """Dictionary codes of one column, spilled to a temp file as rows stream in."""
+
+    def __init__(self, spill_path: Path, first_row: int):
+        self.spill = open(spill_path, 'w+b')
+        self.codes = array('I', [0] * first_row)   # rows before the column appeared: missing
+        self.missing = list(range(first_row))
+        self.codes_by_value = {None: 0}
+        self.dictionary = []
+        self.is_json = False
+
+    def add(self, value):
+        key = value if value is None or isinstance(value, str) else \
+            ('json', json.dumps(value, ensure_ascii=False))
+        code = self.codes_by_value.get(key)
+        if code is None:
+            self.dictionary.append(key)
+            code = self.codes_by_value[key] = len(self.dictionary)
+            self.is_json = self.is_json or not isinstance(value, str)
+        self.codes.append(code)
+
+    def extend(self, values: List[Optional[str]]):
+        """Add a batch of string/None values (dictionary codes assigned in bulk)."""
+        codes_by_value = self.codes_by_value
+        new = sorted(set(values).difference(codes_by_value))   # sorted: same file for the same input
+        if new:
+            first_code = len(self.dictionary) + 1
+            self.dictionary.extend(new)
+            codes_by_value.update(zip(new, range(first_code, first_code + len(new))))
+        self.codes.extend(map(codes_by_value.__getitem__, values))
+
+    def flush(self):
+        self.codes.tofile(self.spill)
+        self.codes = array('I')
+
+
+class TableSnapshotWriter:
+    """
+    Writes one table to its own snapshot file in a single pass.
+
+    Codes are spilled to temp files every spill_rows rows, so memory holds the
+    string dictionaries (distinct values, not rows) instead of the table.
+    Columns are dictionary-encoded: 'str' when every value is a string or
+    null, 'json' otherwise.
+
+        writer = TableSnapshotWriter('pay_Certifications', output, source=export_path)
+        writer.add_row({...})                          # any JSON values
+        writer.add_columns({'Cert': [...], ...})       # string/None batches, equal lengths
+        table_meta = writer.finish()
+    """
+
+    def __init__(self, name: str, output: Path, source: Optional[Path] = None, spill_rows: int = 1 << 16):
+        self.name = name
+        self.output = Path(output)
+        self.source = Path(source) if source else None
+        self.spill_rows = spill_rows
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self._spill_dir = tempfile.TemporaryDirectory(prefix='.snap-', dir=self.output.parent)
+        self.columns: Dict[str, _StreamedColumn] = {}
+        self.row_count = 0
+        self._unspilled = 0
+
+    def _column(self, name: str) -> _StreamedColumn:
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = _StreamedColumn(Path(self._spill_dir.name) / str(len(self.columns)),
+                                                          self.row_count)
+        return column
+
+    def add_row(self, row: Dict):
+        if row.keys() != self.columns.keys():
+            for key in row:
+                self._column(key)
+        for key, column in self.columns.items():
+            if key in row:
+                column.add(row[key])
+            else:
+                column.codes.append(0)
+                column.missing.append(self.row_count)
+        self.row_count += 1
+        self._rows_added(1)
+
+    def add_columns(self, batch: Dict[str, List[Optional[str]]]):
+        count = len(next(iter(batch.values()), ()))
+        for key in batch:
+            self._column(key)
+        for key, column in self.columns.items():
+            values = batch.get(key)
+            if values is not None:
+                column.extend(values)
+            else:
+                column.codes.extend([0] * count)
+                column.missing.extend(range(self.row_count, self.row_count + count))
+        self.row_count += count
+        self._rows_added(count)
+
+    def _rows_added(self, count: int):
+        self._unspilled += count
+        if self._unspilled >= self.spill_rows:
+            for column in self.columns.values():
+                column.flush()
+            self._unspilled = 0
+
+    def finish(self) -> Dict:
+        """Write the snapshot file (header first, then each column's blocks); returns the table's meta."""
+        try:
+            return self._write()
+        finally:
+            for column in self.columns.values():
+                column.spill.close()
+            self._spill_dir.cleanup()
+
+    def _write(self) -> Dict:
+        row_count = self.row_count
+        column_meta, column_blocks, offset = {}, {}, 0
+        for col_name, column in self.columns.items():
+            column.flush()
+            dictionary = [json.dumps(key, ensure_ascii=False) if isinstance(key, str) else key[1]
+                          for key in column.dictionary] if column.is_json else column.dictionary
+            typecode = _code_typecode(len(dictionary) + 1)
+            blocks = {}
+            if column.missing:
+                missing = set(column.missing)
+                blocks['present'] = _pack_bits([i not in missing for i in range(row_count)])
+            blocks['codes'] = (typecode, row_count * array(typecode).itemsize)   # copied from the spill file
+            blocks.update(_encode_strings(dictionary))
+
+            meta = {'kind': 'json' if column.is_json else 'str', 'code_type': typecode,
+                    'dict_size': len(dictionary), 'blocks': {}}
+            for block_name, payload in blocks.items():
+                offset += -offset % _ALIGN
+                length = payload[1] if block_name == 'codes' else len(payload)
+                meta['blocks'][block_name] = [offset, length]
+                offset += length
+            column_meta[col_name], column_blocks[col_name] = meta, blocks
+
+        table_meta = {
+            'source': self.source.name if self.source else None,
+            'source_mtime': self.source.stat().st_mtime if self.source and self.source.exists() else 0,
+            'row_count': row_count,
+            'columns': column_meta
+        }
+        header = {'version': 1, 'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'tables': {self.name: table_meta}}
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        prefix = MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes
+        prefix += b'\0' * (-len(prefix) % _ALIGN)
+
+        tmp_path = self.output.with_suffix(self.output.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(prefix)
+            written = 0
+            for col_name, column in self.columns.items():
+                for block_name, payload in column_blocks[col_name].items():
+                    block_offset, length = column_meta[col_name]['blocks'][block_name]
+                    f.write(b'\0' * (block_offset - written))
+                    if block_name == 'codes':
+                        _copy_codes(column.spill, f, payload[0])
+                    else:
+                        f.write(payload)
+                    written = block_offset + length
+        tmp_path.replace(self.output)
+        return table_meta
+
+
+def write_table_snapshot(name: str, rows: Iterable[Dict], output: Path, source: Optional[Path] = None,
+                         spill_rows: int = 1 << 16) -> Dict:
+    """Write one table from an iterator of dict rows to its own snapshot file (see TableSnapshotWriter)."""
+    writer = TableSnapshotWriter(name, output, source, spill_rows)
+    for row in rows:
+        writer.add_row(row)
+    return writer.finish()
+
+
+def _copy_codes(spill, out, typecode: str, chunk_codes: int = 1 << 20):
+    """Copy spilled uint32 codes to out, narrowed to typecode."""
+    spill.seek(0)
+    while True:
+        chunk = array('I')
+        chunk.frombytes(spill.read(chunk_codes * chunk.itemsize))
+        if not chunk:
+            return
+        out.write(chunk.tobytes() if typecode == 'I' else array(typecode, chunk).tobytes())
+
+
+# --- loading --------------------------------------------------------------
+
+class Column:
+    """Lazily decoded view of one column over the mapped snapshot."""
+
+    def __init__(self, name: str, meta: Dict, row_count: int, view: memoryview):
+        self.name = name
+        self.kind = meta['kind']
+        self.row_count = row_count
+        self._meta = meta
+        self._view = view
+        self._dictionary = None
+        self._codes = None
+
+    def _block(self, block_name: str) -> Optional[memoryview]:
+        span = self._meta['blocks'].get(block_name)
+        if span is None:
+            return None
+        offset, length = span
+        return self._view[offset:offset + length]
+
+    @staticmethod
+    def _bit(bits: memoryview, i: int) -> bool:
+        return bool(bits[i >> 3] >> (i & 7) & 1)
+
+    def is_present(self, i: int) -> bool:
+        """False if row i did not have this key at all."""
+        present = self._block('present')
+        return present is None or self._bit(present, i)
+
+    @property
+    def dictionary(self) -> List[str]:
+        """Distinct values of a str/json column (decoded once)."""
+        if self._dictionary is None:
+            ends = self._block('dict_ends').cast('I')
+            blob = bytes(self._block('dict_blob'))
+            start = 0
+            strings = []
+            for end in ends:
+                strings.append(sys.intern(blob[start:end].decode('utf-8')))
+                start = end
+            if self.kind == 'json':
+                strings = [json.loads(s) for s in strings]
+            self._dictionary = [None] + strings
+        return self._dictionary
+
+    @property
+    def codes(self) -> memoryview:
+        """Dictionary codes of a str/json column (0 = null), zero-copy."""
+        if self._codes is None:
+            self._codes = self._block('codes').cast(self._meta['code_type'])
+        return self._codes
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __getitem__(self, i: int):
+        if self.kind in ('str', 'json'):
+            return self.dictionary[self.codes[i]]
+        if not self._bit(self._block('valid'), i):
+            return None
+        if self.kind == 'bool':
+            return self._bit(self._block('values'), i)
+        return self._block('values').cast('q')[i]
+
+    def __iter__(self) -> Iterator:
+        if self.kind in ('str', 'json'):
+            dictionary = self.dictionary
+            return (dictionary[code] for code in self.codes)
+
+        valid = bytes(self._block('valid'))
+        if self.kind == 'bool':
+            bits = bytes(self._block('values'))
+            values = (bool(bits[i >> 3] >> (i & 7) & 1) for i in range(self.row_count))
+        else:
+            values = iter(self._block('values').cast('q'))
+        return (value if valid[i >> 3] >> (i & 7) & 1 else None
+                for i, value in enumerate(values))
+
+
+class Table:
+    """One pay_* table inside a snapshot."""
+
+    def __init__(self, name: str, meta: Dict, view: memoryview):
+        self.name = name
+        self.row_count = meta['row_count']
+        self.source = meta['source']
+        self.source_mtime = meta['source_mtime']
+        self.columns = {
+            col_name: Column(col_name, col_meta, self.row_count, view)
+            for col_name, col_meta in meta['columns'].items()
+        }
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def rows(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Rows as dicts, optionally projected to a subset of columns (only those are decoded)."""
+        columns = [self.columns[f] for f in fields if f in self.columns] if fields is not None \
+            else list(self.columns.values())
+        sparse = [c for c in columns if c._block('present') is not None]
+        values = [list(c) for c in columns]
+        for i in range(self.row_count):
+            row = {c.name: vals[i] for c, vals in zip(columns, values)}
+            for c in sparse:
+                if not c.is_present(i):
+                    del row[c.name]
+            yield row
+
+    def to_records(self) -> List[Dict]:
+        """Whole table as a list of dicts (same shape as the source JSON rows)."""
+        return list(self.rows())
+
+    def records(self, record_class: Type[Record]) -> List[Record]:
+        """
+        Whole table as records.py records, filled one column at a time: only
+        the record's columns are decoded and no per-row dict is built. Equal
+        to load_records(self.to_records(), record_class).
+        """
+        records = [record_class.__new__(record_class) for _ in range(self.row_count)]
+        for field in record_class.FIELDS:
+            column = self.columns.get(field)
+            if column is None:
+                continue
+            values = list(column)
+            if field in record_class.BOOL_FIELDS:
+                values = [parse_bool(value) for value in values]
+            elif field in record_class.INTERN_FIELDS and column.kind == 'json':
+                values = [sys.intern(value) if isinstance(value, str) else value for value in values]
+            if column._block('present') is None:
+                for record, value in zip(records, values):
+                    setattr(record, field, value)
+            else:
+                for i, (record, value) in enumerate(zip(records, values)):
+                    if column.is_present(i):
+                        setattr(record, field, value)
+        return records
+
+
+class Snapshot:
+    """Memory-mapped snapshot file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        (header_len,) = struct.unpack_from('<I', view, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        self.header = json.loads(bytes(view[header_start:header_start + header_len]))
+        data_start = header_start + header_len
+        data_start += -data_start % _ALIGN
+        self._data = view[data_start:]
+        self._tables = {}
+
+    @classmethod
+    def open(cls, path: Path = DEFAULT_SNAPSHOT) -> 'Snapshot':
+        return cls(path)
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self.header['tables'])
+
+    def table(self, name: str) -> Table:
+        if name not in self._tables:
+            self._tables[name] = Table(name, self.header['tables'][name], self._data)
+        return self._tables[name]
+
+    def is_fresh(self, name: str, data_dir: Path = DATA_DIR) -> bool:
+        """True if the table was built from the current version of its JSON source."""
+        meta = self.header['tables'].get(name)
+        if not meta or not meta['source']:
+            return False
+        source = Path(data_dir) / meta['source']
+        return source.exists() and source.stat().st_mtime <= meta['source_mtime']
+
+    def close(self):
+        self._tables = {}
+        self._data = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a caller still holds a column view; the map closes with the process
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_table(name: str, data_dir: Path = DATA_DIR, snapshot_path: Path = DEFAULT_SNAPSHOT,
+               fields: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Rows of a pay_* table: from the snapshot when it is up to date with the
+    JSON source, otherwise from the JSON file itself. With fields, rows keep
+    only those keys and the snapshot decodes only those columns.
+    """
+    if Path(snapshot_path).exists():
+        with Snapshot.open(snapshot_path) as snap:
+            if snap.is_fresh(name, data_dir):
+                return list(snap.table(name).rows(fields))
+    return list(iter_records(Path(data_dir) / f'{name}.json', fields=fields))
+
+
+def load_table_records(name: str, record_class: Type[Record], data_dir: Path = DATA_DIR,
+                       snapshot_path: Path = DEFAULT_SNAPSHOT) -> List[Record]:
+    """Records of a pay_* table, read by column from the snapshot when fresh (see Table.records)."""
+    if Path(snapshot_path).exists():
+        with Snapshot.open(snapshot_path) as snap:
+            if snap.is_fresh(name, data_dir):
+                return snap.table(name).records(record_class)
+    return load_records(iter_records(Path(data_dir) / f'{name}.json', fields=record_class.FIELDS), record_class)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar snapshot of the pay_* tables')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='compile data/pay_*.json into a snapshot')
+    build_parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    build_parser.add_argument('--output', type=Path, default=DEFAULT_SNAPSHOT)
+
+    info_parser = subparsers.add_parser('info', help='list tables and column encodings')
+    info_parser.add_argument('--snapshot', type=Path, default=DEFAULT_SNAPSHOT)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print(f"📦 Building snapshot from {args.data_dir}/pay_*.json ...")
+        start = time.perf_counter()
+        header = build_snapshot(args.data_dir, args.output)
+        elapsed = time.perf_counter() - start
+        source_bytes = sum((Path(args.data_dir) / t['source']).stat().st_size for t in header['tables'].values())
+        print(f"   ✓ {len(header['tables'])} tables in {elapsed:.2f}s")
+        for name, meta in header['tables'].items():
+            print(f"      • {name}: {meta['row_count']} rows, {len(meta['columns'])} columns")
+        print(f"   ✓ {source_bytes:,} bytes of JSON -> {args.output.stat().st_size:,} bytes: {args.output}")
+        return
+
+    start = time.perf_counter()
+    with Snapshot.open(args.snapshot) as snap:
+        opened = time.perf_counter() - start
+        print(f"📦 {args.snapshot} (built {snap.header['built_at']}, opened in {opened * 1000:.2f} ms)")
+        for name in snap.table_names:
+            table = snap.table(name)
+            fresh = '✓' if snap.is_fresh(name) else '⚠️  stale'
+            print(f"\n   {name}: {len(table)} rows  [{fresh}]")
+            for col in table.columns.values():
+                extra = f", {col._meta['dict_size']} distinct" if col.kind in ('str', 'json') else ''
+                print(f"      {col.name:<28} {col.kind}{extra}")
+
+
+if __name__ == '__main__':
+    main()
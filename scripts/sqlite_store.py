@@ -0,0 +1,724 @@
+#!/usr/bin/env python3
+"""
+Local SQLite Store of the pay_* Extracts
+
+Bulk-loads every data/pay_*.json / pay_*.csv extract (plus any extra
+extract given with --source) into one SQLite file, a local stand-in for the
+production SQL Server the sql/ queries target, so reports can join
+operators, certifications, status types and pizza statuses with indexed SQL
+instead of Python loops.
+
+Each extract becomes a table of the same name with the source column names
+(values as extracted: strings stay strings, JSON booleans become 1/0). Rows
+go in with batched executemany() inside a single transaction; indexes are
+built after the load, on every OperatorID, StatusID, DivisionID, CertTypeID
+and PizzaStatusID column and on each table's own ID column. The ingest
+also derives the lookup tables the reports need:
+
+    status_by_id          pay_StatusTypes Id -> Status, OrderID (first row wins)
+    status_by_name        Status -> OrderID (first row wins)
+    status_pizza          (Status, DivisionID) -> PizzaStatusID (first row wins)
+    pizza_required_certs  PizzaStatusID -> required cert names (pay_PizzaStatusRequirements.json),
+                          with their canonical name from config/certification_aliases.json
+    gap_operators         the gap report's operators, with the status and division
+                          it uses (see below)
+    operator_certs        OperatorID -> approved, non-deleted certs, with the
+                          canonical name from config/certification_aliases.json
+    store_info            key -> value, e.g. certifications_shape
+
+gap_operators and operator_certs follow build_operator_cert_map() for the
+shape of the certification extract. When it is keyed by operator ID, the
+operators are pay_Operators, with their own StatusName and DivisionID. When
+it is a flat list (JSON array or CSV), the operators are those with an
+approved, non-deleted cert row outside EXCLUDED_DIVS. Their name, status and
+division come from their last such row, and ID is the operator when it is
+set. Excluded divisions are applied at ingest.
+
+The database is written to a temp file and renamed into place, so readers
+never see a half-loaded store.
+
+Usage:
+    # Load data/ into generated/pay_tables.db (a certification extract can be added)
+    python3 scripts/sqlite_store.py ingest --source pay_Certifications=external/certs.csv
+
+    # Gap and progression reports as SQL
+    python3 scripts/sqlite_store.py gaps [--operator <OperatorID>] [--output gaps.json]
+    python3 scripts/sqlite_store.py progression
+    python3 scripts/sqlite_store.py info
+
+    # gap_report() vs generate_gap_report(), certifications flat and keyed by operator
+    python3 scripts/sqlite_store.py check --certifications external/certs.csv
+
+    # Library
+    from sqlite_store import connect, gap_report, status_bottlenecks
+
+    with connect() as conn:
+        report = gap_report(conn)
+        bottlenecks = status_bottlenecks(conn)
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).parent / 'reports'))
+
+from alias_resolver import AliasResolver
+from generate_compliance_gap_report import (EXCLUDED_DIVS, apply_gap_state, build_operator_cert_map,
+                                            generate_gap_report, load_certifications, load_json_data,
+                                            new_gap_report)
+from json_stream import iter_records
+from records import parse_bool
+
+BASE_PATH = Path(__file__).parent.parent
+DATA_DIR = BASE_PATH / 'data'
+DEFAULT_DB = BASE_PATH / 'generated' / 'pay_tables.db'
+REQUIREMENTS_FILE = DATA_DIR / 'pay_PizzaStatusRequirements.json'
+ALIASES_FILE = BASE_PATH / 'config' / 'certification_aliases.json'
+
+BATCH_ROWS = 10_000
+
+# Indexed wherever a table has them
+INDEXED_COLUMNS = ('OperatorID', 'StatusID', 'DivisionID', 'CertTypeID', 'PizzaStatusID')
+
+# Each table's own key column, and columns the report queries need even if an extract lacks them
+TABLE_KEYS = {
+    'pay_Operators': 'ID',
+    'pay_StatusTypes': 'Id',
+    'pay_CertTypes': 'ID',
+    'pay_PizzaStatuses': 'ID',
+    'pay_StatusTracker': 'ID',
+    'pay_Certifications': 'CertificationID',
+}
+REQUIRED_COLUMNS = {
+    'pay_Operators': ('ID', 'FirstName', 'LastName', 'DivisionID', 'StatusID', 'StatusName', 'CurrentStatus'),
+    'pay_StatusTypes': ('Id', 'Status', 'DivisionID', 'OrderID', 'PizzaStatusID'),
+    'pay_StatusTracker': ('ID', 'OperatorID', 'StatusID', 'DivisionID', 'Date'),
+    'pay_Certifications': ('OperatorID', 'CertificationID', 'CertTypeID', 'Cert', 'isApproved', 'IsDeleted',
+                           'FirstName', 'LastName', 'StatusName', 'DivisionID'),
+}
+EXTRA_INDEXES = {
+    'pay_StatusTypes': [('Status', 'DivisionID')],
+    'pay_StatusTracker': [('OperatorID', 'julianday(Date)')],
+}
+
+# Nested values (rare in the extracts) are stored as JSON text
+sqlite3.register_adapter(dict, lambda value: json.dumps(value, ensure_ascii=False))
+sqlite3.register_adapter(list, lambda value: json.dumps(value, ensure_ascii=False))
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# --- ingest ---------------------------------------------------------------
+
+def discover_sources(data_dir: Path = DATA_DIR) -> Dict[str, Path]:
+    """pay_* extracts in data_dir by table name (JSON preferred over a CSV of the same name)."""
+    sources = {}
+    for path in sorted(Path(data_dir).glob('pay_*.json')) + sorted(Path(data_dir).glob('pay_*.csv')):
+        if path.stem != REQUIREMENTS_FILE.stem:   # a document, not a row table
+            sources.setdefault(path.stem, path)
+    return sources
+
+
+def certifications_shape(path: Optional[Path]) -> str:
+    """'keyed' for a certification JSON object keyed by operator ID, 'flat' for a list or CSV."""
+    if not path or Path(path).suffix.lower() == '.csv':
+        return 'keyed' if not path else 'flat'
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.read(4096).lstrip()[:1] != '{':
+            return 'flat'
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return 'flat' if isinstance(data.get('certifications'), list) else 'keyed'
+
+
+def iter_source(path: Path, table: Optional[str] = None) -> Iterator[Dict]:
+    """Rows of a JSON extract (array, or an object wrapping one) or a CSV extract with a header."""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+        return
+    if table == 'pay_Certifications':
+        with open(path, 'r', encoding='utf-8') as f:
+            keyed = f.read(4096).lstrip()[:1] == '{'
+        if keyed:
+            # {"certifications": [...]} or keyed by operator ID, as load_certifications() accepts
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data.get('certifications'), list):
+                yield from data['certifications']
+                return
+            for operator_id, certs in data.items():
+                for cert in certs if isinstance(certs, list) else [certs]:
+                    yield dict(cert, OperatorID=operator_id)
+            return
+    yield from iter_records(path)
+
+
+class _TableLoader:
+    """Batched inserts into one table; columns are added as new source keys appear."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str, batch_rows: int = BATCH_ROWS):
+        self.conn = conn
+        self.table = table
+        self.batch_rows = batch_rows
+        self.columns: Dict[str, str] = {}   # source key -> column name, in column order
+        self._folded = set()                # SQLite column names are case-insensitive
+        self.rows = 0
+        self.batch: List[Dict] = []
+
+        self._add_columns(REQUIRED_COLUMNS.get(table, ()))
+
+    def _add_columns(self, keys: Iterable[str]):
+        new = []
+        for key in keys:
+            if not key or key in self.columns:
+                continue   # unnamed export columns are dropped, like pipe_table.py does
+            name, n = key, 1
+            while name.lower() in self._folded:
+                n += 1
+                name = f'{key}_{n}'
+            self._folded.add(name.lower())
+            self.columns[key] = name
+            new.append(name)
+        if not new:
+            return
+        if len(new) == len(self.columns):
+            self.conn.execute(f'CREATE TABLE {quote(self.table)} ({", ".join(map(quote, new))})')
+        else:
+            for name in new:
+                self.conn.execute(f'ALTER TABLE {quote(self.table)} ADD COLUMN {quote(name)}')
+
+    def _insert_sql(self, keys: List[str]) -> str:
+        return (f'INSERT INTO {quote(self.table)} ({", ".join(quote(self.columns[key]) for key in keys)}) '
+                f'VALUES ({", ".join("?" * len(keys))})')
+
+    def add(self, row: Dict):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        self._add_columns(key for key in set().union(*batch) if key not in self.columns)
+        keys = list(self.columns)
+        self.conn.executemany(self._insert_sql(keys), [tuple(map(row.get, keys)) for row in batch])
+        self.rows += len(batch)
+
+    def add_csv(self, path: Path):
+        """A CSV extract, bound straight from csv.reader rows (no per-row dicts)."""
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            self._add_columns(header)
+            positions = {key: i for i, key in enumerate(header) if key}   # last duplicate wins, like DictReader
+            keys = list(positions)
+            pick = None if list(positions.values()) == list(range(len(header))) else itemgetter(*positions.values())
+            insert = self._insert_sql(keys)
+            width = len(header)
+            while True:
+                batch = list(islice(reader, self.batch_rows))
+                if not batch:
+                    break
+                if not all(map(width.__eq__, map(len, batch))):
+                    # Blank rows are skipped and ragged ones padded/cut to the header, as DictReader does
+                    batch = [(row + [None] * width)[:width] for row in batch if row]
+                if pick is not None:
+                    batch = [pick(row) if len(keys) > 1 else (pick(row),) for row in batch]
+                self.conn.executemany(insert, batch)
+                self.rows += len(batch)
+
+    def finish(self):
+        self.flush()
+
+    def use_id_as_operator(self):
+        """Flat certification extracts: ID, when set, is the operator (see build_operator_cert_map)."""
+        if 'ID' in self.columns:
+            column = quote(self.columns['ID'])
+            self.conn.execute(f"UPDATE {quote(self.table)} SET OperatorID = {column} "
+                              f"WHERE {column} IS NOT NULL AND {column} != ''")
+
+    def create_indexes(self):
+        key = TABLE_KEYS.get(self.table)
+        columns = [name for name in self.columns.values() if name in INDEXED_COLUMNS or name == key]
+        for column in columns:
+            self.conn.execute(f'CREATE INDEX {quote(f"ix_{self.table}_{column}")} '
+                              f'ON {quote(self.table)} ({quote(column)})')
+        for i, index_columns in enumerate(EXTRA_INDEXES.get(self.table, ())):
+            expressions = ', '.join(c if '(' in c else quote(c) for c in index_columns)
+            self.conn.execute(f'CREATE INDEX {quote(f"ix_{self.table}_{i}")} ON {quote(self.table)} ({expressions})')
+
+
+_DERIVED_TABLES_SQL = [
+    'CREATE TABLE status_by_id (Id TEXT PRIMARY KEY, Status TEXT, OrderID TEXT)',
+    '''INSERT OR IGNORE INTO status_by_id SELECT Id, Status, OrderID FROM pay_StatusTypes
+       WHERE Id IS NOT NULL ORDER BY rowid''',
+    'CREATE TABLE status_by_name (Status TEXT PRIMARY KEY, OrderID TEXT)',
+    '''INSERT OR IGNORE INTO status_by_name SELECT Status, OrderID FROM pay_StatusTypes
+       WHERE Status IS NOT NULL ORDER BY rowid''',
+    'CREATE TABLE status_pizza (Status TEXT, DivisionID TEXT, PizzaStatusID TEXT, PRIMARY KEY (Status, DivisionID))',
+    '''INSERT OR IGNORE INTO status_pizza SELECT Status, DivisionID, COALESCE(PizzaStatusID, '')
+       FROM pay_StatusTypes ORDER BY rowid''',
+    '''CREATE TABLE pizza_required_certs (PizzaStatusID TEXT, cert_name TEXT, cert_canonical TEXT,
+                                          PRIMARY KEY (PizzaStatusID, cert_name))''',
+    'CREATE TABLE gap_operators (seq INTEGER, ID TEXT, FirstName TEXT, LastName TEXT, status TEXT, division TEXT)',
+    'CREATE TABLE operator_certs (OperatorID TEXT, cert TEXT, cert_name TEXT)',
+    'CREATE TABLE store_info (key TEXT PRIMARY KEY, value TEXT)',
+]
+
+# Approved, non-deleted cert rows with an operator and a cert name
+_HELD_CERT_ROWS = '''
+    OperatorID IS NOT NULL AND OperatorID != '' AND Cert IS NOT NULL AND Cert != ''
+    AND parse_bool(isApproved) AND NOT parse_bool(IsDeleted)
+'''
+
+
+def _excluded_division_clause(column: str):
+    """SQL condition (and params) dropping EXCLUDED_DIVS, matched as substrings like the gap report."""
+    clause = ' AND '.join(f"instr({column}, ?) = 0" for _ in EXCLUDED_DIVS) or '1'
+    return clause, list(EXCLUDED_DIVS)
+
+
+def _derive_tables(conn: sqlite3.Connection, requirements: Dict, aliases: AliasResolver, cert_shape: str):
+    """Lookup tables the report queries join against (see module docstring)."""
+    # One statement at a time: executescript() would commit the ingest transaction
+    for statement in _DERIVED_TABLES_SQL:
+        conn.execute(statement)
+    conn.execute("INSERT INTO store_info VALUES ('certifications_shape', ?)", (cert_shape,))
+    conn.executemany('INSERT OR IGNORE INTO pizza_required_certs VALUES (?, ?, ?)', [
+        (pizza_id, cert['name'], aliases.resolve(cert['name']))
+        for pizza_id, entry in requirements.items()
+        for cert in entry.get('required_certifications', []) if cert.get('name')
+    ])
+    conn.create_function('parse_bool', 1, parse_bool, deterministic=True)
+    conn.create_function('resolve_cert', 1, aliases.resolve, deterministic=True)
+
+    if cert_shape == 'flat':
+        # Operators from their cert rows: first row for the order, last row for the fields
+        included, params = _excluded_division_clause("COALESCE(DivisionID, 'Unknown')")
+        held = f'{_HELD_CERT_ROWS} AND {included}'
+        conn.execute(f'''
+            INSERT INTO gap_operators
+            SELECT seq, OperatorID, FirstName, LastName, status, division FROM (
+                SELECT MIN(rowid) OVER (PARTITION BY OperatorID) AS seq,
+                       ROW_NUMBER() OVER (PARTITION BY OperatorID ORDER BY rowid DESC) AS latest,
+                       OperatorID, COALESCE(FirstName, '') AS FirstName, COALESCE(LastName, '') AS LastName,
+                       COALESCE(StatusName, 'Unknown') AS status, COALESCE(DivisionID, 'Unknown') AS division
+                FROM pay_Certifications WHERE {held}
+            ) WHERE latest = 1
+        ''', params)
+    else:
+        included, params = _excluded_division_clause('DivisionID')
+        held = _HELD_CERT_ROWS
+        conn.execute(f'''
+            INSERT INTO gap_operators
+            SELECT rowid, ID, COALESCE(FirstName, ''), COALESCE(LastName, ''),
+                   COALESCE(NULLIF(StatusName, ''), CurrentStatus, 'Unknown'), DivisionID
+            FROM pay_Operators WHERE ID IS NOT NULL AND DivisionID IS NOT NULL AND {included}
+        ''', params)
+    conn.execute(f'''
+        INSERT INTO operator_certs
+        SELECT DISTINCT OperatorID, Cert, resolve_cert(Cert) FROM pay_Certifications WHERE {held}
+    ''', params if cert_shape == 'flat' else ())
+    conn.execute('CREATE INDEX ix_gap_operators ON gap_operators (ID)')
+    conn.execute('CREATE INDEX ix_operator_certs ON operator_certs (OperatorID, cert_name)')
+
+
+def ingest(data_dir: Path = DATA_DIR, db_path: Path = DEFAULT_DB, sources: Optional[Dict[str, Path]] = None,
+           requirements_path: Path = REQUIREMENTS_FILE, aliases_path: Path = ALIASES_FILE,
+           batch_rows: int = BATCH_ROWS, progress: bool = True) -> Dict[str, int]:
+    """
+    Load the pay_* extracts in data_dir (plus sources: table -> path, which
+    take precedence) into a fresh database at db_path; returns rows per table.
+    """
+    sources = {**discover_sources(data_dir), **(sources or {})}
+    for table in REQUIRED_COLUMNS:
+        sources.setdefault(table, None)   # empty table, so the report queries still run
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    cert_shape = certifications_shape(sources['pay_Certifications'])
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    counts = {}
+    try:
+        # Nothing to protect until the file is renamed into place
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('PRAGMA cache_size = -262144')   # 256 MB
+        conn.execute('BEGIN')
+
+        loaders = []
+        for table, path in sorted(sources.items()):
+            start = time.perf_counter()
+            loader = _TableLoader(conn, table, batch_rows)
+            if path and Path(path).suffix.lower() == '.csv':
+                loader.add_csv(path)
+            elif path:
+                for row in iter_source(path, table):
+                    if isinstance(row, dict):
+                        loader.add(row)
+            loader.finish()
+            if table == 'pay_Certifications' and cert_shape == 'flat':
+                loader.use_id_as_operator()
+            loaders.append(loader)
+            counts[table] = loader.rows
+            if progress and path:
+                elapsed = time.perf_counter() - start
+                print(f"   ✓ {table}: {loader.rows:,} rows from {Path(path).name} in {elapsed:.2f}s")
+
+        for loader in loaders:
+            loader.create_indexes()
+
+        requirements = {}
+        if Path(requirements_path).exists():
+            with open(requirements_path, 'r', encoding='utf-8') as f:
+                requirements = json.load(f)
+        aliases = AliasResolver.from_file(aliases_path) if Path(aliases_path).exists() else AliasResolver({})
+        _derive_tables(conn, requirements, aliases, cert_shape)
+
+        conn.execute('COMMIT')
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+# --- queries --------------------------------------------------------------
+
+def connect(db_path: Path = DEFAULT_DB) -> sqlite3.Connection:
+    """Read-only connection to an ingested store."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"{db_path} not found - run: python3 scripts/sqlite_store.py ingest")
+    conn = sqlite3.connect(f'file:{Path(db_path).resolve()}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def operator_gap_states(conn: sqlite3.Connection, operator_id: Optional[str] = None,
+                        division: Optional[str] = None) -> List[Dict]:
+    """
+    Gap entries (generate_compliance_gap_report.operator_gap_state shape) for
+    every gap_operators operator, or one operator / one division. Required
+    certs come from the operator's status+division pizza status; held and
+    required certs are matched by canonical name.
+    """
+    where, params = ['1'], []
+    if operator_id is not None:
+        where.append('g.ID = ?')
+        params.append(operator_id)
+    if division is not None:
+        where.append('g.division = ?')
+        params.append(division)
+
+    rows = conn.execute(f'''
+        WITH ops AS (
+            SELECT g.seq, g.ID, g.FirstName, g.LastName, g.status, g.division
+            FROM gap_operators g
+            WHERE {' AND '.join(where)}
+        )
+        SELECT ops.*, r.cert_name AS required,
+               EXISTS (SELECT 1 FROM operator_certs oc
+                       WHERE oc.OperatorID = ops.ID AND oc.cert_name = r.cert_canonical) AS held
+        FROM ops
+        LEFT JOIN status_pizza sp ON sp.Status = ops.status AND sp.DivisionID = ops.division
+        LEFT JOIN pizza_required_certs r ON r.PizzaStatusID = sp.PizzaStatusID
+        ORDER BY ops.seq
+    ''', params)
+
+    states: Dict[str, Dict] = {}
+    for row in rows:
+        state = states.get(row['ID'])
+        if state is None or state['_seq'] != row['seq']:
+            # A later duplicate operator row replaces the earlier one, like the dict-keyed report
+            state = states[row['ID']] = {
+                '_seq': row['seq'],
+                'operator_id': row['ID'],
+                'first_name': row['FirstName'],
+                'last_name': row['LastName'],
+                'status': row['status'],
+                'division': row['division'],
+                'missing_certs': [],
+                'has_certs': [],
+                'required_certs': []
+            }
+        if row['required'] is not None:
+            state['required_certs'].append(row['required'])
+            if not row['held']:
+                state['missing_certs'].append(row['required'])
+
+    held = conn.execute(
+        'SELECT OperatorID, cert FROM operator_certs WHERE OperatorID = ?' if operator_id is not None
+        else 'SELECT OperatorID, cert FROM operator_certs',
+        (operator_id,) if operator_id is not None else ())
+    for op_id, cert in held:
+        if op_id in states:
+            states[op_id]['has_certs'].append(cert)
+
+    for state in states.values():
+        del state['_seq']
+        for key in ('missing_certs', 'has_certs', 'required_certs'):
+            state[key] = sorted(set(state[key]))
+    return list(states.values())
+
+
+def gap_report(conn: sqlite3.Connection) -> Dict:
+    """Compliance gap report (generate_compliance_gap_report.py shape) from the store."""
+    report = new_gap_report()
+    for state in operator_gap_states(conn):
+        apply_gap_state(report, state)
+        if state['missing_certs']:
+            report['operator_gaps'].append(state)
+    return report
+
+
+def check(data_dir: Path = DATA_DIR, certifications: Optional[Path] = None) -> bool:
+    """
+    gap_report() from a store against generate_gap_report() on the same
+    extracts, once with the certification extract as a flat list and once
+    keyed by operator ID. Returns True when both shapes match.
+    """
+    data_dir = Path(data_dir)
+    certifications = Path(certifications or data_dir / 'pay_Certifications.json')
+    rows = [row for row in iter_source(certifications, 'pay_Certifications') if isinstance(row, dict)]
+    keyed: Dict[str, List[Dict]] = {}
+    for row in rows:
+        operator_id = row.get('ID') or row.get('OperatorID')
+        if operator_id:
+            keyed.setdefault(operator_id, []).append(row)
+
+    operators = load_json_data(data_dir / 'pay_Operators.json')
+    status_types = load_json_data(data_dir / 'pay_StatusTypes.json')
+    requirements = load_json_data(REQUIREMENTS_FILE)
+    aliases = AliasResolver.from_file(ALIASES_FILE)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for shape, data in (('flat', rows), ('keyed', keyed)):
+            path = Path(tmp) / shape / 'pay_Certifications.json'
+            path.parent.mkdir()
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            db_path = Path(tmp) / shape / 'pay_tables.db'
+            ingest(data_dir, db_path, {'pay_Certifications': path}, progress=False)
+            conn = connect(db_path)
+            try:
+                from_sql = gap_report(conn)
+            finally:
+                conn.close()
+            from_python = generate_gap_report(build_operator_cert_map(load_certifications(path), operators),
+                                              status_types, requirements, aliases)
+
+            match = from_sql == from_python
+            ok &= match
+            summary = from_sql['summary']
+            print(f"   {'✓' if match else '❌'} {shape}: {summary['total_operators']} operators, "
+                  f"{summary['non_compliant_operators']} non-compliant, {summary['total_missing_certs']} missing certs")
+            if not match:
+                for key in ('summary', 'by_status', 'by_division', 'operator_gaps'):
+                    if from_sql[key] != from_python[key]:
+                        print(f"      {key} differs (python summary: {from_python['summary']})")
+    return ok
+
+
+# Days in each StatusTracker stage: to the operator's next event, or to now for the
+# latest one (same rules as analyze_status_progression.analyze_operator_journey)
+_STAGES_SQL = '''
+    WITH events AS (
+        SELECT t.OperatorID, t.StatusID, julianday(t.Date) AS start,
+               LEAD(julianday(t.Date)) OVER w AS next_start,
+               LEAD(t.rowid) OVER w IS NULL AS is_last,
+               FIRST_VALUE(t.DivisionID) OVER w AS division
+        FROM pay_StatusTracker t
+        WINDOW w AS (PARTITION BY t.OperatorID ORDER BY julianday(t.Date), t.rowid)
+    ), spans AS (
+        SELECT e.OperatorID, e.division, COALESCE(s.Status, e.StatusID) AS status,
+               CASE WHEN e.start IS NULL THEN 0
+                    WHEN e.is_last THEN julianday('now', 'localtime') - e.start
+                    WHEN e.next_start IS NULL THEN 0
+                    ELSE e.next_start - e.start END AS span
+        FROM events e LEFT JOIN status_by_id s ON s.Id = e.StatusID
+    )
+    SELECT OperatorID, division, status,
+           CAST(span AS INTEGER) - (span < CAST(span AS INTEGER)) AS days
+    FROM spans
+'''
+
+
+def _order_number(order) -> int:
+    return int(order) if order and str(order).isdigit() else 999
+
+
+def status_bottlenecks(conn: sqlite3.Connection) -> List[Dict]:
+    """identify_bottlenecks() as one query: per-status dwell times, longest average first."""
+    rows = conn.execute(f'''
+        WITH stages AS ({_STAGES_SQL})
+        SELECT stages.status, n.OrderID, AVG(days) AS avg_days, MAX(days) AS max_days,
+               MIN(days) AS min_days, COUNT(*) AS count
+        FROM stages LEFT JOIN status_by_name n ON n.Status = stages.status
+        GROUP BY stages.status
+    ''')
+    bottlenecks = [{
+        'status': row['status'],
+        'order': _order_number(row['OrderID']),
+        'avg_days': round(row['avg_days'], 1),
+        'max_days': row['max_days'],
+        'min_days': row['min_days'],
+        'operator_count': row['count'],
+        'total_transitions': row['count']
+    } for row in rows]
+    bottlenecks.sort(key=lambda x: x['avg_days'], reverse=True)
+    return bottlenecks
+
+
+def division_progression(conn: sqlite3.Connection) -> List[Dict]:
+    """analyze_division_differences() as SQL: journey length and slowest status per division."""
+    comparison = {}
+    for row in conn.execute(f'''
+        WITH stages AS ({_STAGES_SQL}),
+        journeys AS (
+            SELECT division, OperatorID, SUM(days) AS total_days, COUNT(*) AS stages
+            FROM stages WHERE division IS NOT NULL AND division != '' GROUP BY OperatorID
+        )
+        SELECT division, COUNT(DISTINCT OperatorID) AS operators, AVG(total_days) AS avg_days,
+               AVG(stages) AS avg_stages
+        FROM journeys GROUP BY division
+    '''):
+        comparison[row['division']] = {
+            'division': row['division'],
+            'operator_count': row['operators'],
+            'avg_total_journey_days': round(row['avg_days'], 1),
+            'avg_stages_count': round(row['avg_stages'], 1),
+            'slowest_status': None,
+            'slowest_status_avg_days': 0
+        }
+    for row in conn.execute(f'''
+        WITH stages AS ({_STAGES_SQL})
+        SELECT division, status, AVG(days) AS avg_days FROM stages
+        WHERE division IS NOT NULL AND division != '' GROUP BY division, status
+    '''):
+        entry = comparison[row['division']]
+        if row['avg_days'] > entry['slowest_status_avg_days']:
+            entry['slowest_status'] = row['status']
+            entry['slowest_status_avg_days'] = round(row['avg_days'], 1)
+
+    return sorted(comparison.values(), key=lambda x: x['avg_total_journey_days'], reverse=True)
+
+
+# --- CLI ------------------------------------------------------------------
+
+def _parse_source(value: str):
+    table, sep, path = value.partition('=')
+    if not sep or not table or not path:
+        raise argparse.ArgumentTypeError(f"expected TABLE=PATH, got {value!r}")
+    return table, Path(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SQLite store of the pay_* extracts')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='bulk-load data/pay_* extracts into SQLite')
+    ingest_parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    ingest_parser.add_argument('--source', type=_parse_source, action='append', default=[],
+                               metavar='TABLE=PATH', help='extra extract (.json or .csv), e.g. pay_Certifications=certs.csv')
+
+    gaps_parser = subparsers.add_parser('gaps', help='compliance gaps as SQL')
+    gaps_parser.add_argument('--operator', help='one operator ID')
+    gaps_parser.add_argument('--output', type=Path, help='write the full report as JSON')
+
+    progression_parser = subparsers.add_parser('progression', help='status dwell times as SQL')
+    progression_parser.add_argument('--top', type=int, default=10)
+
+    subparsers.add_parser('info', help='tables, row counts and indexes')
+
+    check_parser = subparsers.add_parser('check', help='compare the SQL gap report with generate_gap_report()')
+    check_parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    check_parser.add_argument('--certifications', type=Path,
+                              help='certification extract, .json or .csv (default: <data-dir>/pay_Certifications.json)')
+
+    for sub in (ingest_parser, gaps_parser, progression_parser, subparsers.choices['info']):
+        sub.add_argument('--db', type=Path, default=DEFAULT_DB)
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        print(f"🗄️  Loading {args.data_dir}/pay_* into {args.db} ...")
+        start = time.perf_counter()
+        counts = ingest(args.data_dir, args.db, dict(args.source))
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        print(f"   ✓ {total:,} rows in {len(counts)} tables in {elapsed:.2f}s ({total / elapsed:,.0f} rows/sec)")
+        return
+
+    if args.command == 'check':
+        print("🔎 Checking the SQL gap report against generate_gap_report() ...")
+        ok = check(args.data_dir, args.certifications)
+        print('✅ Both certification shapes match' if ok else '❌ Mismatch')
+        sys.exit(0 if ok else 1)
+
+    with connect(args.db) as conn:
+        if args.command == 'info':
+            print(f"🗄️  {args.db}")
+            for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                         "AND name NOT LIKE 'sqlite_%' ORDER BY name"):
+                count = conn.execute(f'SELECT COUNT(*) FROM {quote(table)}').fetchone()[0]
+                indexes = [name for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                    "AND name NOT LIKE 'sqlite_%'", (table,))]
+                print(f"   {table}: {count:,} rows, {len(indexes)} indexes")
+
+        elif args.command == 'gaps':
+            if args.operator:
+                states = operator_gap_states(conn, operator_id=args.operator)
+                print(json.dumps(states[0] if states else None, indent=2))
+                return
+            start = time.perf_counter()
+            report = gap_report(conn)
+            summary = report['summary']
+            print(f"📊 Gap report from SQL in {(time.perf_counter() - start) * 1000:.0f} ms")
+            print(f"   Total Operators: {summary['total_operators']}")
+            print(f"   ✅ Compliant: {summary['compliant_operators']}")
+            print(f"   ❌ Non-Compliant: {summary['non_compliant_operators']}")
+            print(f"   📋 Total Missing Certs: {summary['total_missing_certs']}")
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2)
+                print(f"   ✓ {args.output}")
+
+        elif args.command == 'progression':
+            start = time.perf_counter()
+            bottlenecks = status_bottlenecks(conn)
+            divisions = division_progression(conn)
+            print(f"⏱️  Status progression from SQL in {(time.perf_counter() - start) * 1000:.0f} ms")
+            print(f"\n   Top {args.top} bottlenecks:")
+            for i, b in enumerate(bottlenecks[:args.top], 1):
+                print(f"   {i}. {b['status']}: {b['avg_days']} days average "
+                      f"({b['min_days']}-{b['max_days']}, {b['operator_count']} stages, Step {b['order']})")
+            print("\n   Divisions (longest journey first):")
+            for div in divisions:
+                print(f"   {div['division']}: {div['avg_total_journey_days']} days, "
+                      f"{div['operator_count']} operators, slowest {div['slowest_status']}")
+
+
+if __name__ == '__main__':
+    main()
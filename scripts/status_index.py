@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Point-in-Time Status Index
+
+Answers "where was every operator on date T?" from pay_StatusTracker
+without re-sorting anyone's events per question:
+
+    status_at(operator, T)       bisect in that operator's sorted event times: O(log n)
+    headcount_at(T)              (division, status) counts: the checkpoint taken at the
+                                 start of T's day plus that day's events up to T
+    daily_headcount(start, end)  one checkpoint per day: a time series straight
+                                 from the checkpoints
+
+An operator is in the status (and division) of their latest event at or
+before T, from that event's Date on. Events without a usable Date are left
+out. Checkpoints are built in one pass over all events in time order, with
+each event recording the operator's state before it, so a checkpoint plus
+a day's events give any moment in that day.
+
+Usage:
+    python3 scripts/status_index.py at 2025-06-30 [--division "12 - PA"]
+    python3 scripts/status_index.py at "2025-06-30 12:00" --operator 87E4B7EB-C319-4D54-9A0D-011FB8654F46
+    python3 scripts/status_index.py series --start 2025-01-01 --end 2025-12-31 --status IN-SERVICE
+
+    # Library
+    from status_index import StatusIndex
+
+    index = StatusIndex.from_events(load_status_tracker(path), status_types)
+    index.status_at(operator_id, '2025-06-30')
+    index.headcount_at('2025-06-30', division='12 - PA')
+    index.daily_headcount('2025-01-01', '2025-12-31', status='IN-SERVICE')
+"""
+
+import argparse
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyze_status_progression import load_json, load_status_tracker
+from date_parser import NO_TIME, epoch_microseconds, parse_date, to_epoch_us
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+DAY_US = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+# (division, status name, status ID) an operator is in
+State = Tuple[Optional[str], str, str]
+
+
+def _micros(when) -> int:
+    """datetime / date / 'YYYY-MM-DD[ HH:MM[:SS]]' -> epoch microseconds (a bare date means its end)"""
+    if isinstance(when, date) and not isinstance(when, datetime):
+        return (when - _EPOCH.date()).days * DAY_US + DAY_US - 1
+    if isinstance(when, str) and len(when) == 10:
+        return _micros(date.fromisoformat(when))
+    parsed = parse_date(when)
+    if parsed is None:
+        raise ValueError(f"Unrecognized date: {when!r}")
+    return to_epoch_us(parsed)
+
+
+def _day(micros: int) -> int:
+    """Days since 1970-01-01"""
+    return micros // DAY_US
+
+
+class StatusIndex:
+    """Per-operator sorted status events plus a (division, status) headcount checkpoint per day"""
+
+    def __init__(self, states: List[State], operator_times: Dict[str, List[int]],
+                 operator_states: Dict[str, List[int]], log_times: List[int],
+                 log_before: List[int], log_after: List[int], first_day: int,
+                 checkpoints: List[Dict[int, int]], checkpoint_ends: List[int]):
+        self.states = states                    # state code -> (division, status, status ID)
+        self.operator_times = operator_times    # operator -> sorted event times (epoch us)
+        self.operator_states = operator_states  # operator -> state code per event
+        self.log_times = log_times              # every event in time order ...
+        self.log_before = log_before            # ... the operator's state code before it (-1: none)
+        self.log_after = log_after              # ... and after it
+        self.first_day = first_day              # day of checkpoints[0]
+        self.checkpoints = checkpoints          # per day: state code -> operators, at the end of the day
+        self.checkpoint_ends = checkpoint_ends  # per day: log position after that day's events
+
+    @classmethod
+    def from_events(cls, events: List[Dict], status_types: List[Dict]) -> 'StatusIndex':
+        status_names = {}
+        for status_type in status_types:
+            status_names.setdefault(status_type['Id'], status_type['Status'])
+
+        state_codes: Dict[State, int] = {}
+        codes = []
+        for event in events:
+            status_id = event['StatusID']
+            state = (event.get('DivisionID'), status_names.get(status_id, status_id), status_id)
+            codes.append(state_codes.setdefault(state, len(state_codes)))
+        times = epoch_microseconds([event.get('Date') for event in events]).tolist()
+
+        # One stable sort by time (file order breaks ties); each operator's events come out sorted too
+        order = sorted((i for i, micros in enumerate(times) if micros != NO_TIME), key=times.__getitem__)
+        operator_times, operator_states = defaultdict(list), defaultdict(list)
+        log_times, log_before, log_after = [], [], []
+        current = {}
+        for i in order:
+            operator_id, micros, code = events[i]['OperatorID'], times[i], codes[i]
+            log_times.append(micros)
+            log_before.append(current.get(operator_id, -1))
+            log_after.append(code)
+            current[operator_id] = code
+            operator_times[operator_id].append(micros)
+            operator_states[operator_id].append(code)
+
+        # One pass in time order, closing a checkpoint at the end of every day
+        checkpoints, checkpoint_ends = [], []
+        first_day = _day(log_times[0]) if log_times else 0
+        last_day = _day(log_times[-1]) if log_times else -1
+        counts: Dict[int, int] = {}
+        i = 0
+        for day in range(first_day, last_day + 1):
+            day_end = bisect_left(log_times, (day + 1) * DAY_US, i)
+            for before, after in zip(log_before[i:day_end], log_after[i:day_end]):
+                if before >= 0:
+                    counts[before] -= 1
+                counts[after] = counts.get(after, 0) + 1
+            i = day_end
+            checkpoints.append(dict(counts))    # may hold zeros: readers skip them
+            checkpoint_ends.append(i)
+
+        return cls(list(state_codes), dict(operator_times), dict(operator_states), log_times,
+                   log_before, log_after, first_day, checkpoints, checkpoint_ends)
+
+    @classmethod
+    def load(cls, data_dir: Path = DATA_DIR) -> 'StatusIndex':
+        return cls.from_events(load_status_tracker(Path(data_dir) / 'pay_StatusTracker.json'),
+                               load_json(Path(data_dir) / 'pay_StatusTypes.json'))
+
+    def status_at(self, operator_id: str, when) -> Optional[Dict]:
+        """The operator's status at `when` (None before their first event)"""
+        times = self.operator_times.get(operator_id)
+        if not times:
+            return None
+        i = bisect_right(times, _micros(when)) - 1
+        if i < 0:
+            return None
+        division, status, status_id = self.states[self.operator_states[operator_id][i]]
+        since = _EPOCH + timedelta(microseconds=times[i])
+        return {'operator_id': operator_id, 'status': status, 'status_id': status_id,
+                'division': division, 'since': since.isoformat(' ')}
+
+    def _counts_at(self, micros: int) -> Dict[int, int]:
+        """State code -> operators at `micros`: the previous day's checkpoint plus this day's events"""
+        day = _day(micros) - self.first_day
+        if day < 0 or not self.checkpoints:
+            return {}
+        if day >= len(self.checkpoints):
+            return self.checkpoints[-1]
+        counts = Counter(self.checkpoints[day - 1]) if day else Counter()
+        i = self.checkpoint_ends[day - 1] if day else 0
+        while i < len(self.log_times) and self.log_times[i] <= micros:
+            if self.log_before[i] >= 0:
+                counts[self.log_before[i]] -= 1
+            counts[self.log_after[i]] += 1
+            i += 1
+        return counts
+
+    def _by_division_status(self, counts: Dict[int, int], division: Optional[str] = None,
+                            status: Optional[str] = None) -> Dict[Tuple[Optional[str], str], int]:
+        result = Counter()
+        for code, n in counts.items():
+            div, name, _ = self.states[code]
+            if n and (division is None or div == division) and (status is None or name == status):
+                result[(div, name)] += n
+        return dict(result)
+
+    def headcount_at(self, when, division: Optional[str] = None,
+                     status: Optional[str] = None) -> Dict[Tuple[Optional[str], str], int]:
+        """Operators per (division, status) at `when`, from the day's checkpoint"""
+        return self._by_division_status(self._counts_at(_micros(when)), division, status)
+
+    def headcount_by_bisect(self, when, division: Optional[str] = None,
+                            status: Optional[str] = None) -> Dict[Tuple[Optional[str], str], int]:
+        """Same as headcount_at(), from one bisect per operator (no checkpoints)"""
+        micros = _micros(when)
+        counts = Counter()
+        for operator_id, times in self.operator_times.items():
+            i = bisect_right(times, micros) - 1
+            if i >= 0:
+                counts[self.operator_states[operator_id][i]] += 1
+        return self._by_division_status(counts, division, status)
+
+    def daily_headcount(self, start, end, division: Optional[str] = None,
+                        status: Optional[str] = None) -> List[Tuple[str, int]]:
+        """(day, operators matching the filters at the end of that day) for every day start..end"""
+        codes = [code for code, (div, name, _) in enumerate(self.states)
+                 if (division is None or div == division) and (status is None or name == status)]
+        first = date.fromisoformat(start) if isinstance(start, str) else start
+        last = date.fromisoformat(end) if isinstance(end, str) else end
+        series = []
+        for offset in range((last - first).days + 1):
+            day = first + timedelta(days=offset)
+            position = (day - _EPOCH.date()).days - self.first_day
+            if position < 0 or not self.checkpoints:
+                checkpoint = {}
+            else:
+                checkpoint = self.checkpoints[min(position, len(self.checkpoints) - 1)]
+            series.append((day.isoformat(), sum(checkpoint.get(code, 0) for code in codes)))
+        return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Point-in-time operator status index')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    at_parser = subparsers.add_parser('at', help='status of one operator, or headcount, at a moment')
+    at_parser.add_argument('when', help="'YYYY-MM-DD' (end of that day) or 'YYYY-MM-DD HH:MM[:SS]'")
+    at_parser.add_argument('--operator')
+    at_parser.add_argument('--division')
+
+    series_parser = subparsers.add_parser('series', help='daily headcount between two days')
+    series_parser.add_argument('--start', required=True)
+    series_parser.add_argument('--end', required=True)
+    series_parser.add_argument('--status')
+    series_parser.add_argument('--division')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = StatusIndex.load(args.data_dir)
+    print(f"📇 Indexed {len(index.log_times):,} events for {len(index.operator_times):,} operators, "
+          f"{len(index.checkpoints):,} daily checkpoints ({time.perf_counter() - start:.2f}s)")
+
+    if args.command == 'at':
+        if args.operator:
+            found = index.status_at(args.operator, args.when)
+            if found is None:
+                print(f"❌ No status for {args.operator} at {args.when}")
+                sys.exit(1)
+            print(f"{args.operator}: {found['status']} ({found['division']}) since {found['since']}")
+            return
+        counts = index.headcount_at(args.when, division=args.division)
+        print(f"\n👥 Headcount at {args.when}: {sum(counts.values())} operators")
+        for (division, status), n in sorted(counts.items(), key=lambda item: (str(item[0][0]), -item[1])):
+            print(f"  {str(division):<16} {status:<45} {n:>6}")
+        return
+
+    series = index.daily_headcount(args.start, args.end, division=args.division, status=args.status)
+    label = ' / '.join(filter(None, [args.division, args.status])) or 'all operators'
+    print(f"\n📈 Daily headcount ({label})")
+    previous = None
+    for day, n in series:
+        if n != previous:
+            print(f"  {day}  {n:>6}")
+            previous = n
+    print(f"  ({len(series)} days; only days where the count changed are shown)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,18 @@ Merge operators with their certifications for the workflow builder
 """
 
 import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+# Ensure we can import shared modules from the scripts folder
+sys.path.append(str(Path(__file__).parent.parent))
+
+from json_stream import iter_records
+
+# Only the certification columns the workflow builder uses
+CERT_FIELDS = ('OperatorID', 'Cert', 'CompletionDate', 'Date', 'isApproved', 'CertificationID')
+
 def main():
     base_dir = Path(__file__).parent.parent
     data_dir = base_dir / 'data'
@@ -18,22 +27,13 @@ def main():
     
     print(f"✓ Loaded {len(operators)} operators")
     
-    print("\nLoading certifications...")
-    with open(data_dir / 'pay_Certifications.json', 'r') as f:
-        cert_data = json.load(f)
-    
-    # Handle both array and object with 'certifications' key
-    if isinstance(cert_data, dict) and 'certifications' in cert_data:
-        certifications = cert_data['certifications']
-    else:
-        certifications = cert_data
-    
-    print(f"✓ Loaded {len(certifications)} certification records")
-    
-    # Group certifications by operator ID
-    print("\nGrouping certifications by operator...")
+    print("\nStreaming certifications...")
+    # Handles both a top-level array and an object with a 'certifications' key,
+    # one record at a time so large extracts never sit in memory as a whole
     certs_by_operator = defaultdict(list)
-    for cert in certifications:
+    cert_count = 0
+    for cert in iter_records(data_dir / 'pay_Certifications.json', fields=CERT_FIELDS):
+        cert_count += 1
         operator_id = cert.get('OperatorID')
         if operator_id:
             certs_by_operator[operator_id].append({
@@ -44,6 +44,7 @@ def main():
                 'CertificationID': cert.get('CertificationID')
             })
     
+    print(f"✓ Streamed {cert_count} certification records")
     print(f"✓ Grouped certifications for {len(certs_by_operator)} operators")
     
     # Merge certifications into operators
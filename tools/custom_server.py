@@ -1,78 +1,743 @@
+import argparse
+import gzip
+import hashlib
 import http.server
-import socketserver
+import io
+import queue
+import selectors
+import socket
 import json
 import os
-import shutil
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Shared modules (query index, gap report logic) live in scripts/
+BASE_PATH = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_PATH / 'scripts'))
+
+from division_bundles import DivisionBundles
+from json_patch import JsonPatchError
+from query_index import IndexReloader
+from requirements_store import RequirementsStore, VersionConflict
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
 
 # Configuration
 PORT = 8000
+WORKERS = 16                 # request-handling threads
+KEEP_ALIVE_TIMEOUT = 15      # seconds an idle keep-alive connection is kept open
 DATA_FILE_PATH = 'data/pay_PizzaStatusRequirements.json'
+COMPRESSIBLE = ('.json', '.html', '.js', '.css', '.md', '.txt', '.svg')
+MIN_COMPRESS_SIZE = 1024     # smaller files are sent as-is
+EVENT_HEARTBEAT = 15         # seconds between keep-alive comments on /events streams
+EVENT_RETRY_MS = 5000        # EventSource reconnect delay
+EVENT_MAX_BACKLOG = 256 * 1024   # unsent bytes after which a stuck subscriber is dropped
 
-class LifecycleRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def do_POST(self):
-        """Handle POST requests to save data"""
-        if self.path == '/save-requirements':
+# Warm indexes for the /api/ query endpoints, per-division bundles and /events subscribers (set at startup)
+reloader = None
+bundles = None
+event_hub = None
+
+def requirements_path():
+    """DATA_FILE_PATH relative to where the server was started (repo root or tools/)"""
+    # Check if we are in the right directory
+    if not os.path.exists('data') and os.path.exists('../data'):
+        return '../' + DATA_FILE_PATH
+    return DATA_FILE_PATH
+
+# Requirements document (set at startup, once the working directory is final)
+requirements_store = None
+
+def compressed_variants(body):
+    """{content-coding: bytes} for a response body"""
+    variants = {'identity': body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=9)
+    return variants
+
+def choose_encoding(accept_encoding, variants):
+    """Best content-coding the client accepts: br, then gzip, then none"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
             try:
-                # Get content length
-                content_length = int(self.headers['Content-Length'])
-                # Read POST data
-                post_data = self.rfile.read(content_length)
-                
-                # Verify JSON
-                data = json.loads(post_data)
-                
-                # Check if we are in the right directory
-                target_path = DATA_FILE_PATH
-                if not os.path.exists('data') and os.path.exists('../data'):
-                    target_path = '../' + DATA_FILE_PATH
-                
-                # Create backup
-                if os.path.exists(target_path):
-                    timestamp = time.strftime("%Y%m%d-%H%M%S")
-                    backup_dir = os.path.dirname(target_path) + '/backups'
-                    if not os.path.exists(backup_dir):
-                        os.makedirs(backup_dir)
-                    
-                    backup_path = f"{backup_dir}/pay_PizzaStatusRequirements.{timestamp}.json"
-                    shutil.copy2(target_path, backup_path)
-                    print(f"Backup created at: {backup_path}")
-
-                # Write file
-                with open(target_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4) # Indent 4 match existing style usually
-
-                # Send success response
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                response = {
-                    'status': 'success', 
-                    'message': 'Changes saved directly to disk! (Backup created)'
-                }
-                self.wfile.write(json.dumps(response).encode())
-                
-            except Exception as e:
-                print(f"Error saving file: {e}")
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
+                quality = float(params.strip()[2:])
+            except ValueError:
+                pass
+        accepted[coding.strip().lower()] = quality
+    for coding in ('br', 'gzip'):
+        if coding in variants and accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return 'identity'
+
+class CompressedFileCache:
+    """
+    Static files kept in memory with a content-hash ETag and gzip (and brotli,
+    if installed) variants compressed once. Entries are keyed on inode, mtime
+    and size, so a changed file is re-read on its next request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._entries = {}       # path -> (stat key, etag, variants)
+        self._path_locks = {}    # path -> lock, so each file is compressed once
+
+    def get(self, path):
+        """(etag, mtime, variants) for a file"""
+        stat = os.stat(path)
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != key:
+            with self.lock:
+                path_lock = self._path_locks.setdefault(path, threading.Lock())
+            with path_lock:
+                entry = self._entries.get(path)
+                if entry is None or entry[0] != key:
+                    with open(path, 'rb') as f:
+                        # Key from the open file: a rename mid-read can't mix versions
+                        stat = os.fstat(f.fileno())
+                        body = f.read()
+                    etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                    entry = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), etag, stat.st_mtime,
+                             compressed_variants(body))
+                    self._entries[path] = entry
+        return entry[1], entry[2], entry[3]
+
+    def warm(self, directories):
+        """Compress the data files ahead of the first page load (background thread)"""
+        def run():
+            for directory in directories:
+                for path in sorted(Path(directory).glob('*')):
+                    if path.suffix in COMPRESSIBLE and path.is_file():
+                        try:
+                            self.get(os.path.abspath(path))
+                        except OSError:
+                            pass
+        threading.Thread(target=run, name='compress-warmup', daemon=True).start()
+
+file_cache = CompressedFileCache()
+
+def sse_message(event, data, event_id=None):
+    """One Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+class EventHub:
+    """
+    Server-Sent Events subscribers on one thread.
+
+    After the /events response headers are sent the socket is handed here and
+    no longer holds a worker: a selector thread writes queued events to each
+    subscriber (non-blocking, with a per-subscriber buffer), sends a comment
+    every EVENT_HEARTBEAT seconds so proxies keep the stream open, and notices
+    disconnects. Subscribers that stop reading are dropped once
+    EVENT_MAX_BACKLOG bytes are waiting for them; EventSource reconnects and
+    catches up with Last-Event-ID.
+    """
+
+    def __init__(self, heartbeat: float = EVENT_HEARTBEAT, max_backlog: int = EVENT_MAX_BACKLOG):
+        self.heartbeat = heartbeat
+        self.max_backlog = max_backlog
+        self._selector = selectors.DefaultSelector()
+        self._inbox = queue.SimpleQueue()       # ('subscribe', sock, bytes) / ('publish', bytes)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._subscribers = {}                  # socket -> bytearray of unsent bytes
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, name='event-hub', daemon=True)
+        self._thread.start()
+        return self
+
+    def subscribe(self, sock, initial=b''):
+        """Take over a connected socket whose response headers have been sent"""
+        self._inbox.put(('subscribe', sock, initial))
+        self._wake()
+
+    def publish(self, event, data, event_id=None):
+        """Queue an event for every subscriber (safe from any thread)"""
+        self._inbox.put(('publish', sse_message(event, data, event_id)))
+        self._wake()
+
+    def count(self):
+        return len(self._subscribers)
+
+    def close(self):
+        self._stopping.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'x')
+        except OSError:
+            pass
+
+    def _run(self):
+        next_ping = time.monotonic() + self.heartbeat
+        try:
+            while not self._stopping.is_set():
+                for key, mask in self._selector.select(max(0.0, next_ping - time.monotonic())):
+                    if key.fileobj is self._wake_r:
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(key.fileobj)
+                    if mask & selectors.EVENT_WRITE and key.fileobj in self._subscribers:
+                        self._flush(key.fileobj)
+                self._drain_inbox()
+                if time.monotonic() >= next_ping:
+                    self._broadcast(b': ping\n\n')
+                    next_ping = time.monotonic() + self.heartbeat
+        finally:
+            for sock in list(self._subscribers):
+                self._drop(sock)
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _drain_inbox(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        while True:
+            try:
+                item = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == 'subscribe':
+                sock = item[1]
+                sock.setblocking(False)
+                self._subscribers[sock] = bytearray()
+                self._selector.register(sock, selectors.EVENT_READ)
+                if item[2]:
+                    self._send(sock, item[2])
+            else:
+                self._broadcast(item[1])
+
+    def _broadcast(self, message):
+        for sock in list(self._subscribers):
+            self._send(sock, message)
+
+    def _send(self, sock, message):
+        buffer = self._subscribers[sock]
+        was_empty = not buffer
+        buffer += message
+        if len(buffer) > self.max_backlog:
+            self._drop(sock)
+        elif was_empty:
+            self._flush(sock)
+
+    def _flush(self, sock):
+        buffer = self._subscribers[sock]
+        try:
+            sent = sock.send(buffer)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(sock)
+            return
+        del buffer[:sent]
+        # Only ask for write readiness while something is waiting
+        self._selector.modify(sock, selectors.EVENT_READ | (selectors.EVENT_WRITE if buffer else 0))
+
+    def _read(self, sock):
+        # EventSource sends nothing after its request, so this is normally EOF
+        try:
+            data = sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(sock)
+
+    def _drop(self, sock):
+        if self._subscribers.pop(sock, None) is None:
+            return
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+def publish_requirements_change(version, pizza_ids):
+    """RequirementsStore listener: tell /events subscribers which entries and divisions changed"""
+    if event_hub is None:
+        return
+    event_hub.publish('requirements', {
+        'version': version,
+        'pizza_status_ids': sorted(pizza_ids),
+        'divisions': bundles.divisions_for(pizza_ids) if bundles is not None else []
+    }, event_id=version)
+_requirements_variants = (None, None)   # (version, variants) of the last requirements body sent
+
+class LifecycleRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps browser connections open between requests
+    protocol_version = 'HTTP/1.1'
+    # Max wait on a client mid-request (slow or stalled uploads)
+    timeout = 30
+
+    def do_GET(self):
+        """Serve /api/ queries from the warm index, everything else as static files"""
+        if self.path.startswith('/api/'):
+            self.handle_query()
+        elif self.path.startswith('/bundle/'):
+            self.send_bundle()
+        elif urlsplit(self.path).path == '/events':
+            self.send_events()
+        else:
+            super().do_GET()
+
+    def send_bundle(self):
+        """
+        /bundle/<division>: the builder's data for one division (see
+        scripts/division_bundles.py). X-Requirements-Version is the version to
+        send as If-Match when saving edits made from it.
+        """
+        division = unquote(urlsplit(self.path).path[len('/bundle/'):])
+        bundle = bundles.get(division)
+        if bundle is None:
+            self.send_json(404, {'status': 'error', 'message': f'No bundle for division: {division}',
+                                 'divisions': bundles.divisions()})
+            return
+        body = self.send_cached(bundle.etag, bundle.variants, 'application/json',
+                                headers={'X-Requirements-Version': bundle.requirements_version})
+        if body:
+            self.copyfile(body, self.wfile)
+
+    def send_events(self):
+        """
+        /events: Server-Sent Events stream of requirements changes.
+
+            event: hello          {"version"}  on connect
+            event: requirements   {"version", "pizza_status_ids", "divisions"}  after each save
+
+        The event id is the version, so a reconnecting EventSource sends it back
+        as Last-Event-ID (or a first connect passes ?since=<version it loaded>)
+        and gets one catch-up event for everything it missed ("reload": true if
+        that version is too old to diff). After the headers the connection
+        belongs to the event hub, not to a worker.
+        """
+        since = self.headers.get('Last-Event-ID') or parse_qs(urlsplit(self.path).query).get('since', [None])[0]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')   # nginx: don't buffer the stream
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        self.detached = True
+
+        # Change events are published under the store lock: none can slip in between
+        # the catch-up computed here and the subscription
+        with requirements_store.lock:
+            version, changed = requirements_store.changes_since(since) if since else (None, set())
+            version = version or requirements_store.document()[1]
+            initial = f'retry: {EVENT_RETRY_MS}\n\n'.encode() + sse_message('hello', {'version': version})
+            if changed is None or changed:
+                payload = {'version': version, 'pizza_status_ids': sorted(changed or ()),
+                           'divisions': bundles.divisions_for(changed or ())}
+                if changed is None:
+                    payload['reload'] = True
+                initial += sse_message('requirements', payload, event_id=version)
+            event_hub.subscribe(self.request, initial)
+
+    def send_head(self):
+        """
+        Text files (data JSON, the builder HTML) come from the compressed cache
+        with a strong ETag: If-None-Match gets 304, gzip/br goes to clients that
+        accept it. Everything else is served as usual.
+        """
+        if urlsplit(self.path).path == '/' + DATA_FILE_PATH:
+            return self.send_requirements_head()
+        path = self.translate_path(self.path)
+        if not path.endswith(COMPRESSIBLE) or not os.path.isfile(path):
+            return super().send_head()
+        try:
+            etag, mtime, variants = file_cache.get(path)
+        except OSError:
+            return super().send_head()
+        return self.send_cached(etag, variants, self.guess_type(path), mtime)
+
+    def send_requirements_head(self):
+        """Requirements document with its version as the ETag (sent back as If-Match on save)"""
+        global _requirements_variants
+        body, version = requirements_store.read()
+        cached_version, variants = _requirements_variants
+        if cached_version != version:
+            variants = compressed_variants(body)
+            _requirements_variants = (version, variants)
+        return self.send_cached(version, variants, 'application/json')
+
+    def send_cached(self, etag, variants, content_type, mtime=None, headers=None):
+        """Send headers for a cached body (or 304); returns the body to copy, or None"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            if '*' in tags or etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
                 self.end_headers()
-                response = {'status': 'error', 'message': str(e)}
-                self.wfile.write(json.dumps(response).encode())
+                return None
+
+        encoding = choose_encoding(self.headers.get('Accept-Encoding'), variants)
+        body = variants[encoding]
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('ETag', etag)
+        # Browsers may keep the file but must revalidate (cheap 304) before using it
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if mtime is not None:
+            self.send_header('Last-Modified', self.date_time_string(mtime))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def handle_query(self):
+        """
+        Query endpoints (JSON):
+            /api/status                                   index build time and totals
+            /api/operators/<id>/gaps                      missing/has/required certs
+            /api/roster?status=DOT SCREENING&division=12 - PA
+            /api/divisions                                every division summary
+            /api/divisions/<division>                     one division summary
+            /api/requirements?ids=<id>,<id>               requirements entries (null if deleted)
+                                                          and the current version
+        """
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.split('/')[2:] if p]
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        index = reloader.index  # one consistent index for the whole request
+
+        if parts == ['status']:
+            result = index.stats()
+        elif len(parts) == 3 and parts[0] == 'operators' and parts[2] == 'gaps':
+            result = index.operator_gaps(parts[1])
+        elif parts == ['roster'] and params.get('status'):
+            roster = index.roster(params['status'], params.get('division'))
+            result = {'status': params['status'], 'division': params.get('division'),
+                      'count': len(roster), 'operators': roster}
+        elif parts == ['divisions']:
+            result = index.divisions()
+        elif len(parts) == 2 and parts[0] == 'divisions':
+            result = index.division_summary(parts[1])
+        elif parts == ['requirements'] and params.get('ids'):
+            # The slices a change event names, so editors don't refetch the whole document
+            document, version = requirements_store.document()
+            ids = [pizza_id for pizza_id in params['ids'].split(',') if pizza_id]
+            result = {'version': version, 'entries': {pizza_id: document.get(pizza_id) for pizza_id in ids}}
+        else:
+            self.send_json(404, {'status': 'error', 'message': f'Unknown query: {url.path}'})
+            return
+
+        if result is None:
+            self.send_json(404, {'status': 'error', 'message': f'Not found: {url.path}'})
         else:
+            self.send_json(200, result)
+
+    def send_json(self, code, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        """
+        Handle POST requests to save data:
+            /save-requirements     the whole requirements document
+            /patch-requirements    a JSON Patch (RFC 6902) list of operations
+        Both need If-Match with the version the edit was based on.
+        """
+        if self.path not in ('/save-requirements', '/patch-requirements'):
             # Fallback to standard handler for other paths (not allowed for POST usually)
             self.send_error(404)
+            return
+        try:
+            # Get content length
+            content_length = int(self.headers['Content-Length'])
+            # Read POST data
+            post_data = self.rfile.read(content_length)
+
+            # Saves must say which version they were edited from
+            if_match = (self.headers.get('If-Match') or '').split(',')[0].strip()
+            if not if_match:
+                self.send_json(428, {
+                    'status': 'error',
+                    'message': 'Missing If-Match header: reload the requirements and save again'
+                })
+                return
+            if if_match.startswith('W/'):
+                if_match = if_match[2:]
+
+            # Verify JSON
+            data = json.loads(post_data)
+
+            if self.path == '/patch-requirements':
+                version = requirements_store.patch(data, if_match)
+                message = f'{len(data)} change(s) saved'
+            else:
+                version = requirements_store.save(data, if_match)
+                message = 'Changes saved directly to disk! (Backup created)'
+
+            # Send success response
+            self.send_json(200, {
+                'status': 'success',
+                'message': message,
+                'version': version
+            }, headers={'ETag': version})
+
+        except VersionConflict as conflict:
+            self.send_json(409, {
+                'status': 'conflict',
+                'message': str(conflict),
+                **conflict.diff
+            }, headers={'ETag': conflict.diff['current_version'] or ''})
+        except (JsonPatchError, json.JSONDecodeError) as e:
+            self.send_json(422, {'status': 'error', 'message': str(e)})
+        except Exception as e:
+            print(f"Error saving file: {e}")
+            # The request body may not have been read; don't reuse the connection
+            self.close_connection = True
+            self.send_json(500, {'status': 'error', 'message': str(e)})
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """
+    HTTP server with a bounded pool of worker threads and keep-alive.
+    
+    The serving thread only accepts connections and watches idle keep-alive
+    connections with a selector. When one has a request waiting it goes to
+    the pool, a worker handles that request (plus any already buffered
+    behind it), and the connection is handed back to the selector. Idle
+    browsers therefore hold a socket, not a thread, and a slow 3.5 MB
+    download only occupies one worker. Idle connections are closed after
+    KEEP_ALIVE_TIMEOUT seconds.
+    """
+
+    allow_reuse_address = True
+    # Hundreds of EventSources reconnect at once after a restart; the default backlog of 5 drops them
+    request_queue_size = 256
+
+    def __init__(self, server_address, handler_class, workers: int = WORKERS,
+                 keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.keep_alive_timeout = keep_alive_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+        self._selector = selectors.DefaultSelector()
+        self._parked = queue.SimpleQueue()      # connections handed back by workers
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._idle = {}                         # socket -> (handler, idle since)
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        self._stopped.clear()
+        self._selector.register(self.socket, selectors.EVENT_READ, 'accept')
+        self._selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        try:
+            while not self._stopping.is_set():
+                for key, _ in self._selector.select(poll_interval):
+                    if key.data == 'accept':
+                        self._accept()
+                    elif key.data == 'wake':
+                        self._drain_wakeups()
+                    else:
+                        # A parked keep-alive connection has a new request (or closed)
+                        self._selector.unregister(key.fileobj)
+                        self._idle.pop(key.fileobj, None)
+                        self._pool.submit(self._serve_connection, key.data)
+                self._drain_wakeups()
+                self._close_idle()
+        finally:
+            self._stopped.set()
+
+    def shutdown(self):
+        """Stop serve_forever() (call from another thread) and wait for it to exit."""
+        self._stopping.set()
+        self._wake()
+        self._stopped.wait()
+
+    def server_close(self):
+        super().server_close()
+        if event_hub is not None:
+            event_hub.close()
+        for sock, (handler, _) in list(self._idle.items()):
+            self._close(handler)
+        self._idle.clear()
+        self._pool.shutdown(wait=False)
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def _accept(self):
+        try:
+            request, client_address = self.get_request()
+        except OSError:
+            return
+        if not self.verify_request(request, client_address):
+            self.shutdown_request(request)
+            return
+        request.settimeout(self.RequestHandlerClass.timeout)
+        # The handler outlives one handle() call, so build it without running __init__
+        handler = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+        handler.request, handler.client_address, handler.server = request, client_address, self
+        if isinstance(handler, http.server.SimpleHTTPRequestHandler):
+            handler.directory = os.getcwd()  # what SimpleHTTPRequestHandler.__init__ sets
+        handler.setup()
+        self._pool.submit(self._serve_connection, handler)
+
+    def _serve_connection(self, handler):
+        """Worker: handle requests on a connection until it would block, then park it."""
+        try:
+            while True:
+                handler.handle_one_request()
+                if getattr(handler, 'detached', False):
+                    # The socket now belongs to the event hub; just release the file objects
+                    handler.finish()
+                    return
+                if handler.close_connection:
+                    break
+                # Another request already buffered or on the wire? Serve it now.
+                handler.request.setblocking(False)
+                try:
+                    pending = handler.rfile.peek(1)
+                finally:
+                    handler.request.settimeout(handler.timeout)
+                if not pending:
+                    self._parked.put(handler)
+                    self._wake()
+                    return
+        except ConnectionError:
+            pass  # client went away mid-response
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+        self._close(handler)
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'x')
+        except OSError:
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        while True:
+            try:
+                handler = self._parked.get_nowait()
+            except queue.Empty:
+                break
+            self._idle[handler.request] = (handler, time.monotonic())
+            self._selector.register(handler.request, selectors.EVENT_READ, handler)
+
+    def _close_idle(self):
+        cutoff = time.monotonic() - self.keep_alive_timeout
+        for sock, (handler, since) in list(self._idle.items()):
+            if since < cutoff:
+                self._selector.unregister(sock)
+                del self._idle[sock]
+                self._close(handler)
+
+    def _close(self, handler):
+        try:
+            handler.finish()
+        except Exception:
+            pass
+        self.shutdown_request(handler.request)
+
+def main():
+    global reloader, requirements_store, bundles, event_hub
+
+    parser = argparse.ArgumentParser(description='Operator Lifecycle Server')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help=f'request-handling threads (default: {WORKERS})')
+    parser.add_argument('--root', type=Path, default=None,
+                        help='project directory to serve (default: current directory)')
+    args = parser.parse_args()
+
+    base_path = BASE_PATH
+    if args.root:
+        os.chdir(args.root)
+        base_path = Path(args.root).resolve()
+
+    print(f"🚀 Starting Operator Lifecycle Server on port {args.port} ({args.workers} workers)...")
+    print(f"📂 serving files from: {os.getcwd()}")
+    print(f"💾 Writes enabled for: {DATA_FILE_PATH}")
+    requirements_store = RequirementsStore(requirements_path())
+    pruned = requirements_store.backups.prune()
+    if pruned['removed']:
+        print(f"🧹 Backup retention: {pruned['removed']} old versions removed, {pruned['versions']} kept")
+
+    file_cache.warm(['data', 'config', 'tools'])
+    print(f"🗜️  Compressing data files in the background (gzip{', br' if brotli else ''})")
+
+    print("🗂️  Building query indexes...")
+    start = time.perf_counter()
+    reloader = IndexReloader(base_path).start()
+    print(f"   ✓ {len(reloader.index.gaps)} operators indexed in {time.perf_counter() - start:.1f}s "
+          f"(reloads automatically when data/ changes)")
+
+    start = time.perf_counter()
+    bundles = DivisionBundles(base_path, requirements=requirements_store.document, compress=compressed_variants)
+    print(f"   ✓ {len(bundles.divisions())} division bundles built in {time.perf_counter() - start:.1f}s "
+          f"(served from /bundle/<division>)")
 
-print(f"🚀 Starting Operator Lifecycle Server on port {PORT}...")
-print(f"📂 serving files from: {os.getcwd()}")
-print(f"💾 Writes enabled for: {DATA_FILE_PATH}")
+    # Change notifications for open editors (GET /events)
+    event_hub = EventHub().start()
+    requirements_store.listeners.append(publish_requirements_change)
 
-# Reuse address to prevent 'address already in use' errors on quick restarts
-socketserver.TCPServer.allow_reuse_address = True
+    with PooledHTTPServer(("", args.port), LifecycleRequestHandler, workers=args.workers) as httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Server stopping...")
+            httpd.server_close()
+        finally:
+            # Write any logged patches into the requirements file
+            requirements_store.close()
 
-with socketserver.TCPServer(("", PORT), LifecycleRequestHandler) as httpd:
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopping...")
-        httpd.server_close()
+if __name__ == '__main__':
+    main()